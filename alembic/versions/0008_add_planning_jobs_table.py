@@ -0,0 +1,54 @@
+"""add planning jobs table
+
+Revision ID: 0008_add_planning_jobs_table
+Revises: 0007_add_place_id_to_offices_and_tasks
+Create Date: 2026-03-02 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_add_planning_jobs_table"
+down_revision: str | None = "0007_add_place_id_to_offices_and_tasks"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "planning_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("uuid", sa.String(), nullable=False),
+        sa.Column("tenant_id", sa.String(), nullable=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("office_uuid", sa.String(), nullable=False),
+        sa.Column("service_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.JSON(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_planning_jobs_kind"), "planning_jobs", ["kind"], unique=False)
+    op.create_index(op.f("ix_planning_jobs_office_uuid"), "planning_jobs", ["office_uuid"], unique=False)
+    op.create_index(op.f("ix_planning_jobs_service_date"), "planning_jobs", ["service_date"], unique=False)
+    op.create_index(op.f("ix_planning_jobs_status"), "planning_jobs", ["status"], unique=False)
+    op.create_index(op.f("ix_planning_jobs_tenant_id"), "planning_jobs", ["tenant_id"], unique=False)
+    op.create_index(op.f("ix_planning_jobs_uuid"), "planning_jobs", ["uuid"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_planning_jobs_uuid"), table_name="planning_jobs")
+    op.drop_index(op.f("ix_planning_jobs_tenant_id"), table_name="planning_jobs")
+    op.drop_index(op.f("ix_planning_jobs_status"), table_name="planning_jobs")
+    op.drop_index(op.f("ix_planning_jobs_service_date"), table_name="planning_jobs")
+    op.drop_index(op.f("ix_planning_jobs_office_uuid"), table_name="planning_jobs")
+    op.drop_index(op.f("ix_planning_jobs_kind"), table_name="planning_jobs")
+    op.drop_table("planning_jobs")
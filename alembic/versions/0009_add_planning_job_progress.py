@@ -0,0 +1,27 @@
+"""add planning job progress
+
+Revision ID: 0009_add_planning_job_progress
+Revises: 0008_add_planning_jobs_table
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_add_planning_job_progress"
+down_revision: str | None = "0008_add_planning_jobs_table"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("planning_jobs", sa.Column("stop_requested", sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column("planning_jobs", sa.Column("progress", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("planning_jobs", "progress")
+    op.drop_column("planning_jobs", "stop_requested")
@@ -0,0 +1,227 @@
+"""add full-text search indexes
+
+Revision ID: 0010_add_search_indexes
+Revises: 0009_add_planning_job_progress
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_add_search_indexes"
+down_revision: str | None = "0009_add_planning_job_progress"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The schema is frozen here as it stood at this revision; later changes to the live search index
+# definitions belong in their own migrations.
+OFFICE_DOCUMENTS = """
+    SELECT offices.id,
+        coalesce(offices.name, '') || char(10) || coalesce(offices.address, '') || char(10) || coalesce(offices.uuid, '')
+    FROM offices
+    WHERE offices.deleted_at IS NULL
+"""
+VEHICLE_DOCUMENTS = """
+    SELECT vehicles.id,
+        coalesce(vehicles.name, '') || char(10) || coalesce(vehicles.plate, '') || char(10) || coalesce(vehicles.uuid, '')
+        || char(10) || coalesce(offices.name, '') || char(10) || coalesce(offices.uuid, '')
+    FROM vehicles JOIN offices ON offices.id = vehicles.office_id
+    WHERE vehicles.deleted_at IS NULL
+"""
+TASK_DOCUMENTS = """
+    SELECT tasks.id,
+        coalesce(tasks.type, '') || char(10) || coalesce(tasks.status, '') || char(10) || coalesce(tasks.priority, '')
+        || char(10) || coalesce(tasks.reference, '') || char(10) || coalesce(tasks.address, '')
+        || char(10) || coalesce(offices.name, '') || char(10) || coalesce(tasks.uuid, '')
+    FROM tasks JOIN offices ON offices.id = tasks.office_id
+    WHERE tasks.deleted_at IS NULL
+"""
+ROUTE_DOCUMENTS = """
+    SELECT routes.id,
+        coalesce(routes.status, '') || char(10) || coalesce(offices.name, '') || char(10) || coalesce(vehicles.name, '')
+        || char(10) || coalesce(routes.uuid, '')
+    FROM routes JOIN offices ON offices.id = routes.office_id JOIN vehicles ON vehicles.id = routes.vehicle_id
+    WHERE routes.deleted_at IS NULL
+"""
+ROUTE_TASK_DOCUMENTS = """
+    SELECT route_tasks.id,
+        coalesce(route_tasks.uuid, '') || char(10) || coalesce(route_tasks.route_uuid, '')
+        || char(10) || coalesce(route_tasks.task_uuid, '') || char(10) || coalesce(route_tasks.status, '')
+    FROM route_tasks
+    WHERE route_tasks.deleted_at IS NULL
+"""
+
+CREATE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS offices_search USING fts5(document, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS offices_search_ai AFTER INSERT ON offices BEGIN
+        INSERT INTO offices_search(rowid, document) {OFFICE_DOCUMENTS} AND offices.id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS offices_search_au AFTER UPDATE OF name, address, uuid, deleted_at ON offices BEGIN
+        DELETE FROM offices_search WHERE rowid IN (OLD.id);
+        INSERT INTO offices_search(rowid, document) {OFFICE_DOCUMENTS} AND offices.id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS offices_search_ad AFTER DELETE ON offices BEGIN
+        DELETE FROM offices_search WHERE rowid = OLD.id;
+    END
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS vehicles_search USING fts5(document, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_search_ai AFTER INSERT ON vehicles BEGIN
+        INSERT INTO vehicles_search(rowid, document) {VEHICLE_DOCUMENTS} AND vehicles.id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_search_au AFTER UPDATE OF name, plate, uuid, office_id, deleted_at ON vehicles BEGIN
+        DELETE FROM vehicles_search WHERE rowid IN (OLD.id);
+        INSERT INTO vehicles_search(rowid, document) {VEHICLE_DOCUMENTS} AND vehicles.id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS vehicles_search_ad AFTER DELETE ON vehicles BEGIN
+        DELETE FROM vehicles_search WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_search_offices_au AFTER UPDATE OF name, uuid ON offices BEGIN
+        DELETE FROM vehicles_search WHERE rowid IN (SELECT id FROM vehicles WHERE office_id = NEW.id);
+        INSERT INTO vehicles_search(rowid, document) {VEHICLE_DOCUMENTS} AND vehicles.office_id = NEW.id;
+    END
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_search USING fts5(document, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_search_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_search(rowid, document) {TASK_DOCUMENTS} AND tasks.id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_search_au
+    AFTER UPDATE OF type, status, priority, reference, address, uuid, office_id, deleted_at ON tasks BEGIN
+        DELETE FROM tasks_search WHERE rowid IN (OLD.id);
+        INSERT INTO tasks_search(rowid, document) {TASK_DOCUMENTS} AND tasks.id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_search_ad AFTER DELETE ON tasks BEGIN
+        DELETE FROM tasks_search WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_search_offices_au AFTER UPDATE OF name ON offices BEGIN
+        DELETE FROM tasks_search WHERE rowid IN (SELECT id FROM tasks WHERE office_id = NEW.id);
+        INSERT INTO tasks_search(rowid, document) {TASK_DOCUMENTS} AND tasks.office_id = NEW.id;
+    END
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS routes_search USING fts5(document, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS routes_search_ai AFTER INSERT ON routes BEGIN
+        INSERT INTO routes_search(rowid, document) {ROUTE_DOCUMENTS} AND routes.id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS routes_search_au AFTER UPDATE OF status, uuid, office_id, vehicle_id, deleted_at ON routes BEGIN
+        DELETE FROM routes_search WHERE rowid IN (OLD.id);
+        INSERT INTO routes_search(rowid, document) {ROUTE_DOCUMENTS} AND routes.id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS routes_search_ad AFTER DELETE ON routes BEGIN
+        DELETE FROM routes_search WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS routes_search_offices_au AFTER UPDATE OF name ON offices BEGIN
+        DELETE FROM routes_search WHERE rowid IN (SELECT id FROM routes WHERE office_id = NEW.id);
+        INSERT INTO routes_search(rowid, document) {ROUTE_DOCUMENTS} AND routes.office_id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS routes_search_vehicles_au AFTER UPDATE OF name ON vehicles BEGIN
+        DELETE FROM routes_search WHERE rowid IN (SELECT id FROM routes WHERE vehicle_id = NEW.id);
+        INSERT INTO routes_search(rowid, document) {ROUTE_DOCUMENTS} AND routes.vehicle_id = NEW.id;
+    END
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS route_tasks_search USING fts5(document, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS route_tasks_search_ai AFTER INSERT ON route_tasks BEGIN
+        INSERT INTO route_tasks_search(rowid, document) {ROUTE_TASK_DOCUMENTS} AND route_tasks.id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS route_tasks_search_au
+    AFTER UPDATE OF uuid, route_uuid, task_uuid, status, deleted_at ON route_tasks BEGIN
+        DELETE FROM route_tasks_search WHERE rowid IN (OLD.id);
+        INSERT INTO route_tasks_search(rowid, document) {ROUTE_TASK_DOCUMENTS} AND route_tasks.id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS route_tasks_search_ad AFTER DELETE ON route_tasks BEGIN
+        DELETE FROM route_tasks_search WHERE rowid = OLD.id;
+    END
+    """,
+]
+
+BACKFILL_STATEMENTS = [
+    "DELETE FROM offices_search",
+    f"INSERT INTO offices_search(rowid, document) {OFFICE_DOCUMENTS}",
+    "INSERT INTO offices_search(offices_search) VALUES ('optimize')",
+    "DELETE FROM vehicles_search",
+    f"INSERT INTO vehicles_search(rowid, document) {VEHICLE_DOCUMENTS}",
+    "INSERT INTO vehicles_search(vehicles_search) VALUES ('optimize')",
+    "DELETE FROM tasks_search",
+    f"INSERT INTO tasks_search(rowid, document) {TASK_DOCUMENTS}",
+    "INSERT INTO tasks_search(tasks_search) VALUES ('optimize')",
+    "DELETE FROM routes_search",
+    f"INSERT INTO routes_search(rowid, document) {ROUTE_DOCUMENTS}",
+    "INSERT INTO routes_search(routes_search) VALUES ('optimize')",
+    "DELETE FROM route_tasks_search",
+    f"INSERT INTO route_tasks_search(rowid, document) {ROUTE_TASK_DOCUMENTS}",
+    "INSERT INTO route_tasks_search(route_tasks_search) VALUES ('optimize')",
+]
+
+DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS offices_search_ai",
+    "DROP TRIGGER IF EXISTS offices_search_au",
+    "DROP TRIGGER IF EXISTS offices_search_ad",
+    "DROP TABLE IF EXISTS offices_search",
+    "DROP TRIGGER IF EXISTS vehicles_search_ai",
+    "DROP TRIGGER IF EXISTS vehicles_search_au",
+    "DROP TRIGGER IF EXISTS vehicles_search_ad",
+    "DROP TRIGGER IF EXISTS vehicles_search_offices_au",
+    "DROP TABLE IF EXISTS vehicles_search",
+    "DROP TRIGGER IF EXISTS tasks_search_ai",
+    "DROP TRIGGER IF EXISTS tasks_search_au",
+    "DROP TRIGGER IF EXISTS tasks_search_ad",
+    "DROP TRIGGER IF EXISTS tasks_search_offices_au",
+    "DROP TABLE IF EXISTS tasks_search",
+    "DROP TRIGGER IF EXISTS routes_search_ai",
+    "DROP TRIGGER IF EXISTS routes_search_au",
+    "DROP TRIGGER IF EXISTS routes_search_ad",
+    "DROP TRIGGER IF EXISTS routes_search_offices_au",
+    "DROP TRIGGER IF EXISTS routes_search_vehicles_au",
+    "DROP TABLE IF EXISTS routes_search",
+    "DROP TRIGGER IF EXISTS route_tasks_search_ai",
+    "DROP TRIGGER IF EXISTS route_tasks_search_au",
+    "DROP TRIGGER IF EXISTS route_tasks_search_ad",
+    "DROP TABLE IF EXISTS route_tasks_search",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in CREATE_STATEMENTS + BACKFILL_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in DROP_STATEMENTS:
+        op.execute(statement)
@@ -0,0 +1,29 @@
+"""add composite partial indexes over live rows
+
+Revision ID: 0011_add_live_row_indexes
+Revises: 0010_add_search_indexes
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_add_live_row_indexes"
+down_revision: str | None = "0010_add_search_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LIVE_ROWS = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    op.create_index("ix_tasks_office_status_live", "tasks", ["office_id", "status"], sqlite_where=LIVE_ROWS)
+    op.create_index("ix_routes_office_date_live", "routes", ["office_id", "service_date"], sqlite_where=LIVE_ROWS)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_routes_office_date_live", table_name="routes")
+    op.drop_index("ix_tasks_office_status_live", table_name="tasks")
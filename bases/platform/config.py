@@ -5,6 +5,38 @@ import os
 class Settings:
     database_url: str
     swagger_ui_enabled: bool
+    planning_job_concurrency: int
+    planning_job_poll_interval_s: float
+    planning_job_backend: str
+    planning_job_heartbeat_interval_s: float
+    planning_job_queue_poll_interval_s: float
+    planning_batch_workers: int
+    planning_average_speed_kmh: float
+    planning_day_start: str
+    planning_matrix_provider: str
+    osrm_base_url: str
+    osrm_max_table_size: int
+    osrm_max_concurrency: int
+    osrm_timeout_s: float
+    planning_matrix_cache_path: str
+    planning_matrix_cache_max_entries: int
+    planning_solver_engine: str
+    planning_heuristic_time_budget_s: float
+    planning_recalculate_time_limit_s: float
+    planning_time_limit_base_s: float
+    planning_time_limit_per_stop_s: float
+    planning_time_limit_max_s: float
+    planning_stall_window_s: float
+    planning_solution_cache_enabled: bool
+    planning_solution_cache_max_entries: int
+    planning_solution_cache_ttl_s: float
+    planning_solution_cache_path: str
+    planning_decomposition_threshold: int
+    planning_decomposition_cluster_size: int
+    planning_decomposition_repair: bool
+    planning_sparse_matrix_threshold: int
+    planning_sparse_neighbours: int
+    planning_rebalance_time_budget_s: float
 
     def __init__(self) -> None:
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///./app.db")
@@ -14,6 +46,48 @@ class Settings:
             "yes",
             "on",
         }
+        self.planning_job_concurrency = max(1, int(os.getenv("PLANNING_JOB_CONCURRENCY", "2")))
+        self.planning_job_poll_interval_s = float(os.getenv("PLANNING_JOB_POLL_INTERVAL_S", "0.5"))
+        self.planning_job_backend = os.getenv("PLANNING_JOB_BACKEND", "local").lower()
+        self.planning_job_heartbeat_interval_s = float(os.getenv("PLANNING_JOB_HEARTBEAT_INTERVAL_S", "10"))
+        self.planning_job_queue_poll_interval_s = float(os.getenv("PLANNING_JOB_QUEUE_POLL_INTERVAL_S", "1"))
+        self.planning_batch_workers = max(1, int(os.getenv("PLANNING_BATCH_WORKERS", str(os.cpu_count() or 1))))
+        self.planning_average_speed_kmh = float(os.getenv("PLANNING_AVERAGE_SPEED_KMH", "40"))
+        self.planning_day_start = os.getenv("PLANNING_DAY_START", "08:00")
+        self.planning_matrix_provider = os.getenv("PLANNING_MATRIX_PROVIDER", "haversine").lower()
+        self.osrm_base_url = os.getenv("OSRM_BASE_URL", "https://osrm.ingeniouskey.com")
+        self.osrm_max_table_size = int(os.getenv("OSRM_MAX_TABLE_SIZE", "100"))
+        self.osrm_max_concurrency = int(os.getenv("OSRM_MAX_CONCURRENCY", "4"))
+        self.osrm_timeout_s = float(os.getenv("OSRM_TIMEOUT_S", "10"))
+        self.planning_matrix_cache_path = os.getenv("PLANNING_MATRIX_CACHE_PATH", "")
+        self.planning_matrix_cache_max_entries = int(os.getenv("PLANNING_MATRIX_CACHE_MAX_ENTRIES", "5000000"))
+        self.planning_solver_engine = os.getenv("PLANNING_SOLVER_ENGINE", "auto").lower()
+        self.planning_heuristic_time_budget_s = float(os.getenv("PLANNING_HEURISTIC_TIME_BUDGET_S", "0.5"))
+        self.planning_recalculate_time_limit_s = float(os.getenv("PLANNING_RECALCULATE_TIME_LIMIT_S", "0.5"))
+        self.planning_time_limit_base_s = float(os.getenv("PLANNING_TIME_LIMIT_BASE_S", "1"))
+        self.planning_time_limit_per_stop_s = float(os.getenv("PLANNING_TIME_LIMIT_PER_STOP_S", "0.01"))
+        self.planning_time_limit_max_s = float(os.getenv("PLANNING_TIME_LIMIT_MAX_S", "30"))
+        self.planning_stall_window_s = float(os.getenv("PLANNING_STALL_WINDOW_S", "2"))
+        self.planning_solution_cache_enabled = os.getenv("PLANNING_SOLUTION_CACHE_ENABLED", "true").lower() in {
+            "1",
+            "true",
+            "yes",
+            "on",
+        }
+        self.planning_solution_cache_max_entries = int(os.getenv("PLANNING_SOLUTION_CACHE_MAX_ENTRIES", "256"))
+        self.planning_solution_cache_ttl_s = float(os.getenv("PLANNING_SOLUTION_CACHE_TTL_S", "300"))
+        self.planning_solution_cache_path = os.getenv("PLANNING_SOLUTION_CACHE_PATH", "")
+        self.planning_decomposition_threshold = int(os.getenv("PLANNING_DECOMPOSITION_THRESHOLD", "1500"))
+        self.planning_decomposition_cluster_size = max(1, int(os.getenv("PLANNING_DECOMPOSITION_CLUSTER_SIZE", "400")))
+        self.planning_decomposition_repair = os.getenv("PLANNING_DECOMPOSITION_REPAIR", "true").lower() in {
+            "1",
+            "true",
+            "yes",
+            "on",
+        }
+        self.planning_sparse_matrix_threshold = int(os.getenv("PLANNING_SPARSE_MATRIX_THRESHOLD", "2000"))
+        self.planning_sparse_neighbours = max(1, int(os.getenv("PLANNING_SPARSE_NEIGHBOURS", "32")))
+        self.planning_rebalance_time_budget_s = float(os.getenv("PLANNING_REBALANCE_TIME_BUDGET_S", "1"))
 
 
 @lru_cache
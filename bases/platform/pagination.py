@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from typing import Literal
+
+CountStrategy = Literal["exact", "estimated", "none"]
+
+
+@dataclass(frozen=True)
+class ListCount:
+    strategy: CountStrategy
+    total: int | None
+    has_next: bool
@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from components.api__fastapi.routers.routes.create import router as create_router
 from components.api__fastapi.routers.routes.delete import router as delete_router
 from components.api__fastapi.routers.routes.get import router as get_router
+from components.api__fastapi.routers.routes.jobs import router as jobs_router
 from components.api__fastapi.routers.routes.list import router as list_router
 from components.api__fastapi.routers.routes.operations import router as operations_router
 from components.api__fastapi.routers.routes.update import router as update_router
@@ -18,6 +19,7 @@ for prefix_router in (api_router, api_v1_router):
     prefix_router.include_router(update_router)
     prefix_router.include_router(delete_router)
     prefix_router.include_router(operations_router)
+    prefix_router.include_router(jobs_router)
 
 router.include_router(api_router)
 router.include_router(api_v1_router)
@@ -0,0 +1,109 @@
+import json
+import time
+from collections.abc import Iterator
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, col, select
+
+from bases.platform.db import get_session
+from components.persistence__sqlmodel.models.route import RouteModel
+from components.persistence__sqlmodel.models.vehicle import VehicleModel
+from components.route_planning.planning_jobs import (
+    JOB_TERMINAL_STATUSES,
+    PlanningJobBackend,
+    create_planning_job,
+    get_planning_job,
+    get_planning_job_backend,
+    request_planning_job_cancellation,
+    request_planning_job_stop,
+    serialize_planning_job,
+)
+from components.route_planning.route_planner_service import planning_route_summary
+
+router = APIRouter()
+
+JOB_EVENTS_POLL_INTERVAL_S = 0.5
+
+
+@router.post("/routes/jobs", status_code=status.HTTP_202_ACCEPTED)
+def submit_planning_job_endpoint(
+    service_date: date = Query(...),
+    office_uuid: str = Query(...),
+    session: Session = Depends(get_session),
+    backend: PlanningJobBackend = Depends(get_planning_job_backend),
+) -> dict:
+    job = create_planning_job(session=session, service_date=service_date, office_uuid=office_uuid)
+    backend.submit(session.get_bind(), job.uuid)
+    return {"data": serialize_planning_job(job)}
+
+
+@router.get("/routes/jobs/{job_uuid}")
+def get_planning_job_endpoint(job_uuid: str, session: Session = Depends(get_session)) -> dict:
+    return {"data": serialize_planning_job(get_planning_job(session, job_uuid))}
+
+
+@router.get("/routes/jobs/{job_uuid}/result")
+def planning_job_result_endpoint(job_uuid: str, session: Session = Depends(get_session)) -> dict:
+    job = get_planning_job(session, job_uuid)
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error["status_code"], detail=job.error["detail"])
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Planning job has no result yet", "status": job.status},
+        )
+
+    route_uuids = job.result["route_uuids"]
+    routes = session.exec(
+        select(RouteModel, VehicleModel)
+        .join(VehicleModel, RouteModel.vehicle_id == VehicleModel.id)
+        .where(col(RouteModel.uuid).in_(route_uuids), RouteModel.deleted_at.is_(None))
+        .order_by(RouteModel.created_at.asc())
+    ).all()
+    return {"data": [planning_route_summary(route, vehicle) for route, vehicle in routes]}
+
+
+@router.post("/routes/jobs/{job_uuid}/cancel")
+def cancel_planning_job_endpoint(
+    job_uuid: str,
+    session: Session = Depends(get_session),
+    backend: PlanningJobBackend = Depends(get_planning_job_backend),
+) -> dict:
+    job = request_planning_job_cancellation(session, job_uuid)
+    backend.cancel(job_uuid)
+    return {"data": serialize_planning_job(job)}
+
+
+@router.post("/routes/jobs/{job_uuid}/stop")
+def stop_planning_job_endpoint(job_uuid: str, session: Session = Depends(get_session)) -> dict:
+    return {"data": serialize_planning_job(request_planning_job_stop(session, job_uuid))}
+
+
+def _planning_job_event_stream(engine: Engine, job_uuid: str) -> Iterator[str]:
+    last_state = None
+    last_progress = None
+    while True:
+        with Session(engine) as session:
+            job = get_planning_job(session, job_uuid)
+            payload = serialize_planning_job(job)
+
+        if payload["progress"] is not None and payload["progress"] != last_progress:
+            last_progress = payload["progress"]
+            yield f"event: progress\ndata: {json.dumps(jsonable_encoder(last_progress))}\n\n"
+        state = (payload["status"], payload["cancel_requested"], payload["stop_requested"])
+        if state != last_state:
+            last_state = state
+            yield f"event: status\ndata: {json.dumps(jsonable_encoder(payload))}\n\n"
+        if payload["status"] in JOB_TERMINAL_STATUSES:
+            return
+        time.sleep(JOB_EVENTS_POLL_INTERVAL_S)
+
+
+@router.get("/routes/jobs/{job_uuid}/events")
+def planning_job_events_endpoint(job_uuid: str, session: Session = Depends(get_session)) -> StreamingResponse:
+    get_planning_job(session, job_uuid)
+    return StreamingResponse(_planning_job_event_stream(session.get_bind(), job_uuid), media_type="text/event-stream")
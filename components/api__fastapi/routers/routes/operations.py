@@ -8,9 +8,14 @@ from bases.platform.db import get_session
 from components.persistence__sqlmodel.models.office import OfficeModel
 from components.persistence__sqlmodel.models.route import RouteModel
 from components.persistence__sqlmodel.models.vehicle import VehicleModel
+from components.route_planning.batch_planning import generate_routes_batch
 from components.route_planning.route_planner_service import (
     generate_routes,
     get_route_detail,
+    insert_tasks_into_routes,
+    planning_route_summary,
+    rebalance_routes,
+    recalculate_office_routes,
     recalculate_route,
     reorder_route_tasks,
 )
@@ -22,6 +27,11 @@ class OrderedTaskUuidsPayload(BaseModel):
     orderedTaskUuids: list[str]
 
 
+class InsertTasksPayload(BaseModel):
+    taskUuids: list[str]
+    repair: bool = False
+
+
 @router.get("/routes/planning")
 def planning_routes_endpoint(
     service_date: date = Query(...),
@@ -43,29 +53,115 @@ def planning_routes_endpoint(
         )
         .order_by(RouteModel.created_at.asc())
     ).all()
+    return {"data": [planning_route_summary(route, vehicle) for route, vehicle in routes]}
+
+
+def _time_ceiling_s(time_limit_ms: int | None) -> float | None:
+    return time_limit_ms / 1000 if time_limit_ms is not None else None
+
+
+@router.post("/routes/generate")
+def generate_routes_endpoint(
+    service_date: date = Query(...),
+    office_uuid: str = Query(...),
+    time_limit_ms: int | None = Query(default=None, ge=100),
+    session: Session = Depends(get_session),
+) -> dict:
+    generated = generate_routes(
+        session=session,
+        service_date=service_date,
+        office_uuid=office_uuid,
+        time_ceiling_s=_time_ceiling_s(time_limit_ms),
+    )
+    response = planning_routes_endpoint(service_date=service_date, office_uuid=office_uuid, session=session)
+    response["meta"] = {"solver": generated.solver_stats, "dropped_task_uuids": generated.dropped_task_uuids}
+    return response
+
+
+@router.post("/routes/generate/batch")
+def generate_routes_batch_endpoint(
+    service_date: date = Query(...),
+    office_uuids: list[str] | None = Query(default=None),
+    time_limit_ms: int | None = Query(default=None, ge=100),
+    session: Session = Depends(get_session),
+) -> dict:
+    result = generate_routes_batch(
+        session=session,
+        service_date=service_date,
+        office_uuids=office_uuids,
+        time_ceiling_s=_time_ceiling_s(time_limit_ms),
+    )
     return {
         "data": [
             {
-                "uuid": route.uuid,
-                "vehicle_name": vehicle.name,
-                "status": route.status,
-                "total_tasks": route.total_tasks,
-                "total_load": route.total_load,
-                "total_distance_m": route.total_distance_m,
+                "office_uuid": outcome.office_uuid,
+                "status": outcome.status,
+                "route_uuids": outcome.route_uuids,
+                "dropped_task_uuids": outcome.dropped_task_uuids,
+                "error": outcome.error,
+                "timings_ms": {"load": outcome.load_ms, "solve": outcome.solve_ms, "persist": outcome.persist_ms},
+                "solver": outcome.solver_stats,
             }
-            for route, vehicle in routes
-        ]
+            for outcome in result.offices
+        ],
+        "meta": {"service_date": result.service_date, "wall_ms": result.wall_ms},
     }
 
 
-@router.post("/routes/generate")
-def generate_routes_endpoint(
+@router.post("/routes/insert-tasks")
+def insert_tasks_endpoint(
+    payload: InsertTasksPayload,
+    service_date: date = Query(...),
+    office_uuid: str = Query(...),
+    session: Session = Depends(get_session),
+) -> dict:
+    insertions = insert_tasks_into_routes(
+        session=session,
+        service_date=service_date,
+        office_uuid=office_uuid,
+        task_uuids=payload.taskUuids,
+        repair=payload.repair,
+    )
+    return {"data": [insertion.__dict__ for insertion in insertions]}
+
+
+@router.post("/routes/recalculate")
+def recalculate_office_routes_endpoint(
+    service_date: date = Query(...),
+    office_uuid: str = Query(...),
+    time_limit_ms: int | None = Query(default=None, ge=100),
+    session: Session = Depends(get_session),
+) -> dict:
+    summaries = recalculate_office_routes(
+        session=session,
+        service_date=service_date,
+        office_uuid=office_uuid,
+        time_ceiling_s=_time_ceiling_s(time_limit_ms),
+    )
+    return {"data": [summary.__dict__ for summary in summaries]}
+
+
+@router.post("/routes/rebalance")
+def rebalance_routes_endpoint(
     service_date: date = Query(...),
     office_uuid: str = Query(...),
+    time_limit_ms: int | None = Query(default=None, ge=100),
     session: Session = Depends(get_session),
 ) -> dict:
-    generate_routes(session=session, service_date=service_date, office_uuid=office_uuid)
-    return planning_routes_endpoint(service_date=service_date, office_uuid=office_uuid, session=session)
+    result = rebalance_routes(
+        session=session,
+        service_date=service_date,
+        office_uuid=office_uuid,
+        time_budget_s=_time_ceiling_s(time_limit_ms),
+    )
+    return {
+        "data": [move.__dict__ for move in result.moves],
+        "meta": {
+            "route_uuids": result.route_uuids,
+            "before_distance_m": result.before_distance_m,
+            "after_distance_m": result.after_distance_m,
+        },
+    }
 
 
 @router.get("/routes/{route_uuid}/detail")
@@ -79,12 +175,17 @@ def route_detail_endpoint(route_uuid: str, session: Session = Depends(get_sessio
 
 
 @router.post("/routes/{route_uuid}/recalculate")
-def recalculate_route_endpoint(route_uuid: str, session: Session = Depends(get_session)) -> dict:
-    detail = recalculate_route(session=session, route_uuid=route_uuid)
+def recalculate_route_endpoint(
+    route_uuid: str,
+    time_limit_ms: int | None = Query(default=None, ge=100),
+    session: Session = Depends(get_session),
+) -> dict:
+    detail = recalculate_route(session=session, route_uuid=route_uuid, time_ceiling_s=_time_ceiling_s(time_limit_ms))
     return {
         "route": detail.route,
         "office": detail.office,
         "tasks": [task.__dict__ for task in detail.tasks],
+        "meta": {"solver": detail.solver_stats},
     }
 
 
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from components.api__fastapi.routers.tasks.bulk_import import router as bulk_import_router
 from components.api__fastapi.routers.tasks.create import router as create_router
 from components.api__fastapi.routers.tasks.delete import router as delete_router
 from components.api__fastapi.routers.tasks.get import router as get_router
@@ -14,6 +15,7 @@ for prefix_router in (api_router, api_v1_router):
     prefix_router.include_router(list_router)
     prefix_router.include_router(get_router)
     prefix_router.include_router(create_router)
+    prefix_router.include_router(bulk_import_router)
     prefix_router.include_router(update_router)
     prefix_router.include_router(delete_router)
 
@@ -0,0 +1,38 @@
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+
+from components.api__fastapi.dependencies import get_task_repository
+from components.api__fastapi.schemas.tasks.base import TaskImportErrorRead, TaskImportResponse, validate_task_row
+from components.app__task.use_cases.import_tasks import ImportFormat, import_format_for, import_tasks
+from components.persistence__sqlmodel.repositories.tasks_repo import TaskRepositorySqlModel
+
+router = APIRouter()
+
+
+@router.post("/tasks/import", response_model=TaskImportResponse)
+def import_tasks_endpoint(
+    file: UploadFile = File(...),
+    format: ImportFormat | None = Query(default=None),
+    repository: TaskRepositorySqlModel = Depends(get_task_repository),
+) -> TaskImportResponse:
+    import_format = format or import_format_for(file.filename)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Upload a .csv or .ndjson file, or pass format=csv|ndjson"
+        )
+
+    # The upload is spooled to disk by the multipart parser; rows are read from it line by line.
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        result = import_tasks(repository, lines, format=import_format, validate=validate_task_row)
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be UTF-8 encoded") from exc
+    finally:
+        lines.detach()
+
+    return TaskImportResponse(
+        imported=result.imported,
+        failed_rows=len({error.line for error in result.errors}),
+        errors=[TaskImportErrorRead.model_validate(error) for error in result.errors],
+    )
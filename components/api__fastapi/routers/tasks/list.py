@@ -16,10 +16,10 @@ def list_tasks_endpoint(
     params: ListQueryParams = Depends(get_task_list_query_params),
     repository: TaskRepositorySqlModel = Depends(get_task_repository),
 ) -> TaskListResponse:
-    items, total = list_tasks(repository=repository, page=params.page, page_size=params.page_size, search=params.search, sort=params.sort, order=params.order)
+    items, list_count = list_tasks(repository=repository, page=params.page, page_size=params.page_size, search=params.search, sort=params.sort, order=params.order, cursor=params.cursor, count=params.count)
     filters = {"search": params.search} if params.search else None
     sort = {"by": params.sort, "order": params.order} if "sort" in request.query_params or "order" in request.query_params else None
     return TaskListResponse(
         data=[TaskRead.model_validate(item) for item in items],
-        meta=Meta(pagination=PaginationMeta.from_values(total=total, page=params.page, page_size=params.page_size), filters=filters, sort=sort),
+        meta=Meta(pagination=PaginationMeta.for_items(items, count=list_count, params=params), filters=filters, sort=sort),
     )
@@ -16,13 +16,15 @@ def list_vehicles_endpoint(
     params: ListQueryParams = Depends(get_vehicle_list_query_params),
     repository: VehicleRepositorySqlModel = Depends(get_vehicle_repository),
 ) -> VehicleListResponse:
-    items, total = list_vehicles(
+    items, list_count = list_vehicles(
         repository=repository,
         page=params.page,
         page_size=params.page_size,
         search=params.search,
         sort=params.sort,
         order=params.order,
+        cursor=params.cursor,
+        count=params.count,
     )
 
     filters = {"search": params.search} if params.search else None
@@ -31,7 +33,7 @@ def list_vehicles_endpoint(
     return VehicleListResponse(
         data=[VehicleRead.model_validate(item) for item in items],
         meta=Meta(
-            pagination=PaginationMeta.from_values(total=total, page=params.page, page_size=params.page_size),
+            pagination=PaginationMeta.for_items(items, count=list_count, params=params),
             filters=filters,
             sort=sort,
         ),
@@ -1,8 +1,11 @@
 from typing import Annotated, Literal
 
-from fastapi import Query
+from fastapi import HTTPException, Query, status
 from pydantic import BaseModel
 
+from bases.platform.pagination import CountStrategy
+from components.persistence__sqlmodel.repositories.shared.keyset import InvalidCursorError, decode_cursor
+
 OfficeSortField = Literal[
     "id",
     "name",
@@ -79,6 +82,20 @@ class ListQueryParams(BaseModel):
     search: str | None = None
     sort: str
     order: SortOrder
+    cursor: str | None = None
+    count: CountStrategy = "exact"
+
+
+def _checked_cursor(cursor: str | None, sort: str, order: str) -> str | None:
+    if not cursor:
+        return None
+    try:
+        decoded = decode_cursor(cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if (decoded.sort, decoded.order) != (sort, order):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pagination cursor does not match the requested sort")
+    return cursor
 
 
 def get_office_list_query_params(
@@ -87,9 +104,19 @@ def get_office_list_query_params(
     search: Annotated[str | None, Query()] = None,
     sort: Annotated[OfficeSortField, Query()] = DEFAULT_OFFICE_SORT,
     order: Annotated[SortOrder, Query()] = DEFAULT_OFFICE_ORDER,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountStrategy, Query()] = "exact",
 ) -> ListQueryParams:
     normalized_search = " ".join(search.split()) if search is not None else None
-    return ListQueryParams(page=page, page_size=page_size, search=normalized_search or None, sort=sort, order=order)
+    return ListQueryParams(
+        page=page,
+        page_size=page_size,
+        search=normalized_search or None,
+        sort=sort,
+        order=order,
+        cursor=_checked_cursor(cursor, sort, order),
+        count=count,
+    )
 
 
 def get_vehicle_list_query_params(
@@ -98,9 +125,19 @@ def get_vehicle_list_query_params(
     search: Annotated[str | None, Query()] = None,
     sort: Annotated[VehicleSortField, Query()] = DEFAULT_VEHICLE_SORT,
     order: Annotated[SortOrder, Query()] = DEFAULT_VEHICLE_ORDER,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountStrategy, Query()] = "exact",
 ) -> ListQueryParams:
     normalized_search = " ".join(search.split()) if search is not None else None
-    return ListQueryParams(page=page, page_size=page_size, search=normalized_search or None, sort=sort, order=order)
+    return ListQueryParams(
+        page=page,
+        page_size=page_size,
+        search=normalized_search or None,
+        sort=sort,
+        order=order,
+        cursor=_checked_cursor(cursor, sort, order),
+        count=count,
+    )
 
 
 def get_task_list_query_params(
@@ -109,9 +146,19 @@ def get_task_list_query_params(
     search: Annotated[str | None, Query()] = None,
     sort: Annotated[TaskSortField, Query()] = DEFAULT_TASK_SORT,
     order: Annotated[SortOrder, Query()] = DEFAULT_TASK_ORDER,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountStrategy, Query()] = "exact",
 ) -> ListQueryParams:
     normalized_search = " ".join(search.split()) if search is not None else None
-    return ListQueryParams(page=page, page_size=page_size, search=normalized_search or None, sort=sort, order=order)
+    return ListQueryParams(
+        page=page,
+        page_size=page_size,
+        search=normalized_search or None,
+        sort=sort,
+        order=order,
+        cursor=_checked_cursor(cursor, sort, order),
+        count=count,
+    )
 
 
 def get_route_list_query_params(
@@ -120,9 +167,19 @@ def get_route_list_query_params(
     search: Annotated[str | None, Query()] = None,
     sort: Annotated[RouteSortField, Query()] = DEFAULT_ROUTE_SORT,
     order: Annotated[SortOrder, Query()] = DEFAULT_ROUTE_ORDER,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountStrategy, Query()] = "exact",
 ) -> ListQueryParams:
     normalized_search = " ".join(search.split()) if search is not None else None
-    return ListQueryParams(page=page, page_size=page_size, search=normalized_search or None, sort=sort, order=order)
+    return ListQueryParams(
+        page=page,
+        page_size=page_size,
+        search=normalized_search or None,
+        sort=sort,
+        order=order,
+        cursor=_checked_cursor(cursor, sort, order),
+        count=count,
+    )
 
 
 def get_route_task_list_query_params(
@@ -131,6 +188,16 @@ def get_route_task_list_query_params(
     search: Annotated[str | None, Query()] = None,
     sort: Annotated[RouteTaskSortField, Query()] = DEFAULT_ROUTE_TASK_SORT,
     order: Annotated[SortOrder, Query()] = DEFAULT_ROUTE_TASK_ORDER,
+    cursor: Annotated[str | None, Query()] = None,
+    count: Annotated[CountStrategy, Query()] = "exact",
 ) -> ListQueryParams:
     normalized_search = " ".join(search.split()) if search is not None else None
-    return ListQueryParams(page=page, page_size=page_size, search=normalized_search or None, sort=sort, order=order)
+    return ListQueryParams(
+        page=page,
+        page_size=page_size,
+        search=normalized_search or None,
+        sort=sort,
+        order=order,
+        cursor=_checked_cursor(cursor, sort, order),
+        count=count,
+    )
@@ -1,18 +1,25 @@
+from collections.abc import Sequence
 from math import ceil
 from typing import Generic, TypeVar
 
 from pydantic import BaseModel
 
+from bases.platform.pagination import CountStrategy, ListCount
+from components.api__fastapi.schemas.common.list_query import ListQueryParams
+from components.persistence__sqlmodel.repositories.shared.keyset import encode_cursor
+
 T = TypeVar("T")
 
 
 class PaginationMeta(BaseModel):
-    total: int
+    total: int | None
     page: int
     pageSize: int
-    pages: int
+    pages: int | None
     hasNext: bool
     hasPrev: bool
+    nextCursor: str | None = None
+    countStrategy: CountStrategy = "exact"
 
     @classmethod
     def from_values(cls, *, total: int, page: int, page_size: int) -> "PaginationMeta":
@@ -26,6 +33,27 @@ class PaginationMeta(BaseModel):
             hasPrev=page > 1,
         )
 
+    @classmethod
+    def for_items(cls, items: Sequence, *, count: ListCount, params: ListQueryParams) -> "PaginationMeta":
+        next_cursor = None
+        if items and count.has_next:
+            last = items[-1]
+            next_cursor = encode_cursor(params.sort, params.order, getattr(last, params.sort), last.id)
+        pages = None
+        # An estimate is table-wide (soft-deleted rows included), so it is shown as a total but never paged.
+        if count.strategy == "exact" and count.total is not None:
+            pages = max(1, ceil(count.total / params.page_size), params.page + (1 if count.has_next else 0))
+        return cls(
+            total=count.total,
+            page=params.page,
+            pageSize=params.page_size,
+            pages=pages,
+            hasNext=count.has_next,
+            hasPrev=params.cursor is not None or params.page > 1,
+            nextCursor=next_cursor,
+            countStrategy=count.strategy,
+        )
+
 
 class Meta(BaseModel):
     pagination: PaginationMeta
@@ -1,3 +1,10 @@
-from components.api__fastapi.schemas.tasks.base import TaskCreate, TaskListResponse, TaskRead, TaskUpdate
+from components.api__fastapi.schemas.tasks.base import (
+    TaskCreate,
+    TaskImportErrorRead,
+    TaskImportResponse,
+    TaskListResponse,
+    TaskRead,
+    TaskUpdate,
+)
 
-__all__ = ["TaskCreate", "TaskUpdate", "TaskRead", "TaskListResponse"]
+__all__ = ["TaskCreate", "TaskUpdate", "TaskRead", "TaskListResponse", "TaskImportErrorRead", "TaskImportResponse"]
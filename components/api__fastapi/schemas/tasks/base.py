@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from components.api__fastapi.schemas.common.pagination import PaginatedResponse
+from components.domain__task.errors import TaskValidationError
 
 TaskType = Literal["pickup", "delivery"]
 TaskStatus = Literal["pending", "scheduled", "in_progress", "completed", "failed", "cancelled"]
@@ -27,6 +28,15 @@ class TaskCreate(BaseModel):
     notes: str | None = None
 
 
+def validate_task_row(data: dict) -> dict:
+    try:
+        return TaskCreate.model_validate(data).model_dump()
+    except ValidationError as exc:
+        raise TaskValidationError(
+            [(str(error["loc"][-1]) if error["loc"] else None, error["msg"]) for error in exc.errors()]
+        ) from exc
+
+
 class TaskUpdate(BaseModel):
     office_id: int | None = Field(default=None, ge=1)
     type: TaskType | None = None
@@ -69,3 +79,17 @@ class TaskRead(BaseModel):
 
 
 TaskListResponse = PaginatedResponse[TaskRead]
+
+
+class TaskImportErrorRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    line: int
+    field: str | None
+    message: str
+
+
+class TaskImportResponse(BaseModel):
+    imported: int
+    failed_rows: int
+    errors: list[TaskImportErrorRead]
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.domain__office.entities import Office
 
 
@@ -12,7 +13,9 @@ class OfficeRepository(ABC):
         search: str | None,
         sort: str,
         order: str,
-    ) -> tuple[list[Office], int]:
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Office], ListCount]:
         raise NotImplementedError
 
     @abstractmethod
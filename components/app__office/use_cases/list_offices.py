@@ -1,3 +1,4 @@
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__office.ports import OfficeRepository
 from components.domain__office.entities import Office
 
@@ -9,11 +10,15 @@ def list_offices(
     search: str | None = None,
     sort: str = "created_at",
     order: str = "desc",
-) -> tuple[list[Office], int]:
+    cursor: str | None = None,
+    count: CountStrategy = "exact",
+) -> tuple[list[Office], ListCount]:
     return repository.list(
         page=page,
         page_size=page_size,
         search=search,
         sort=sort,
         order=order,
+        cursor=cursor,
+        count=count,
     )
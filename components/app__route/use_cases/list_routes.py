@@ -1,6 +1,7 @@
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__route.ports import RouteRepository
 from components.domain__route.entities import Route
 
 
-def list_routes(repository: RouteRepository, *, page: int, page_size: int, search: str | None, sort: str, order: str) -> tuple[list[Route], int]:
-    return repository.list(page=page, page_size=page_size, search=search, sort=sort, order=order)
+def list_routes(repository: RouteRepository, *, page: int, page_size: int, search: str | None, sort: str, order: str, cursor: str | None = None, count: CountStrategy = "exact") -> tuple[list[Route], ListCount]:
+    return repository.list(page=page, page_size=page_size, search=search, sort=sort, order=order, cursor=cursor, count=count)
@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.domain__route_task.entities import RouteTask
 
 
 class RouteTaskRepository(ABC):
     @abstractmethod
-    def list(self, page: int, page_size: int, search: str | None, sort: str, order: str) -> tuple[list[RouteTask], int]:
+    def list(
+        self,
+        page: int,
+        page_size: int,
+        search: str | None,
+        sort: str,
+        order: str,
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[RouteTask], ListCount]:
         raise NotImplementedError
 
     @abstractmethod
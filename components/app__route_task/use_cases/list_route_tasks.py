@@ -1,3 +1,4 @@
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__route_task.ports import RouteTaskRepository
 from components.domain__route_task.entities import RouteTask
 
@@ -10,5 +11,7 @@ def list_route_tasks(
     search: str | None = None,
     sort: str = "created_at",
     order: str = "desc",
-) -> tuple[list[RouteTask], int]:
-    return repository.list(page=page, page_size=page_size, search=search, sort=sort, order=order)
+    cursor: str | None = None,
+    count: CountStrategy = "exact",
+) -> tuple[list[RouteTask], ListCount]:
+    return repository.list(page=page, page_size=page_size, search=search, sort=sort, order=order, cursor=cursor, count=count)
@@ -1,11 +1,22 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.domain__task.entities import Task
 
 
 class TaskRepository(ABC):
     @abstractmethod
-    def list(self, page: int, page_size: int, search: str | None, sort: str, order: str) -> tuple[list[Task], int]:
+    def list(
+        self,
+        page: int,
+        page_size: int,
+        search: str | None,
+        sort: str,
+        order: str,
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Task], ListCount]:
         raise NotImplementedError
 
     @abstractmethod
@@ -20,6 +31,14 @@ class TaskRepository(ABC):
     def create(self, task: Task) -> Task:
         raise NotImplementedError
 
+    @abstractmethod
+    def create_many(self, tasks: Sequence[Task]) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def office_ids_by_reference(self, office_ids: set[int], office_uuids: set[str]) -> dict[int | str, int]:
+        raise NotImplementedError
+
     @abstractmethod
     def update(self, task: Task) -> Task:
         raise NotImplementedError
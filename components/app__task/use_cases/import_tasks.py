@@ -0,0 +1,201 @@
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Literal
+from uuid import uuid4
+
+from bases.platform.time import utc_now
+from components.app__task.ports import TaskRepository
+from components.domain__task.entities import Task
+from components.domain__task.errors import TaskValidationError
+
+DEFAULT_IMPORT_CHUNK_SIZE = 1000
+
+ImportFormat = Literal["csv", "ndjson"]
+IMPORT_FORMATS_BY_SUFFIX: dict[str, ImportFormat] = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+# Turns one raw row into the task's fields, raising TaskValidationError when the row is invalid.
+TaskRowValidator = Callable[[dict], dict]
+
+
+@dataclass
+class TaskImportError:
+    line: int
+    message: str
+    field: str | None = None
+
+
+@dataclass
+class TaskImportResult:
+    imported: int = 0
+    errors: list[TaskImportError] = field(default_factory=list)
+
+
+@dataclass
+class _ParsedRow:
+    line: int
+    data: dict | None
+    error: str | None = None
+
+
+def import_format_for(filename: str | None) -> ImportFormat | None:
+    if not filename or "." not in filename:
+        return None
+    return IMPORT_FORMATS_BY_SUFFIX.get(filename[filename.rindex("."):].lower())
+
+
+def _csv_rows(lines: Iterable[str]) -> Iterator[_ParsedRow]:
+    reader = csv.DictReader(lines)
+    for record in reader:
+        if None in record:
+            yield _ParsedRow(reader.line_num, None, "Row has more values than the header")
+            continue
+        # Empty cells mean "not provided" so the validator's defaults apply.
+        data = {key.strip(): value.strip() for key, value in record.items() if key and value and value.strip()}
+        yield _ParsedRow(reader.line_num, data)
+
+
+def _ndjson_rows(lines: Iterable[str]) -> Iterator[_ParsedRow]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield _ParsedRow(line_number, None, f"Invalid JSON: {exc.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield _ParsedRow(line_number, None, "Each line must be a JSON object")
+            continue
+        yield _ParsedRow(line_number, data)
+
+
+def _office_reference(data: dict) -> int | str | None:
+    if data.get("office_uuid"):
+        return str(data["office_uuid"])
+    office_id = data.get("office_id")
+    # Anything but an integer or a string of digits is left for the validator to reject.
+    if isinstance(office_id, str) and office_id.isascii() and office_id.isdigit():
+        return int(office_id)
+    if isinstance(office_id, int) and not isinstance(office_id, bool):
+        return office_id
+    return None
+
+
+def _import_chunk(
+    repository: TaskRepository, rows: list[_ParsedRow], validate: TaskRowValidator, result: TaskImportResult
+) -> None:
+    parsed = [row for row in rows if row.data is not None]
+    errors = [TaskImportError(row.line, row.error) for row in rows if row.data is None]
+
+    references = [_office_reference(row.data) for row in parsed]
+    offices = repository.office_ids_by_reference(
+        {reference for reference in references if isinstance(reference, int)},
+        {reference for reference in references if isinstance(reference, str)},
+    )
+
+    now = utc_now()
+    tasks: list[Task] = []
+    for row, reference in zip(parsed, references):
+        payload = {key: value for key, value in row.data.items() if key != "office_uuid"}
+        if reference is not None:
+            if reference not in offices:
+                errors.append(
+                    TaskImportError(row.line, "Office not found", "office_uuid" if isinstance(reference, str) else "office_id")
+                )
+                continue
+            payload["office_id"] = offices[reference]
+        try:
+            fields = validate(payload)
+        except TaskValidationError as exc:
+            errors.extend(TaskImportError(row.line, message, field_name) for field_name, message in exc.errors)
+            continue
+        if reference is None:
+            # The validator coerced an office_id that was never looked up, such as 1.0.
+            errors.append(TaskImportError(row.line, "Input should be a valid integer", "office_id"))
+            continue
+        naive = [
+            name
+            for name in ("time_window_start", "time_window_end")
+            if fields.get(name) is not None and fields[name].utcoffset() is None
+        ]
+        if naive:
+            errors.extend(TaskImportError(row.line, "Datetime must include a timezone offset", name) for name in naive)
+            continue
+        tasks.append(
+            Task(
+                id=None,
+                uuid=str(uuid4()),
+                tenant_id=None,
+                office_uuid=None,
+                office_name=None,
+                created_at=now,
+                updated_at=now,
+                deleted_at=None,
+                **fields,
+            )
+        )
+
+    result.imported += repository.create_many(tasks)
+    result.errors.extend(sorted(errors, key=lambda error: error.line))
+
+
+def import_tasks(
+    repository: TaskRepository,
+    lines: Iterable[str],
+    *,
+    format: ImportFormat,
+    validate: TaskRowValidator,
+    chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+) -> TaskImportResult:
+    """Streams CSV or NDJSON task rows into the repository ``chunk_size`` rows at a time.
+
+    Rows that fail to parse, validate or resolve their office are reported by line and skipped;
+    every valid row in the chunk is still inserted.
+    """
+    rows = _csv_rows(lines) if format == "csv" else _ndjson_rows(lines)
+    result = TaskImportResult()
+    while chunk := list(islice(rows, chunk_size)):
+        _import_chunk(repository, chunk, validate, result)
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import tasks from a CSV or NDJSON file.")
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    import_format = args.format or import_format_for(args.path)
+    if import_format is None:
+        parser.error("cannot infer the format from the file name; pass --format")
+
+    from sqlmodel import Session
+
+    from bases.platform.db import engine
+    from components.api__fastapi.schemas.tasks.base import validate_task_row
+    from components.persistence__sqlmodel.repositories.tasks_repo import TaskRepositorySqlModel
+
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    with source, Session(engine) as session:
+        result = import_tasks(
+            TaskRepositorySqlModel(session),
+            source,
+            format=import_format,
+            validate=validate_task_row,
+            chunk_size=args.chunk_size,
+        )
+
+    for error in result.errors:
+        print(json.dumps(asdict(error)), file=sys.stderr)
+    print(json.dumps({"imported": result.imported, "failed_rows": len({error.line for error in result.errors})}))
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.domain__vehicle.entities import Vehicle
 
 
@@ -12,7 +13,9 @@ class VehicleRepository(ABC):
         search: str | None,
         sort: str,
         order: str,
-    ) -> tuple[list[Vehicle], int]:
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Vehicle], ListCount]:
         raise NotImplementedError
 
     @abstractmethod
@@ -1,3 +1,4 @@
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__vehicle.ports import VehicleRepository
 from components.domain__vehicle.entities import Vehicle
 
@@ -9,11 +10,15 @@ def list_vehicles(
     search: str | None = None,
     sort: str = "created_at",
     order: str = "desc",
-) -> tuple[list[Vehicle], int]:
+    cursor: str | None = None,
+    count: CountStrategy = "exact",
+) -> tuple[list[Vehicle], ListCount]:
     return repository.list(
         page=page,
         page_size=page_size,
         search=search,
         sort=sort,
         order=order,
+        cursor=cursor,
+        count=count,
     )
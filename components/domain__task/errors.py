@@ -4,3 +4,11 @@ class TaskError(Exception):
 
 class TaskNotFoundError(TaskError):
     """Raised when a task is not found."""
+
+
+class TaskValidationError(TaskError):
+    """Raised when task input fails validation; ``errors`` holds (field, message) pairs."""
+
+    def __init__(self, errors: list[tuple[str | None, str]]) -> None:
+        super().__init__("; ".join(message for _, message in errors))
+        self.errors = errors
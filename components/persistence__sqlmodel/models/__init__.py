@@ -0,0 +1,2 @@
+# Registers the full-text search tables and triggers with SQLModel.metadata.create_all().
+from components.persistence__sqlmodel import search_index  # noqa: F401
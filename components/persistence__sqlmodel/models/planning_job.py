@@ -0,0 +1,31 @@
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+from bases.platform.time import utc_now
+
+
+class PlanningJobModel(SQLModel, table=True):
+    __tablename__ = "planning_jobs"
+
+    id: int | None = Field(default=None, primary_key=True)
+    uuid: str = Field(default_factory=lambda: str(uuid4()), index=True, unique=True)
+    tenant_id: str | None = Field(default=None, index=True)
+
+    kind: str = Field(default="generate_routes", index=True)
+    office_uuid: str = Field(index=True)
+    service_date: date = Field(index=True)
+    status: str = Field(default="queued", index=True)
+    cancel_requested: bool = Field(default=False)
+    stop_requested: bool = Field(default=False)
+
+    result: dict | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+    error: dict | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+    progress: dict | None = Field(default=None, sa_column=Column(JSON, nullable=True))
+
+    started_at: datetime | None = Field(default=None)
+    finished_at: datetime | None = Field(default=None)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
@@ -1,6 +1,7 @@
 from datetime import date, datetime
 from uuid import uuid4
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 from bases.platform.time import utc_now
@@ -8,6 +9,9 @@ from bases.platform.time import utc_now
 
 class RouteModel(SQLModel, table=True):
     __tablename__ = "routes"
+    __table_args__ = (
+        Index("ix_routes_office_date_live", "office_id", "service_date", sqlite_where=text("deleted_at IS NULL")),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     uuid: str = Field(default_factory=lambda: str(uuid4()), index=True, unique=True)
@@ -1,6 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 from bases.platform.time import utc_now
@@ -8,6 +9,9 @@ from bases.platform.time import utc_now
 
 class TaskModel(SQLModel, table=True):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_office_status_live", "office_id", "status", sqlite_where=text("deleted_at IS NULL")),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     uuid: str = Field(default_factory=lambda: str(uuid4()), index=True, unique=True)
@@ -1,9 +1,12 @@
 from sqlmodel import Session, func, or_, select
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__office.ports import OfficeRepository
 from components.domain__office.entities import Office
 from components.persistence__sqlmodel.models.office import OfficeModel
-from components.persistence__sqlmodel.repositories.shared.sorting import apply_sorting
+from components.persistence__sqlmodel.repositories.shared.counting import fetch_page
+from components.persistence__sqlmodel.repositories.shared.keyset import apply_page
+from components.persistence__sqlmodel.search_index import OFFICE_SEARCH, uses_search_index
 
 OFFICE_SORT_FIELDS = {
     "id": OfficeModel.id,
@@ -60,31 +63,46 @@ class OfficeRepositorySqlModel(OfficeRepository):
         search: str | None,
         sort: str,
         order: str,
-    ) -> tuple[list[Office], int]:
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Office], ListCount]:
         stmt = select(OfficeModel).where(OfficeModel.deleted_at.is_(None))
         count_stmt = select(func.count()).select_from(OfficeModel).where(OfficeModel.deleted_at.is_(None))
 
         normalized_search = " ".join(search.split()) if search is not None else None
         if normalized_search:
-            term = f"%{normalized_search}%"
-            search_clause = or_(
-                OfficeModel.name.ilike(term),
-                OfficeModel.address.ilike(term),
-                OfficeModel.uuid.ilike(term),
-            )
+            if uses_search_index(self.session):
+                search_clause = OfficeModel.id.in_(OFFICE_SEARCH.matching_ids(normalized_search))
+            else:
+                term = f"%{normalized_search}%"
+                search_clause = or_(
+                    OfficeModel.name.ilike(term),
+                    OfficeModel.address.ilike(term),
+                    OfficeModel.uuid.ilike(term),
+                )
             stmt = stmt.where(search_clause)
             count_stmt = count_stmt.where(search_clause)
 
-        stmt = apply_sorting(
+        stmt = apply_page(
             stmt,
+            page=page,
+            page_size=page_size,
             sort=sort,
             order=order,
             allowed_fields=OFFICE_SORT_FIELDS,
+            cursor=cursor,
         )
-        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-        models = self.session.exec(stmt).all()
-        total = self.session.exec(count_stmt).one()
-        return [self._to_entity(m) for m in models], total
+        models, list_count = fetch_page(
+            self.session,
+            stmt,
+            count_stmt,
+            page=page,
+            page_size=page_size,
+            count=count,
+            table=OfficeModel.__tablename__,
+            filtered=bool(normalized_search),
+        )
+        return [self._to_entity(m) for m in models], list_count
 
     def get(self, office_id: int) -> Office | None:
         stmt = select(OfficeModel).where(
@@ -1,9 +1,12 @@
 from sqlmodel import Session, func, or_, select
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__route_task.ports import RouteTaskRepository
 from components.domain__route_task.entities import RouteTask
 from components.persistence__sqlmodel.models.route_task import RouteTaskModel
-from components.persistence__sqlmodel.repositories.shared.sorting import apply_sorting
+from components.persistence__sqlmodel.repositories.shared.counting import fetch_page
+from components.persistence__sqlmodel.repositories.shared.keyset import apply_page
+from components.persistence__sqlmodel.search_index import ROUTE_TASK_SEARCH, uses_search_index
 
 ROUTE_TASK_SORT_FIELDS = {
     "id": RouteTaskModel.id,
@@ -41,26 +44,47 @@ class RouteTaskRepositorySqlModel(RouteTaskRepository):
     def _to_model(self, entity: RouteTask) -> RouteTaskModel:
         return RouteTaskModel(**entity.__dict__)
 
-    def list(self, page: int, page_size: int, search: str | None, sort: str, order: str) -> tuple[list[RouteTask], int]:
+    def list(
+        self,
+        page: int,
+        page_size: int,
+        search: str | None,
+        sort: str,
+        order: str,
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[RouteTask], ListCount]:
         stmt = select(RouteTaskModel).where(RouteTaskModel.deleted_at.is_(None))
         count_stmt = select(func.count()).select_from(RouteTaskModel).where(RouteTaskModel.deleted_at.is_(None))
         normalized_search = " ".join(search.split()) if search is not None else None
         if normalized_search:
-            term = f"%{normalized_search}%"
-            clause = or_(
-                RouteTaskModel.uuid.ilike(term),
-                RouteTaskModel.route_uuid.ilike(term),
-                RouteTaskModel.task_uuid.ilike(term),
-                RouteTaskModel.status.ilike(term),
-            )
+            if uses_search_index(self.session):
+                clause = RouteTaskModel.id.in_(ROUTE_TASK_SEARCH.matching_ids(normalized_search))
+            else:
+                term = f"%{normalized_search}%"
+                clause = or_(
+                    RouteTaskModel.uuid.ilike(term),
+                    RouteTaskModel.route_uuid.ilike(term),
+                    RouteTaskModel.task_uuid.ilike(term),
+                    RouteTaskModel.status.ilike(term),
+                )
             stmt = stmt.where(clause)
             count_stmt = count_stmt.where(clause)
 
-        stmt = apply_sorting(stmt, sort=sort, order=order, allowed_fields=ROUTE_TASK_SORT_FIELDS)
-        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-        models = self.session.exec(stmt).all()
-        total = self.session.exec(count_stmt).one()
-        return [self._to_entity(model) for model in models], total
+        stmt = apply_page(
+            stmt, page=page, page_size=page_size, sort=sort, order=order, allowed_fields=ROUTE_TASK_SORT_FIELDS, cursor=cursor
+        )
+        models, list_count = fetch_page(
+            self.session,
+            stmt,
+            count_stmt,
+            page=page,
+            page_size=page_size,
+            count=count,
+            table=RouteTaskModel.__tablename__,
+            filtered=bool(normalized_search),
+        )
+        return [self._to_entity(model) for model in models], list_count
 
     def get(self, route_task_id: int) -> RouteTask | None:
         stmt = select(RouteTaskModel).where(RouteTaskModel.id == route_task_id, RouteTaskModel.deleted_at.is_(None))
@@ -1,11 +1,14 @@
 from sqlmodel import Session, func, or_, select
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__route.ports import RouteRepository
 from components.domain__route.entities import Route
 from components.persistence__sqlmodel.models.office import OfficeModel
 from components.persistence__sqlmodel.models.route import RouteModel
 from components.persistence__sqlmodel.models.vehicle import VehicleModel
-from components.persistence__sqlmodel.repositories.shared.sorting import apply_sorting
+from components.persistence__sqlmodel.repositories.shared.counting import fetch_page
+from components.persistence__sqlmodel.repositories.shared.keyset import apply_page
+from components.persistence__sqlmodel.search_index import ROUTE_SEARCH, uses_search_index
 
 ROUTE_SORT_FIELDS = {
     "id": RouteModel.id,
@@ -51,7 +54,16 @@ class RouteRepositorySqlModel(RouteRepository):
     def _to_model(self, entity: Route) -> RouteModel:
         return RouteModel(**entity.__dict__)
 
-    def list(self, page: int, page_size: int, search: str | None, sort: str, order: str) -> tuple[list[Route], int]:
+    def list(
+        self,
+        page: int,
+        page_size: int,
+        search: str | None,
+        sort: str,
+        order: str,
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Route], ListCount]:
         stmt = (
             select(RouteModel, OfficeModel, VehicleModel)
             .join(OfficeModel, RouteModel.office_id == OfficeModel.id)
@@ -67,20 +79,32 @@ class RouteRepositorySqlModel(RouteRepository):
         )
         normalized_search = " ".join(search.split()) if search is not None else None
         if normalized_search:
-            term = f"%{normalized_search}%"
-            clause = or_(
-                RouteModel.status.ilike(term),
-                OfficeModel.name.ilike(term),
-                VehicleModel.name.ilike(term),
-                RouteModel.uuid.ilike(term),
-            )
+            if uses_search_index(self.session):
+                clause = RouteModel.id.in_(ROUTE_SEARCH.matching_ids(normalized_search))
+            else:
+                term = f"%{normalized_search}%"
+                clause = or_(
+                    RouteModel.status.ilike(term),
+                    OfficeModel.name.ilike(term),
+                    VehicleModel.name.ilike(term),
+                    RouteModel.uuid.ilike(term),
+                )
             stmt = stmt.where(clause)
             count_stmt = count_stmt.where(clause)
-        stmt = apply_sorting(stmt, sort=sort, order=order, allowed_fields=ROUTE_SORT_FIELDS)
-        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-        rows = self.session.exec(stmt).all()
-        total = self.session.exec(count_stmt).one()
-        return [self._to_entity(route, office, vehicle) for route, office, vehicle in rows], total
+        stmt = apply_page(
+            stmt, page=page, page_size=page_size, sort=sort, order=order, allowed_fields=ROUTE_SORT_FIELDS, cursor=cursor
+        )
+        rows, list_count = fetch_page(
+            self.session,
+            stmt,
+            count_stmt,
+            page=page,
+            page_size=page_size,
+            count=count,
+            table=RouteModel.__tablename__,
+            filtered=bool(normalized_search),
+        )
+        return [self._to_entity(route, office, vehicle) for route, office, vehicle in rows], list_count
 
     def get(self, route_id: int) -> Route | None:
         stmt = (
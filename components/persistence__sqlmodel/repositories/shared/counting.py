@@ -0,0 +1,77 @@
+import threading
+import time
+import weakref
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+from sqlmodel import Session
+
+from bases.platform.pagination import CountStrategy, ListCount
+
+ROW_ESTIMATE_TTL_S = 60.0
+
+_estimates: "weakref.WeakKeyDictionary[Engine, dict[str, tuple[float, int | None]]]" = weakref.WeakKeyDictionary()
+_estimates_lock = threading.Lock()
+
+
+def _read_row_estimate(session: Session, table: str) -> int | None:
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        query = text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)")
+        reltuples = session.execute(query, {"table": table}).scalar()
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+    if dialect == "sqlite":
+        # sqlite_stat1 only exists after ANALYZE; otherwise the rowid b-tree answers MAX() without a scan.
+        has_stats = session.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")).first()
+        if has_stats:
+            stat = session.execute(text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table LIMIT 1"), {"table": table}).scalar()
+            if stat:
+                return int(stat.split()[0])
+        return session.execute(text(f'SELECT MAX(rowid) FROM "{table}"')).scalar() or 0
+    return None
+
+
+def estimate_row_count(session: Session, table: str) -> int | None:
+    engine = session.get_bind()
+    now = time.monotonic()
+    with _estimates_lock:
+        cached = _estimates.get(engine, {}).get(table)
+    if cached is not None and now - cached[0] < ROW_ESTIMATE_TTL_S:
+        return cached[1]
+    estimate = _read_row_estimate(session, table)
+    with _estimates_lock:
+        _estimates.setdefault(engine, {})[table] = (now, estimate)
+    return estimate
+
+
+def fetch_page(
+    session: Session,
+    stmt: Select,
+    count_stmt: Select,
+    *,
+    page: int,
+    page_size: int,
+    count: CountStrategy,
+    table: str,
+    filtered: bool,
+) -> tuple[list, ListCount]:
+    """Runs a statement built by ``apply_page`` (which asks for one lookahead row) and counts it.
+
+    Table statistics say nothing about a search filter, so an estimated count of a filtered list
+    degrades to no count at all; the returned ``ListCount.strategy`` reports what was actually used.
+    An estimate covers the whole table, soft-deleted rows included, so it is only good for a rough total.
+    """
+    rows = session.exec(stmt).all()
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if count == "exact":
+        return rows, ListCount(strategy="exact", total=session.exec(count_stmt).one(), has_next=has_next)
+    if count == "estimated" and not filtered:
+        estimate = estimate_row_count(session, table)
+        if estimate is not None:
+            # Stale statistics must never claim fewer rows than the pages already seen.
+            total = max(estimate, (page - 1) * page_size + len(rows) + (1 if has_next else 0))
+            return rows, ListCount(strategy="estimated", total=total, has_next=has_next)
+    return rows, ListCount(strategy="none", total=None, has_next=has_next)
@@ -0,0 +1,88 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql import Select
+
+from components.persistence__sqlmodel.repositories.shared.sorting import is_nullable, apply_sorting
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    sort: str
+    order: str
+    value: object
+    id: int
+
+
+def encode_cursor(sort: str, order: str, value: object, row_id: int) -> str:
+    if isinstance(value, datetime):
+        tagged = ["datetime", value.isoformat()]
+    elif isinstance(value, date):
+        tagged = ["date", value.isoformat()]
+    else:
+        tagged = ["value", value]
+    payload = json.dumps([sort, order, *tagged, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort, order, kind, raw, row_id = json.loads(payload)
+        if kind == "datetime":
+            value = datetime.fromisoformat(raw)
+        elif kind == "date":
+            value = date.fromisoformat(raw)
+        else:
+            value = raw
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+    if order not in ("asc", "desc") or not isinstance(row_id, int):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return Cursor(sort=sort, order=order, value=value, id=row_id)
+
+
+def apply_keyset(query: Select, *, cursor: Cursor, sort_column: object, id_column: object) -> Select:
+    ascending = cursor.order == "asc"
+    later_id = id_column > cursor.id if ascending else id_column < cursor.id
+    if sort_column is id_column:
+        return query.where(later_id)
+    if cursor.value is None:
+        if ascending:
+            return query.where(or_(sort_column.is_not(None), and_(sort_column.is_(None), later_id)))
+        return query.where(sort_column.is_(None), later_id)
+
+    key = tuple_(sort_column, id_column)
+    clause = key > tuple_(cursor.value, cursor.id) if ascending else key < tuple_(cursor.value, cursor.id)
+    if not ascending and is_nullable(sort_column):
+        clause = or_(clause, sort_column.is_(None))
+    return query.where(clause)
+
+
+def apply_page(
+    query: Select,
+    *,
+    page: int,
+    page_size: int,
+    sort: str,
+    order: str,
+    allowed_fields: dict[str, object],
+    cursor: str | None = None,
+) -> Select:
+    # One row past the page tells whether another page exists without counting.
+    query = apply_sorting(query, sort=sort, order=order, allowed_fields=allowed_fields)
+    if cursor is None:
+        return query.offset((page - 1) * page_size).limit(page_size + 1)
+
+    decoded = decode_cursor(cursor)
+    if (decoded.sort, decoded.order) != (sort, order):
+        raise InvalidCursorError("Pagination cursor does not match the requested sort")
+    query = apply_keyset(query, cursor=decoded, sort_column=allowed_fields[sort], id_column=allowed_fields["id"])
+    return query.limit(page_size + 1)
@@ -1,6 +1,10 @@
 from sqlalchemy.sql import Select
 
 
+def is_nullable(column: object) -> bool:
+    return bool(getattr(getattr(column, "expression", column), "nullable", False))
+
+
 def apply_sorting(
     query: Select,
     *,
@@ -9,6 +13,12 @@ def apply_sorting(
     allowed_fields: dict[str, object],
 ) -> Select:
     sort_column = allowed_fields[sort]
+    id_column = allowed_fields["id"]
     if order == "desc":
-        return query.order_by(sort_column.desc())
-    return query.order_by(sort_column.asc())
+        ordering = sort_column.desc()
+        # NULLs rank lowest in both directions so keyset cursors can resume past them on any backend.
+        ordering = ordering.nulls_last() if is_nullable(sort_column) else ordering
+        return query.order_by(ordering) if sort_column is id_column else query.order_by(ordering, id_column.desc())
+    ordering = sort_column.asc()
+    ordering = ordering.nulls_first() if is_nullable(sort_column) else ordering
+    return query.order_by(ordering) if sort_column is id_column else query.order_by(ordering, id_column.asc())
@@ -1,10 +1,16 @@
-from sqlmodel import Session, func, or_, select
+from collections.abc import Sequence
 
+from sqlalchemy import insert
+from sqlmodel import Session, col, func, or_, select
+
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__task.ports import TaskRepository
 from components.domain__task.entities import Task
 from components.persistence__sqlmodel.models.office import OfficeModel
 from components.persistence__sqlmodel.models.task import TaskModel
-from components.persistence__sqlmodel.repositories.shared.sorting import apply_sorting
+from components.persistence__sqlmodel.repositories.shared.counting import fetch_page
+from components.persistence__sqlmodel.repositories.shared.keyset import apply_page
+from components.persistence__sqlmodel.search_index import TASK_SEARCH, uses_search_index
 
 TASK_SORT_FIELDS = {
     "id": TaskModel.id,
@@ -53,7 +59,16 @@ class TaskRepositorySqlModel(TaskRepository):
     def _to_model(self, entity: Task) -> TaskModel:
         return TaskModel(**entity.__dict__)
 
-    def list(self, page: int, page_size: int, search: str | None, sort: str, order: str) -> tuple[list[Task], int]:
+    def list(
+        self,
+        page: int,
+        page_size: int,
+        search: str | None,
+        sort: str,
+        order: str,
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Task], ListCount]:
         stmt = (
             select(TaskModel, OfficeModel)
             .join(OfficeModel, TaskModel.office_id == OfficeModel.id)
@@ -67,23 +82,35 @@ class TaskRepositorySqlModel(TaskRepository):
         )
         normalized_search = " ".join(search.split()) if search is not None else None
         if normalized_search:
-            term = f"%{normalized_search}%"
-            clause = or_(
-                TaskModel.type.ilike(term),
-                TaskModel.status.ilike(term),
-                TaskModel.priority.ilike(term),
-                TaskModel.reference.ilike(term),
-                TaskModel.address.ilike(term),
-                OfficeModel.name.ilike(term),
-                TaskModel.uuid.ilike(term),
-            )
+            if uses_search_index(self.session):
+                clause = TaskModel.id.in_(TASK_SEARCH.matching_ids(normalized_search))
+            else:
+                term = f"%{normalized_search}%"
+                clause = or_(
+                    TaskModel.type.ilike(term),
+                    TaskModel.status.ilike(term),
+                    TaskModel.priority.ilike(term),
+                    TaskModel.reference.ilike(term),
+                    TaskModel.address.ilike(term),
+                    OfficeModel.name.ilike(term),
+                    TaskModel.uuid.ilike(term),
+                )
             stmt = stmt.where(clause)
             count_stmt = count_stmt.where(clause)
-        stmt = apply_sorting(stmt, sort=sort, order=order, allowed_fields=TASK_SORT_FIELDS)
-        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-        rows = self.session.exec(stmt).all()
-        total = self.session.exec(count_stmt).one()
-        return [self._to_entity(task, office) for task, office in rows], total
+        stmt = apply_page(
+            stmt, page=page, page_size=page_size, sort=sort, order=order, allowed_fields=TASK_SORT_FIELDS, cursor=cursor
+        )
+        rows, list_count = fetch_page(
+            self.session,
+            stmt,
+            count_stmt,
+            page=page,
+            page_size=page_size,
+            count=count,
+            table=TaskModel.__tablename__,
+            filtered=bool(normalized_search),
+        )
+        return [self._to_entity(task, office) for task, office in rows], list_count
 
     def get(self, task_id: int) -> Task | None:
         stmt = (
@@ -117,6 +144,29 @@ class TaskRepositorySqlModel(TaskRepository):
         office = self.session.get(OfficeModel, model.office_id)
         return self._to_entity(model, office)
 
+    def create_many(self, tasks: Sequence[Task]) -> int:
+        if not tasks:
+            return 0
+        columns = [column.name for column in TaskModel.__table__.columns if column.name != "id"]
+        rows = [{name: getattr(task, name) for name in columns} for task in tasks]
+        # One executemany per batch instead of a commit, refresh and office lookup per task.
+        self.session.execute(insert(TaskModel), rows)
+        self.session.commit()
+        return len(rows)
+
+    def office_ids_by_reference(self, office_ids: set[int], office_uuids: set[str]) -> dict[int | str, int]:
+        if not office_ids and not office_uuids:
+            return {}
+        stmt = select(OfficeModel.id, OfficeModel.uuid).where(
+            OfficeModel.deleted_at.is_(None),
+            or_(col(OfficeModel.id).in_(office_ids), col(OfficeModel.uuid).in_(office_uuids)),
+        )
+        references: dict[int | str, int] = {}
+        for office_id, office_uuid in self.session.exec(stmt).all():
+            references[office_id] = office_id
+            references[office_uuid] = office_id
+        return references
+
     def update(self, task: Task) -> Task:
         model = self.session.get(TaskModel, task.id)
         if model is None:
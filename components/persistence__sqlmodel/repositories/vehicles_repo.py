@@ -1,10 +1,13 @@
 from sqlmodel import Session, func, or_, select
 
+from bases.platform.pagination import CountStrategy, ListCount
 from components.app__vehicle.ports import VehicleRepository
 from components.domain__vehicle.entities import Vehicle
 from components.persistence__sqlmodel.models.office import OfficeModel
 from components.persistence__sqlmodel.models.vehicle import VehicleModel
-from components.persistence__sqlmodel.repositories.shared.sorting import apply_sorting
+from components.persistence__sqlmodel.repositories.shared.counting import fetch_page
+from components.persistence__sqlmodel.repositories.shared.keyset import apply_page
+from components.persistence__sqlmodel.search_index import VEHICLE_SEARCH, uses_search_index
 
 VEHICLE_SORT_FIELDS = {
     "id": VehicleModel.id,
@@ -62,7 +65,9 @@ class VehicleRepositorySqlModel(VehicleRepository):
         search: str | None,
         sort: str,
         order: str,
-    ) -> tuple[list[Vehicle], int]:
+        cursor: str | None = None,
+        count: CountStrategy = "exact",
+    ) -> tuple[list[Vehicle], ListCount]:
         stmt = (
             select(VehicleModel, OfficeModel)
             .join(OfficeModel, VehicleModel.office_id == OfficeModel.id)
@@ -77,22 +82,34 @@ class VehicleRepositorySqlModel(VehicleRepository):
 
         normalized_search = " ".join(search.split()) if search is not None else None
         if normalized_search:
-            term = f"%{normalized_search}%"
-            search_clause = or_(
-                VehicleModel.name.ilike(term),
-                VehicleModel.plate.ilike(term),
-                VehicleModel.uuid.ilike(term),
-                OfficeModel.name.ilike(term),
-                OfficeModel.uuid.ilike(term),
-            )
+            if uses_search_index(self.session):
+                search_clause = VehicleModel.id.in_(VEHICLE_SEARCH.matching_ids(normalized_search))
+            else:
+                term = f"%{normalized_search}%"
+                search_clause = or_(
+                    VehicleModel.name.ilike(term),
+                    VehicleModel.plate.ilike(term),
+                    VehicleModel.uuid.ilike(term),
+                    OfficeModel.name.ilike(term),
+                    OfficeModel.uuid.ilike(term),
+                )
             stmt = stmt.where(search_clause)
             count_stmt = count_stmt.where(search_clause)
 
-        stmt = apply_sorting(stmt, sort=sort, order=order, allowed_fields=VEHICLE_SORT_FIELDS)
-        stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-        rows = self.session.exec(stmt).all()
-        total = self.session.exec(count_stmt).one()
-        return [self._to_entity(vehicle, office) for vehicle, office in rows], total
+        stmt = apply_page(
+            stmt, page=page, page_size=page_size, sort=sort, order=order, allowed_fields=VEHICLE_SORT_FIELDS, cursor=cursor
+        )
+        rows, list_count = fetch_page(
+            self.session,
+            stmt,
+            count_stmt,
+            page=page,
+            page_size=page_size,
+            count=count,
+            table=VehicleModel.__tablename__,
+            filtered=bool(normalized_search),
+        )
+        return [self._to_entity(vehicle, office) for vehicle, office in rows], list_count
 
     def get(self, vehicle_id: int) -> Vehicle | None:
         stmt = (
@@ -0,0 +1,200 @@
+import argparse
+from collections.abc import Collection
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+from sqlmodel import Session, SQLModel
+
+# Trigram tables answer substring phrases of at least this many characters from the index.
+MIN_INDEXED_TERM_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """FTS5 trigram table holding one searchable document per live row of ``table``, keyed by its id.
+
+    Triggers rebuild a row's document whenever one of ``columns`` changes on the base table, or when
+    one of the ``parents`` columns it copies from a referenced table changes.
+    """
+
+    name: str
+    table: str
+    columns: tuple[str, ...]
+    fields: tuple[str, ...]
+    joins: str = ""
+    parents: tuple[tuple[str, str, tuple[str, ...]], ...] = ()
+
+    def _select(self, condition: str) -> str:
+        document = " || char(10) || ".join(f"coalesce({field}, '')" for field in self.fields)
+        return (
+            f"SELECT {self.table}.id, {document} FROM {self.table} {self.joins} "
+            f"WHERE {self.table}.deleted_at IS NULL AND {condition}"
+        )
+
+    def _refresh(self, condition: str, stale_ids: str) -> str:
+        return (
+            f"DELETE FROM {self.name} WHERE rowid IN ({stale_ids}); "
+            f"INSERT INTO {self.name}(rowid, document) {self._select(condition)};"
+        )
+
+    def ddl(self) -> list[str]:
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5(document, tokenize='trigram')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai AFTER INSERT ON {self.table} BEGIN "
+            f"INSERT INTO {self.name}(rowid, document) {self._select(f'{self.table}.id = NEW.id')}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au AFTER UPDATE OF {', '.join(self.columns)} ON {self.table} BEGIN "
+            f"{self._refresh(f'{self.table}.id = NEW.id', 'OLD.id')} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad AFTER DELETE ON {self.table} BEGIN "
+            f"DELETE FROM {self.name} WHERE rowid = OLD.id; END",
+        ]
+        for parent, foreign_key, parent_columns in self.parents:
+            condition = f"{self.table}.{foreign_key} = NEW.id"
+            stale_ids = f"SELECT id FROM {self.table} WHERE {foreign_key} = NEW.id"
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {self.name}_{parent}_au AFTER UPDATE OF {', '.join(parent_columns)} "
+                f"ON {parent} BEGIN {self._refresh(condition, stale_ids)} END"
+            )
+        return statements
+
+    def drop_ddl(self) -> list[str]:
+        triggers = [f"{self.name}_ai", f"{self.name}_au", f"{self.name}_ad"]
+        triggers += [f"{self.name}_{parent}_au" for parent, _, _ in self.parents]
+        return [f"DROP TRIGGER IF EXISTS {trigger}" for trigger in triggers] + [f"DROP TABLE IF EXISTS {self.name}"]
+
+    def rebuild_sql(self) -> list[str]:
+        return [
+            f"DELETE FROM {self.name}",
+            f"INSERT INTO {self.name}(rowid, document) {self._select('1 = 1')}",
+            f"INSERT INTO {self.name}({self.name}) VALUES ('optimize')",
+        ]
+
+    def matching_ids(self, term: str) -> Select:
+        index = sa.table(self.name, sa.column("rowid"), sa.column("document"))
+        if len(term) >= MIN_INDEXED_TERM_LENGTH:
+            phrase = '"' + term.replace('"', '""') + '"'
+            return sa.select(index.c.rowid).where(index.c.document.match(phrase))
+        # Shorter terms have no trigram to look up; scanning the compact index still beats the base tables.
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return sa.select(index.c.rowid).where(index.c.document.like(pattern, escape="\\"))
+
+
+OFFICE_SEARCH = SearchIndex(
+    name="offices_search",
+    table="offices",
+    columns=("name", "address", "uuid", "deleted_at"),
+    fields=("offices.name", "offices.address", "offices.uuid"),
+)
+VEHICLE_SEARCH = SearchIndex(
+    name="vehicles_search",
+    table="vehicles",
+    columns=("name", "plate", "uuid", "office_id", "deleted_at"),
+    fields=("vehicles.name", "vehicles.plate", "vehicles.uuid", "offices.name", "offices.uuid"),
+    joins="JOIN offices ON offices.id = vehicles.office_id",
+    parents=(("offices", "office_id", ("name", "uuid")),),
+)
+TASK_SEARCH = SearchIndex(
+    name="tasks_search",
+    table="tasks",
+    columns=("type", "status", "priority", "reference", "address", "uuid", "office_id", "deleted_at"),
+    fields=(
+        "tasks.type", "tasks.status", "tasks.priority", "tasks.reference", "tasks.address", "offices.name", "tasks.uuid"
+    ),
+    joins="JOIN offices ON offices.id = tasks.office_id",
+    parents=(("offices", "office_id", ("name",)),),
+)
+ROUTE_SEARCH = SearchIndex(
+    name="routes_search",
+    table="routes",
+    columns=("status", "uuid", "office_id", "vehicle_id", "deleted_at"),
+    fields=("routes.status", "offices.name", "vehicles.name", "routes.uuid"),
+    joins="JOIN offices ON offices.id = routes.office_id JOIN vehicles ON vehicles.id = routes.vehicle_id",
+    parents=(("offices", "office_id", ("name",)), ("vehicles", "vehicle_id", ("name",))),
+)
+ROUTE_TASK_SEARCH = SearchIndex(
+    name="route_tasks_search",
+    table="route_tasks",
+    columns=("uuid", "route_uuid", "task_uuid", "status", "deleted_at"),
+    fields=("route_tasks.uuid", "route_tasks.route_uuid", "route_tasks.task_uuid", "route_tasks.status"),
+)
+
+SEARCH_INDEXES = (OFFICE_SEARCH, VEHICLE_SEARCH, TASK_SEARCH, ROUTE_SEARCH, ROUTE_TASK_SEARCH)
+
+
+def _selected(names: list[str] | None) -> tuple[SearchIndex, ...]:
+    if not names:
+        return SEARCH_INDEXES
+    unknown = set(names) - {index.table for index in SEARCH_INDEXES}
+    if unknown:
+        raise ValueError(f"Unknown search index: {', '.join(sorted(unknown))}")
+    return tuple(index for index in SEARCH_INDEXES if index.table in names)
+
+
+def uses_search_index(session: Session) -> bool:
+    # Only SQLite gets index tables; other dialects keep searching the base tables with ILIKE.
+    return session.get_bind().dialect.name == "sqlite"
+
+
+def create_search_indexes(connection: Connection, tables: Collection[str] | None = None) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    existing = set(sa.inspect(connection).get_table_names())
+    for index in SEARCH_INDEXES:
+        if tables is not None and index.table not in tables:
+            continue
+        # Triggers reference the base and parent tables, so an index waits until all of them exist.
+        if not {index.table, *(parent for parent, _, _ in index.parents)} <= existing:
+            continue
+        for statement in index.ddl():
+            connection.exec_driver_sql(statement)
+
+
+def drop_search_indexes(connection: Connection, tables: Collection[str] | None = None) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for index in SEARCH_INDEXES:
+        if tables is not None and not {index.table, *(parent for parent, _, _ in index.parents)} & set(tables):
+            continue
+        for statement in index.drop_ddl():
+            connection.exec_driver_sql(statement)
+
+
+def rebuild_search_indexes(connection: Connection, tables: list[str] | None = None) -> dict[str, int]:
+    if connection.dialect.name != "sqlite":
+        return {}
+    counts: dict[str, int] = {}
+    for index in _selected(tables):
+        for statement in index.rebuild_sql():
+            connection.exec_driver_sql(statement)
+        counts[index.table] = connection.exec_driver_sql(f"SELECT count(*) FROM {index.name}").scalar_one()
+    return counts
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _create_after_metadata(target, connection: Connection, **kw) -> None:  # type: ignore[no-untyped-def]
+    create_search_indexes(connection, {table.name for table in kw["tables"]})
+
+
+@event.listens_for(SQLModel.metadata, "before_drop")
+def _drop_before_metadata(target, connection: Connection, **kw) -> None:  # type: ignore[no-untyped-def]
+    drop_search_indexes(connection, {table.name for table in kw["tables"]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the full-text search indexes from the base tables.")
+    parser.add_argument("tables", nargs="*", help="Tables to reindex (default: all).")
+    args = parser.parse_args()
+
+    from bases.platform.db import engine
+
+    with engine.begin() as connection:
+        create_search_indexes(connection)
+        counts = rebuild_search_indexes(connection, args.tables)
+    for table, indexed in counts.items():
+        print(f"{table}: {indexed} rows indexed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import logging
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import date
+
+from fastapi import HTTPException, status
+from sqlmodel import Session, col, select
+
+from bases.platform.config import get_settings
+from components.persistence__sqlmodel.models.office import OfficeModel
+from components.route_planning.ortools_vrp_solver import VrpSolution
+from components.route_planning.route_planner_service import (
+    OfficePlanningInstance,
+    PlanningProblem,
+    dropped_task_uuids,
+    load_planning_instance,
+    persist_planned_routes,
+    solve_planning_instance,
+    solver_stats_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OfficePlanningOutcome:
+    office_uuid: str
+    status: str
+    route_uuids: list[str] = field(default_factory=list)
+    dropped_task_uuids: list[str] = field(default_factory=list)
+    error: dict | None = None
+    load_ms: int = 0
+    solve_ms: int = 0
+    persist_ms: int = 0
+    solver_stats: dict | None = None
+
+
+@dataclass
+class BatchPlanningResult:
+    service_date: date
+    offices: list[OfficePlanningOutcome]
+    wall_ms: int
+
+
+def _elapsed_ms(started_at: float) -> int:
+    return int((time.perf_counter() - started_at) * 1000)
+
+
+def _timed_solve(problem: PlanningProblem) -> tuple[VrpSolution, int]:
+    started_at = time.perf_counter()
+    solution = solve_planning_instance(problem)
+    return solution, _elapsed_ms(started_at)
+
+
+def _error_payload(exc: Exception) -> dict:
+    if isinstance(exc, HTTPException):
+        return {"status_code": exc.status_code, "detail": exc.detail}
+    return {"status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "type": type(exc).__name__, "detail": str(exc)}
+
+
+def _batch_office_uuids(session: Session, office_uuids: list[str] | None) -> list[str]:
+    if office_uuids:
+        return list(dict.fromkeys(office_uuids))
+    query = select(OfficeModel.uuid).where(OfficeModel.deleted_at.is_(None)).order_by(col(OfficeModel.id).asc())
+    return list(session.exec(query).all())
+
+
+def generate_routes_batch(
+    session: Session,
+    service_date: date,
+    office_uuids: list[str] | None = None,
+    max_workers: int | None = None,
+    time_ceiling_s: float | None = None,
+) -> BatchPlanningResult:
+    started_at = time.perf_counter()
+    outcomes: dict[str, OfficePlanningOutcome] = {}
+    instances: dict[str, OfficePlanningInstance] = {}
+
+    for office_uuid in _batch_office_uuids(session, office_uuids):
+        outcome = OfficePlanningOutcome(office_uuid=office_uuid, status="pending")
+        outcomes[office_uuid] = outcome
+        load_started_at = time.perf_counter()
+        try:
+            instance = load_planning_instance(session, service_date, office_uuid)
+        except Exception as exc:
+            if not isinstance(exc, HTTPException):
+                logger.exception("Loading the planning instance for office %s failed", office_uuid)
+            session.rollback()
+            outcome.status = "failed"
+            outcome.error = _error_payload(exc)
+            continue
+        finally:
+            outcome.load_ms = _elapsed_ms(load_started_at)
+
+        if instance is None:
+            outcome.status = "no_tasks"
+            continue
+        instance.problem.time_ceiling_s = time_ceiling_s
+        instances[office_uuid] = instance
+
+    if instances:
+        workers = min(max_workers or get_settings().planning_batch_workers, len(instances))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures: dict[Future, str] = {
+                executor.submit(_timed_solve, instance.problem): office_uuid
+                for office_uuid, instance in instances.items()
+            }
+            for future in as_completed(futures):
+                office_uuid = futures[future]
+                outcome = outcomes[office_uuid]
+                persist_started_at = time.perf_counter()
+                try:
+                    solution, outcome.solve_ms = future.result()
+                    outcome.solver_stats = solver_stats_payload(solution.stats)
+                    outcome.route_uuids = persist_planned_routes(session, instances[office_uuid], solution)
+                    outcome.dropped_task_uuids = dropped_task_uuids(instances[office_uuid], solution)
+                    outcome.status = "succeeded"
+                except BrokenProcessPool:
+                    # Every pending office would fail the same way; let the whole batch fail once instead.
+                    raise
+                except Exception as exc:
+                    if not isinstance(exc, HTTPException):
+                        logger.exception("Planning office %s failed", office_uuid)
+                    outcome.status = "failed"
+                    outcome.error = _error_payload(exc)
+                finally:
+                    outcome.persist_ms = _elapsed_ms(persist_started_at)
+
+    return BatchPlanningResult(service_date=service_date, offices=list(outcomes.values()), wall_ms=_elapsed_ms(started_at))
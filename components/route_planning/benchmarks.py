@@ -0,0 +1,320 @@
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import random
+import re
+import resource
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Literal
+
+from components.route_planning.fallback_heuristic import Location
+from components.route_planning.haversine_matrix import build_distance_matrix, matrix_rows
+from components.route_planning.ortools_vrp_solver import (
+    HAS_ORTOOLS,
+    DEFAULT_HEURISTIC_TIME_BUDGET_S,
+    SolverBudget,
+    VrpSolution,
+    _solve_fallback,
+    solve_capacitated_vrp,
+)
+from components.route_planning.sparse_matrix import SparseDistanceMatrix
+
+InstanceKind = Literal["uniform", "clustered", "mixed"]
+BenchmarkPhase = Literal["matrix", "sparse-matrix", "ortools", "fallback"]
+INSTANCE_KINDS: tuple[InstanceKind, ...] = ("uniform", "clustered", "mixed")
+DEFAULT_SIZES = (10, 50, 200, 1000, 5000)
+DEFAULT_STOPS_PER_VEHICLE = (15, 40)
+DEPOT: Location = (19.4326, -99.1332)
+SPREAD_DEG = 0.3
+
+
+@dataclass
+class BenchmarkInstance:
+    name: str
+    demands: list[int]
+    vehicle_capacities: list[int]
+    locations: list[Location] | None = None
+    distance_matrix: list[list[int]] | None = None
+    best_known: int | None = None
+
+
+def _uniform_point(rng: random.Random) -> Location:
+    return DEPOT[0] + rng.uniform(-SPREAD_DEG, SPREAD_DEG), DEPOT[1] + rng.uniform(-SPREAD_DEG, SPREAD_DEG)
+
+
+def generate_instance(kind: InstanceKind, stop_count: int, vehicle_count: int, seed: int = 0) -> BenchmarkInstance:
+    rng = random.Random(f"{kind}:{stop_count}:{vehicle_count}:{seed}")
+    centers = [_uniform_point(rng) for _ in range(max(3, stop_count // 100))]
+
+    def clustered_point() -> Location:
+        lat, lng = rng.choice(centers)
+        return lat + rng.gauss(0, SPREAD_DEG / 15), lng + rng.gauss(0, SPREAD_DEG / 15)
+
+    locations = [DEPOT]
+    for index in range(stop_count):
+        if kind == "uniform" or (kind == "mixed" and index % 2 == 0):
+            locations.append(_uniform_point(rng))
+        else:
+            locations.append(clustered_point())
+
+    demands = [0] + [rng.randint(1, 10) for _ in range(stop_count)]
+    capacity = math.ceil(sum(demands) * 1.2 / vehicle_count)
+    capacity = max(capacity, max(demands))
+    return BenchmarkInstance(
+        name=f"{kind}-n{stop_count}-v{vehicle_count}-s{seed}",
+        locations=locations,
+        demands=demands,
+        vehicle_capacities=[capacity] * vehicle_count,
+    )
+
+
+def _section_rows(lines: list[str], start: int) -> list[list[str]]:
+    rows: list[list[str]] = []
+    for line in lines[start + 1 :]:
+        parts = line.split()
+        if not parts or not parts[0].lstrip("-").isdigit():
+            break
+        rows.append(parts)
+    return rows
+
+
+def _best_known_from_solution_file(path: Path) -> int | None:
+    solution_path = path.with_suffix(".sol")
+    if not solution_path.exists():
+        return None
+    match = re.search(r"^\s*cost\s+(\d+)", solution_path.read_text(), re.IGNORECASE | re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def load_cvrplib_instance(path: str | Path) -> BenchmarkInstance:
+    path = Path(path)
+    lines = path.read_text().splitlines()
+    header: dict[str, str] = {}
+    coordinates: dict[int, tuple[float, float]] = {}
+    demand_by_node: dict[int, int] = {}
+    depot_node = 1
+
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith("NODE_COORD_SECTION"):
+            coordinates = {int(row[0]): (float(row[1]), float(row[2])) for row in _section_rows(lines, index)}
+        elif stripped.startswith("DEMAND_SECTION"):
+            demand_by_node = {int(row[0]): int(row[1]) for row in _section_rows(lines, index)}
+        elif stripped.startswith("DEPOT_SECTION"):
+            depot_node = int(_section_rows(lines, index)[0][0])
+        elif ":" in stripped:
+            key, value = stripped.split(":", 1)
+            header[key.strip().upper()] = value.strip()
+
+    if header.get("EDGE_WEIGHT_TYPE", "EUC_2D") != "EUC_2D":
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {header['EDGE_WEIGHT_TYPE']}")
+
+    nodes = [depot_node] + sorted(node for node in coordinates if node != depot_node)
+    points = [coordinates[node] for node in nodes]
+    distance_matrix = [[int(math.hypot(ax - bx, ay - by) + 0.5) for bx, by in points] for ax, ay in points]
+
+    name = header.get("NAME", path.stem)
+    comment = header.get("COMMENT", "")
+    trucks = re.search(r"k(\d+)", name) or re.search(r"trucks:\s*(\d+)", comment, re.IGNORECASE)
+    best = re.search(r"(?:optimal|best) value:\s*(\d+)", comment, re.IGNORECASE)
+    capacity = int(header["CAPACITY"])
+    vehicle_count = int(trucks.group(1)) if trucks else math.ceil(sum(demand_by_node.values()) / capacity)
+
+    return BenchmarkInstance(
+        name=name,
+        demands=[demand_by_node.get(node, 0) if node != depot_node else 0 for node in nodes],
+        vehicle_capacities=[capacity] * vehicle_count,
+        distance_matrix=distance_matrix,
+        best_known=int(best.group(1)) if best else _best_known_from_solution_file(path),
+    )
+
+
+def _peak_rss_mb() -> float:
+    # Linux carries ru_maxrss across fork and exec, so a spawned child would report its parent's peak;
+    # VmHWM belongs to the current process image alone.
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _timed(run: Callable[[], object]) -> tuple[object, int]:
+    started_at = time.perf_counter()
+    result = run()
+    return result, int((time.perf_counter() - started_at) * 1000)
+
+
+def _solution_record(instance: BenchmarkInstance, solver: str, solution: VrpSolution, wall_ms: int, peak_rss_mb: float) -> dict:
+    served = sum(len(plan.task_indices) for plan in solution.routes)
+    objective = sum(plan.distance_m for plan in solution.routes) if solution.routes else None
+    gap_pct = None
+    if objective is not None and instance.best_known:
+        gap_pct = round((objective - instance.best_known) * 100 / instance.best_known, 2)
+    return {
+        "instance": instance.name,
+        "phase": solver,
+        "stops": len(instance.demands) - 1,
+        "vehicles": len(instance.vehicle_capacities),
+        "wall_ms": wall_ms,
+        "peak_rss_mb": peak_rss_mb,
+        "feasible": served == len(instance.demands) - 1,
+        "routes": len(solution.routes),
+        "objective": objective,
+        "best_known": instance.best_known,
+        "gap_pct": gap_pct,
+    }
+
+
+def _instance_matrix(instance: BenchmarkInstance, sparse_neighbours: int | None):
+    if instance.distance_matrix is not None:
+        return instance.distance_matrix
+    if sparse_neighbours is not None:
+        return SparseDistanceMatrix(instance.locations, sparse_neighbours)
+    return build_distance_matrix(instance.locations)
+
+
+def _run_phase(
+    instance: BenchmarkInstance,
+    phase: BenchmarkPhase,
+    time_limit_s: float,
+    heuristic_time_budget_s: float,
+    sparse_neighbours: int | None,
+) -> dict:
+    if phase in ("matrix", "sparse-matrix"):
+        _, wall_ms = _timed(lambda: _instance_matrix(instance, sparse_neighbours))
+        return {
+            "instance": instance.name,
+            "phase": phase,
+            "stops": len(instance.demands) - 1,
+            "wall_ms": wall_ms,
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+    matrix = _instance_matrix(instance, sparse_neighbours)
+    if phase == "ortools":
+        solution, wall_ms = _timed(
+            lambda: solve_capacitated_vrp(
+                matrix,
+                instance.demands,
+                instance.vehicle_capacities,
+                time_limit_seconds=time_limit_s,
+                locations=instance.locations,
+                engine="ortools",
+                budget=SolverBudget(stall_window_s=None),
+            )
+        )
+    else:
+        solution, wall_ms = _timed(
+            lambda: _solve_fallback(
+                matrix_rows(matrix),
+                instance.demands,
+                instance.vehicle_capacities,
+                locations=instance.locations,
+                time_budget_s=heuristic_time_budget_s,
+            )
+        )
+    return _solution_record(instance, phase, solution, wall_ms, _peak_rss_mb())
+
+
+def run_instance(
+    instance: BenchmarkInstance,
+    solvers: tuple[str, ...] = ("ortools", "fallback"),
+    time_limit_s: float = 5,
+    heuristic_time_budget_s: float = DEFAULT_HEURISTIC_TIME_BUDGET_S,
+    ortools_max_stops: int = 1000,
+    sparse_neighbours: int | None = None,
+) -> list[dict]:
+    phases: list[BenchmarkPhase] = []
+    if instance.distance_matrix is None:
+        phases.append("sparse-matrix" if sparse_neighbours is not None else "matrix")
+    if "ortools" in solvers and HAS_ORTOOLS and len(instance.demands) - 1 <= ortools_max_stops:
+        phases.append("ortools")
+    if "fallback" in solvers:
+        phases.append("fallback")
+
+    # ru_maxrss only ever grows, so every phase runs in a fresh interpreter to report a peak of its own,
+    # native solver memory included.
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"), max_tasks_per_child=1) as executor:
+        return [
+            executor.submit(_run_phase, instance, phase, time_limit_s, heuristic_time_budget_s, sparse_neighbours).result()
+            for phase in phases
+        ]
+
+
+def synthetic_suite(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    kinds: tuple[InstanceKind, ...] = INSTANCE_KINDS,
+    stops_per_vehicle: tuple[int, ...] = DEFAULT_STOPS_PER_VEHICLE,
+    seed: int = 0,
+) -> list[BenchmarkInstance]:
+    return [
+        generate_instance(kind, size, max(1, math.ceil(size / per_vehicle)), seed)
+        for size in sizes
+        for kind in kinds
+        for per_vehicle in stops_per_vehicle
+    ]
+
+
+def run_suite(instances: list[BenchmarkInstance], **options) -> dict:
+    results: list[dict] = []
+    for instance in instances:
+        results.extend(run_instance(instance, **options))
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "ortools": HAS_ORTOOLS,
+        "options": options,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark route planning throughput and quality.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--kinds", nargs="+", choices=INSTANCE_KINDS, default=list(INSTANCE_KINDS))
+    parser.add_argument("--stops-per-vehicle", type=int, nargs="+", default=list(DEFAULT_STOPS_PER_VEHICLE))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cvrplib", nargs="*", default=[], help="CVRPLIB .vrp files to include")
+    parser.add_argument("--solvers", nargs="+", choices=("ortools", "fallback"), default=["ortools", "fallback"])
+    parser.add_argument("--time-limit", type=float, default=5)
+    parser.add_argument("--heuristic-budget", type=float, default=DEFAULT_HEURISTIC_TIME_BUDGET_S)
+    parser.add_argument("--ortools-max-stops", type=int, default=1000)
+    parser.add_argument("--sparse-neighbours", type=int, help="keep only this many neighbours per stop instead of a dense matrix")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    instances = synthetic_suite(tuple(args.sizes), tuple(args.kinds), tuple(args.stops_per_vehicle), args.seed)
+    instances += [load_cvrplib_instance(path) for path in args.cvrplib]
+    report = run_suite(
+        instances,
+        solvers=tuple(args.solvers),
+        time_limit_s=args.time_limit,
+        heuristic_time_budget_s=args.heuristic_budget,
+        ortools_max_stops=args.ortools_max_stops,
+        sparse_neighbours=args.sparse_neighbours,
+    )
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
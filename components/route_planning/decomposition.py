@@ -0,0 +1,195 @@
+import dataclasses
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import atan2, ceil, pi
+from typing import TypeVar
+
+from components.route_planning.fallback_heuristic import Location, LocalSearch, build_neighbour_lists
+from components.route_planning.haversine_matrix import matrix_rows
+from components.route_planning.matrix_providers import TravelMatrixProvider
+from components.route_planning.ortools_vrp_solver import (
+    VehicleRoutePlan,
+    VrpSolution,
+    combine_solver_stats,
+    has_time_windows,
+    schedule_route,
+)
+
+ProblemT = TypeVar("ProblemT")
+BOUNDARY_REPAIR_TIME_BUDGET_S = 0.5
+
+
+@dataclass
+class ProblemCluster:
+    node_indices: list[int]
+    vehicle_indices: list[int]
+
+
+def _sweep_order(locations: list[Location]) -> list[int]:
+    depot_lat, depot_lng = locations[0]
+    angles = sorted((atan2(lat - depot_lat, lng - depot_lng), node) for node, (lat, lng) in enumerate(locations[1:], start=1))
+    if len(angles) < 2:
+        return [node for _, node in angles]
+
+    # Start the sweep after the widest angular gap so no dense group is cut in two.
+    gaps = [
+        (angles[index][0] - angles[index - 1][0]) % (2 * pi) if index else angles[0][0] + 2 * pi - angles[-1][0]
+        for index in range(len(angles))
+    ]
+    start = max(range(len(gaps)), key=gaps.__getitem__)
+    return [node for _, node in angles[start:] + angles[:start]]
+
+
+def sweep_clusters(
+    locations: list[Location],
+    demands: list[int],
+    vehicle_capacities: list[int],
+    cluster_size: int,
+) -> list[ProblemCluster]:
+    task_count = len(locations) - 1
+    cluster_count = max(1, min(len(vehicle_capacities), ceil(task_count / max(1, cluster_size))))
+    clusters = [ProblemCluster(node_indices=[], vehicle_indices=[]) for _ in range(cluster_count)]
+
+    by_capacity = sorted(range(len(vehicle_capacities)), key=lambda vehicle: -vehicle_capacities[vehicle])
+    for position, vehicle_index in enumerate(by_capacity):
+        clusters[position % cluster_count].vehicle_indices.append(vehicle_index)
+    for cluster in clusters:
+        cluster.vehicle_indices.sort()
+
+    group_capacities = [sum(vehicle_capacities[vehicle] for vehicle in cluster.vehicle_indices) for cluster in clusters]
+    fill_ratio = min(1.0, sum(demands[1:]) / max(1, sum(group_capacities)))
+    loads = [0] * cluster_count
+    current = 0
+    for node in _sweep_order(locations):
+        while (
+            current < cluster_count - 1
+            and clusters[current].node_indices
+            and loads[current] + demands[node] > group_capacities[current] * fill_ratio
+        ):
+            current += 1
+        clusters[current].node_indices.append(node)
+        loads[current] += demands[node]
+
+    return [cluster for cluster in clusters if cluster.node_indices]
+
+
+def _pick(values: list, nodes: list[int]) -> list:
+    return [values[0]] + [values[node] for node in nodes] if values else values
+
+
+def cluster_problem(problem: ProblemT, cluster: ProblemCluster) -> ProblemT:
+    return dataclasses.replace(
+        problem,
+        locations=_pick(problem.locations, cluster.node_indices),
+        demands=_pick(problem.demands, cluster.node_indices),
+        capacities=[problem.capacities[vehicle] for vehicle in cluster.vehicle_indices],
+        service_times=_pick(problem.service_times, cluster.node_indices),
+        time_windows=_pick(problem.time_windows, cluster.node_indices),
+        location_keys=_pick(problem.location_keys, cluster.node_indices) if problem.location_keys else None,
+        vehicle_locations=(
+            [problem.vehicle_locations[vehicle] for vehicle in cluster.vehicle_indices] if problem.vehicle_locations else None
+        ),
+        drop_penalties=_pick(problem.drop_penalties, cluster.node_indices) if problem.drop_penalties else None,
+    )
+
+
+def merge_cluster_solutions(clusters: list[ProblemCluster], solutions: list[VrpSolution]) -> VrpSolution:
+    plans: list[VehicleRoutePlan] = []
+    dropped_task_indices: list[int] = []
+    for cluster, solution in zip(clusters, solutions, strict=True):
+        if not solution.routes and not solution.dropped_task_indices:
+            return VrpSolution(routes=[])
+        for plan in solution.routes:
+            plan.vehicle_index = cluster.vehicle_indices[plan.vehicle_index]
+            plan.task_indices = [cluster.node_indices[task_index] - 1 for task_index in plan.task_indices]
+            plans.append(plan)
+        dropped_task_indices += [cluster.node_indices[task_index] - 1 for task_index in solution.dropped_task_indices]
+    plans.sort(key=lambda plan: plan.vehicle_index)
+    return VrpSolution(routes=plans, dropped_task_indices=sorted(dropped_task_indices))
+
+
+def repair_cluster_boundary(
+    problem,
+    solution: VrpSolution,
+    first: ProblemCluster,
+    second: ProblemCluster,
+    provider: TravelMatrixProvider,
+    time_budget_s: float = BOUNDARY_REPAIR_TIME_BUDGET_S,
+) -> None:
+    vehicles = set(first.vehicle_indices) | set(second.vehicle_indices)
+    plans = [plan for plan in solution.routes if plan.vehicle_index in vehicles]
+    if len(plans) < 2:
+        return
+
+    nodes = [task_index + 1 for plan in plans for task_index in plan.task_indices]
+    local_of = {node: local for local, node in enumerate(nodes, start=1)}
+    locations = _pick(problem.locations, nodes)
+    travel_matrix = provider.build(locations, _pick(problem.location_keys, nodes) if problem.location_keys else None)
+    distances = matrix_rows(travel_matrix.distances_m)
+    demands = _pick(problem.demands, nodes)
+    service_times = _pick(problem.service_times, nodes) or None
+
+    routes = [[local_of[task_index + 1] for task_index in plan.task_indices] for plan in plans]
+    search = LocalSearch(
+        distances,
+        demands,
+        [problem.capacities[plan.vehicle_index] for plan in plans],
+        build_neighbour_lists(distances, locations),
+        routes,
+        time.perf_counter() + time_budget_s,
+    )
+    search.run()
+
+    durations = matrix_rows(travel_matrix.durations_s)
+    for plan, route in zip(plans, search.routes, strict=True):
+        path = [0, *route, 0]
+        plan.task_indices = [nodes[local - 1] - 1 for local in route]
+        plan.distance_m = sum(distances[origin][destination] for origin, destination in zip(path, path[1:]))
+        plan.total_load = sum(demands[local] for local in route)
+        if plan.arrivals_s or plan.duration_s is not None:
+            plan.arrivals_s, plan.departures_s, plan.duration_s = schedule_route(
+                route, durations, service_times, route_start_s=problem.route_start_s
+            )
+    solution.routes = [plan for plan in solution.routes if plan.task_indices]
+
+
+def solve_decomposed(
+    problem: ProblemT,
+    solve: Callable[[ProblemT], VrpSolution],
+    provider: TravelMatrixProvider,
+    cluster_size: int,
+    max_workers: int = 1,
+    repair: bool = True,
+) -> VrpSolution:
+    started_at = time.perf_counter()
+    clusters = sweep_clusters(problem.locations, problem.demands, problem.capacities, cluster_size)
+    subproblems = [cluster_problem(problem, cluster) for cluster in clusters]
+
+    workers = min(max_workers, len(subproblems))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            solutions = list(executor.map(solve, subproblems))
+    else:
+        solutions = [solve(subproblem) for subproblem in subproblems]
+
+    solution = merge_cluster_solutions(clusters, solutions)
+    # Moving stops across clusters ignores time windows and vehicle start locations, so only repair
+    # unconstrained days where every vehicle leaves from the office.
+    if (
+        repair
+        and solution.routes
+        and len(clusters) > 1
+        and not has_time_windows(problem.time_windows or None)
+        and not any(problem.vehicle_locations or ())
+    ):
+        pair_count = len(clusters) if len(clusters) > 2 else 1
+        for index in range(pair_count):
+            repair_cluster_boundary(problem, solution, clusters[index], clusters[(index + 1) % len(clusters)], provider)
+    solution.stats = combine_solver_stats(
+        [cluster_solution.stats for cluster_solution in solutions], int((time.perf_counter() - started_at) * 1000)
+    )
+    if solution.stats is not None and solution.routes:
+        solution.stats.final_objective = sum(plan.distance_m for plan in solution.routes)
+    return solution
@@ -0,0 +1,584 @@
+import heapq
+import time
+from collections.abc import Callable, Iterable, Iterator
+from math import cos, floor, radians, sqrt
+
+Location = tuple[float, float]
+
+DEFAULT_NEIGHBOUR_COUNT = 16
+MAX_OR_OPT_SEGMENT = 3
+
+
+class SpatialGrid:
+    def __init__(self, locations: list[Location], nodes: Iterable[int]) -> None:
+        self.locations = locations
+        members = list(nodes)
+        latitudes = [locations[node][0] for node in members] or [0.0]
+        self._lng_scale = max(cos(radians(sum(latitudes) / len(latitudes))), 0.01)
+        xs = [self._x(locations[node]) for node in members] or [0.0]
+        self._min_x = min(xs)
+        self._min_y = min(latitudes)
+        self._cells_per_side = max(1, int(sqrt(len(members) / 2)))
+        span = max(max(xs) - self._min_x, max(latitudes) - self._min_y)
+        self._cell_size = span / self._cells_per_side if span > 0 else 1.0
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        for node in members:
+            self._cells.setdefault(self._cell_of(locations[node]), set()).add(node)
+
+    def _x(self, location: Location) -> float:
+        return location[1] * self._lng_scale
+
+    def _cell_of(self, location: Location) -> tuple[int, int]:
+        return (
+            floor((self._x(location) - self._min_x) / self._cell_size),
+            floor((location[0] - self._min_y) / self._cell_size),
+        )
+
+    def remove(self, node: int) -> None:
+        cell = self._cells.get(self._cell_of(self.locations[node]))
+        if cell is not None:
+            cell.discard(node)
+
+    def _ring(self, cx: int, cy: int, radius: int) -> Iterator[tuple[int, int]]:
+        if radius == 0:
+            yield cx, cy
+            return
+        for dx in range(-radius, radius + 1):
+            yield cx + dx, cy - radius
+            yield cx + dx, cy + radius
+        for dy in range(-radius + 1, radius):
+            yield cx - radius, cy + dy
+            yield cx + radius, cy + dy
+
+    def nearest(self, location: Location, accept: Callable[[int], bool], limit: int = 1) -> list[int]:
+        cx, cy = self._cell_of(location)
+        side = self._cells_per_side
+        max_radius = max(abs(cx), abs(cy), abs(cx - side), abs(cy - side)) + 1
+        found: list[int] = []
+        first_hit_radius: int | None = None
+        for radius in range(max_radius + 1):
+            for cell in self._ring(cx, cy, radius):
+                found.extend(node for node in self._cells.get(cell, ()) if accept(node))
+            if found and first_hit_radius is None:
+                first_hit_radius = radius
+            # One extra ring catches points that are closer than those in the first hit cell.
+            if first_hit_radius is not None and len(found) >= limit and radius > first_hit_radius:
+                break
+        return found
+
+    def k_nearest(self, location: Location, accept: Callable[[int], bool], limit: int, slack: float = 1.05) -> list[int]:
+        # Unlike nearest(), keeps widening until no unvisited cell can hold anything closer than the
+        # limit-th hit; slack absorbs the gap between the planar grid and great-circle distances.
+        cx, cy = self._cell_of(location)
+        side = self._cells_per_side
+        max_radius = max(abs(cx), abs(cy), abs(cx - side), abs(cy - side)) + 1
+        origin_x, origin_y = self._x(location), location[0]
+        found: list[tuple[float, int]] = []
+        for radius in range(max_radius + 1):
+            for cell in self._ring(cx, cy, radius):
+                for node in self._cells.get(cell, ()):
+                    if accept(node):
+                        x, y = self._x(self.locations[node]), self.locations[node][0]
+                        found.append(((x - origin_x) ** 2 + (y - origin_y) ** 2, node))
+            if len(found) >= limit:
+                found.sort()
+                if radius * self._cell_size >= sqrt(found[limit - 1][0]) * slack:
+                    break
+        return [node for _, node in found]
+
+
+def customer_nodes(size: int, depots: Iterable[int] = ()) -> list[int]:
+    excluded = {0, *depots}
+    return [node for node in range(1, size) if node not in excluded]
+
+
+def build_neighbour_lists(
+    distance_matrix: list[list[int]],
+    locations: list[Location] | None,
+    neighbour_count: int = DEFAULT_NEIGHBOUR_COUNT,
+    customers: list[int] | None = None,
+) -> list[list[int]]:
+    size = len(distance_matrix)
+    customers = customers if customers is not None else customer_nodes(size)
+    count = min(neighbour_count, max(len(customers) - 1, 0))
+    sparse_neighbours = getattr(distance_matrix, "neighbours", None)
+    if sparse_neighbours is not None:
+        members = set(customers)
+        return [[candidate for candidate in row if candidate in members][:count] for row in sparse_neighbours]
+
+    neighbours: list[list[int]] = []
+    if locations is not None and len(locations) == size:
+        grid = SpatialGrid(locations, customers)
+        for node in range(size):
+            row = distance_matrix[node]
+            candidates = grid.nearest(locations[node], lambda candidate: candidate != node, limit=count + 1)
+            neighbours.append(sorted(candidates, key=row.__getitem__)[:count])
+        return neighbours
+
+    for node in range(size):
+        row = distance_matrix[node]
+        neighbours.append(heapq.nsmallest(count, (candidate for candidate in customers if candidate != node), key=row.__getitem__))
+    return neighbours
+
+
+def construct_routes(
+    distance_matrix: list[list[int]],
+    demands: list[int],
+    vehicle_capacities: list[int],
+    neighbours: list[list[int]],
+    locations: list[Location] | None = None,
+    starts: list[int] | None = None,
+    customers: list[int] | None = None,
+) -> tuple[list[list[int]], set[int]]:
+    size = len(distance_matrix)
+    remaining = set(customers if customers is not None else customer_nodes(size))
+    grid = SpatialGrid(locations, remaining) if locations is not None and len(locations) == size else None
+    if starts is not None and len(set(starts)) > 1:
+        return _construct_from_depots(distance_matrix, demands, vehicle_capacities, neighbours, locations, starts, remaining, grid)
+    by_demand = sorted((demands[node], node) for node in remaining)
+    demand_cursor = 0
+    routes: list[list[int]] = []
+
+    for vehicle_index, capacity in enumerate(vehicle_capacities):
+        route: list[int] = []
+        load = 0
+        current_node = starts[vehicle_index] if starts is not None else 0
+        while remaining:
+            while demand_cursor < len(by_demand) and by_demand[demand_cursor][1] not in remaining:
+                demand_cursor += 1
+            spare = capacity - load
+            if demand_cursor == len(by_demand) or by_demand[demand_cursor][0] > spare:
+                break
+
+            row = distance_matrix[current_node]
+            feasible = [node for node in neighbours[current_node] if node in remaining and demands[node] <= spare]
+            if not feasible:
+                if grid is not None:
+                    feasible = grid.nearest(locations[current_node], lambda node: demands[node] <= spare)
+                else:
+                    feasible = [node for node in remaining if demands[node] <= spare]
+            next_node = min(feasible, key=row.__getitem__)
+
+            route.append(next_node)
+            load += demands[next_node]
+            remaining.discard(next_node)
+            if grid is not None:
+                grid.remove(next_node)
+            current_node = next_node
+        routes.append(route)
+
+    return routes, remaining
+
+
+def _construct_from_depots(
+    distance_matrix: list[list[int]],
+    demands: list[int],
+    vehicle_capacities: list[int],
+    neighbours: list[list[int]],
+    locations: list[Location] | None,
+    starts: list[int],
+    remaining: set[int],
+    grid: SpatialGrid | None,
+) -> tuple[list[list[int]], set[int]]:
+    # Filling one vehicle at a time would drag it across every other depot's area, so all vehicles
+    # grow in parallel and the globally cheapest extension wins each step.
+    routes: list[list[int]] = [[] for _ in vehicle_capacities]
+    loads = [0] * len(vehicle_capacities)
+    tails = list(starts)
+
+    def candidate(vehicle_index: int) -> tuple[int, int] | None:
+        spare = vehicle_capacities[vehicle_index] - loads[vehicle_index]
+        row = distance_matrix[tails[vehicle_index]]
+        feasible = [node for node in neighbours[tails[vehicle_index]] if node in remaining and demands[node] <= spare]
+        if not feasible:
+            if grid is not None:
+                feasible = grid.nearest(locations[tails[vehicle_index]], lambda node: demands[node] <= spare)
+            else:
+                feasible = [node for node in remaining if demands[node] <= spare]
+        if not feasible:
+            return None
+        node = min(feasible, key=row.__getitem__)
+        return row[node], node
+
+    heap: list[tuple[int, int, int]] = []
+    for vehicle_index in range(len(vehicle_capacities)):
+        best = candidate(vehicle_index)
+        if best is not None:
+            heap.append((best[0], vehicle_index, best[1]))
+    heapq.heapify(heap)
+
+    while heap and remaining:
+        _, vehicle_index, node = heapq.heappop(heap)
+        if node in remaining and loads[vehicle_index] + demands[node] <= vehicle_capacities[vehicle_index]:
+            routes[vehicle_index].append(node)
+            loads[vehicle_index] += demands[node]
+            remaining.discard(node)
+            if grid is not None:
+                grid.remove(node)
+            tails[vehicle_index] = node
+        best = candidate(vehicle_index)
+        if best is not None:
+            heapq.heappush(heap, (best[0], vehicle_index, best[1]))
+
+    return routes, remaining
+
+
+class LocalSearch:
+    def __init__(
+        self,
+        distance_matrix: list[list[int]],
+        demands: list[int],
+        vehicle_capacities: list[int],
+        neighbours: list[list[int]],
+        routes: list[list[int]],
+        deadline: float,
+        on_solution: Callable[[int, list[list[int]]], None] | None = None,
+        should_stop: Callable[[], bool] | None = None,
+        starts: list[int] | None = None,
+        ends: list[int] | None = None,
+    ) -> None:
+        self.matrix = distance_matrix
+        self.starts = starts if starts is not None else [0] * len(routes)
+        self.ends = ends if ends is not None else [0] * len(routes)
+        self.demands = demands
+        self.capacities = vehicle_capacities
+        self.neighbours = neighbours
+        self.routes = routes
+        self.deadline = deadline
+        self.on_solution = on_solution
+        self.should_stop = should_stop
+        self.objective = sum(
+            route_cost(distance_matrix, route, start, end) for route, start, end in zip(routes, self.starts, self.ends, strict=True)
+        )
+        self.loads = [sum(demands[node] for node in route) for route in routes]
+        self.route_of = [-1] * len(distance_matrix)
+        self.position_of = [-1] * len(distance_matrix)
+        for route_index in range(len(routes)):
+            self._reindex(route_index)
+
+    def _reindex(self, route_index: int) -> None:
+        for position, node in enumerate(self.routes[route_index]):
+            self.route_of[node] = route_index
+            self.position_of[node] = position
+
+    def _expired(self) -> bool:
+        return time.perf_counter() >= self.deadline or (self.should_stop is not None and self.should_stop())
+
+    def _accept(self, delta: int) -> None:
+        self.objective += delta
+        if self.on_solution is not None:
+            self.on_solution(self.objective, self.routes)
+
+    def _prev(self, node: int) -> int:
+        position = self.position_of[node]
+        route_index = self.route_of[node]
+        return self.routes[route_index][position - 1] if position > 0 else self.starts[route_index]
+
+    def _next(self, node: int) -> int:
+        route_index = self.route_of[node]
+        route = self.routes[route_index]
+        position = self.position_of[node]
+        return route[position + 1] if position + 1 < len(route) else self.ends[route_index]
+
+    def run(self) -> list[list[int]]:
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            for route_index in range(len(self.routes)):
+                improved |= self._two_opt(route_index)
+                improved |= self._or_opt(route_index)
+            improved |= self._relocate()
+            improved |= self._swap()
+        return self.routes
+
+    def rebalance(self) -> list[list[int]]:
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            improved |= self._relocate()
+            improved |= self._swap()
+            improved |= self._cross_exchange()
+        return self.routes
+
+    def improve_routes(self, route_indices: Iterable[int]) -> list[list[int]]:
+        for route_index in route_indices:
+            while not self._expired() and (self._two_opt(route_index) | self._or_opt(route_index)):
+                pass
+        return self.routes
+
+    def _two_opt(self, route_index: int) -> bool:
+        matrix = self.matrix
+        improved_any = False
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            path = [self.starts[route_index], *self.routes[route_index], self.ends[route_index]]
+            forward = [0] * len(path)
+            backward = [0] * len(path)
+            for index in range(1, len(path)):
+                forward[index] = forward[index - 1] + matrix[path[index - 1]][path[index]]
+                backward[index] = backward[index - 1] + matrix[path[index]][path[index - 1]]
+
+            for start in range(1, len(path) - 2):
+                before = path[start - 1]
+                for candidate in self.neighbours[before]:
+                    if self.route_of[candidate] != route_index:
+                        continue
+                    end = self.position_of[candidate] + 1
+                    if end <= start:
+                        continue
+                    after = path[end + 1]
+                    delta = (
+                        matrix[before][path[end]]
+                        + matrix[path[start]][after]
+                        - matrix[before][path[start]]
+                        - matrix[path[end]][after]
+                        + (backward[end] - backward[start])
+                        - (forward[end] - forward[start])
+                    )
+                    if delta < 0:
+                        self._accept(delta)
+                        path[start : end + 1] = reversed(path[start : end + 1])
+                        self.routes[route_index] = path[1:-1]
+                        self._reindex(route_index)
+                        improved = improved_any = True
+                        break
+                if improved:
+                    break
+        return improved_any
+
+    def _or_opt(self, route_index: int) -> bool:
+        matrix = self.matrix
+        improved_any = False
+        improved = True
+        while improved and not self._expired():
+            improved = False
+            route = self.routes[route_index]
+            for segment_length in range(1, MAX_OR_OPT_SEGMENT + 1):
+                for start in range(len(route) - segment_length + 1):
+                    segment = route[start : start + segment_length]
+                    before = route[start - 1] if start > 0 else self.starts[route_index]
+                    after = route[start + segment_length] if start + segment_length < len(route) else self.ends[route_index]
+                    removal_gain = matrix[before][segment[0]] + matrix[segment[-1]][after] - matrix[before][after]
+                    for candidate in self.neighbours[segment[0]]:
+                        if self.route_of[candidate] != route_index or candidate in segment or candidate == before:
+                            continue
+                        successor = self._next(candidate)
+                        if successor in segment:
+                            continue
+                        insertion_cost = matrix[candidate][segment[0]] + matrix[segment[-1]][successor] - matrix[candidate][successor]
+                        if insertion_cost - removal_gain < 0:
+                            self._accept(insertion_cost - removal_gain)
+                            remainder = route[:start] + route[start + segment_length :]
+                            insert_at = remainder.index(candidate) + 1
+                            self.routes[route_index] = remainder[:insert_at] + segment + remainder[insert_at:]
+                            self._reindex(route_index)
+                            improved = improved_any = True
+                            break
+                    if improved:
+                        break
+                if improved:
+                    break
+        return improved_any
+
+    def _relocate(self) -> bool:
+        matrix = self.matrix
+        improved_any = False
+        for node in range(1, len(matrix)):
+            if self._expired():
+                break
+            source = self.route_of[node]
+            if source < 0:
+                continue
+            before, after = self._prev(node), self._next(node)
+            removal_gain = matrix[before][node] + matrix[node][after] - matrix[before][after]
+            best: tuple[int, int, int] | None = None
+            for candidate in self.neighbours[node]:
+                target = self.route_of[candidate]
+                if target < 0 or target == source or self.loads[target] + self.demands[node] > self.capacities[target]:
+                    continue
+                candidate_prev, candidate_next = self._prev(candidate), self._next(candidate)
+                after_cost = matrix[candidate][node] + matrix[node][candidate_next] - matrix[candidate][candidate_next]
+                before_cost = matrix[candidate_prev][node] + matrix[node][candidate] - matrix[candidate_prev][candidate]
+                for delta, offset in ((after_cost - removal_gain, 1), (before_cost - removal_gain, 0)):
+                    if delta < 0 and (best is None or delta < best[0]):
+                        best = (delta, target, self.position_of[candidate] + offset)
+            if best is None:
+                continue
+
+            delta, target, insert_at = best
+            self._accept(delta)
+            self.routes[source].pop(self.position_of[node])
+            self.routes[target].insert(insert_at, node)
+            self.loads[source] -= self.demands[node]
+            self.loads[target] += self.demands[node]
+            self._reindex(source)
+            self._reindex(target)
+            improved_any = True
+        return improved_any
+
+    def _replacement_delta(self, old: int, new: int) -> int:
+        before, after = self._prev(old), self._next(old)
+        return (
+            self.matrix[before][new] + self.matrix[new][after] - self.matrix[before][old] - self.matrix[old][after]
+        )
+
+    def _swap(self) -> bool:
+        improved_any = False
+        for node in range(1, len(self.matrix)):
+            if self._expired():
+                break
+            source = self.route_of[node]
+            if source < 0:
+                continue
+            for candidate in self.neighbours[node]:
+                target = self.route_of[candidate]
+                if target < 0 or target == source:
+                    continue
+                demand_shift = self.demands[candidate] - self.demands[node]
+                if self.loads[source] + demand_shift > self.capacities[source] or self.loads[target] - demand_shift > self.capacities[target]:
+                    continue
+                delta = self._replacement_delta(node, candidate) + self._replacement_delta(candidate, node)
+                if delta >= 0:
+                    continue
+                self._accept(delta)
+
+                node_position, candidate_position = self.position_of[node], self.position_of[candidate]
+                self.routes[source][node_position] = candidate
+                self.routes[target][candidate_position] = node
+                self.loads[source] += demand_shift
+                self.loads[target] -= demand_shift
+                self._reindex(source)
+                self._reindex(target)
+                improved_any = True
+                break
+        return improved_any
+
+    def _cross_exchange(self) -> bool:
+        matrix = self.matrix
+        improved_any = False
+        for node in range(1, len(matrix)):
+            if self._expired():
+                break
+            source = self.route_of[node]
+            if source < 0:
+                continue
+            before = self._prev(node)
+            # A short arc from this node's predecessor into another route's segment is what makes
+            # exchanging the two segments worthwhile.
+            for candidate in self.neighbours[before]:
+                target = self.route_of[candidate]
+                if target < 0 or target == source:
+                    continue
+                if self._exchange_segments(source, self.position_of[node], target, self.position_of[candidate]):
+                    improved_any = True
+                    break
+        return improved_any
+
+    def _exchange_segments(self, source: int, source_start: int, target: int, target_start: int) -> bool:
+        matrix = self.matrix
+        source_route, target_route = self.routes[source], self.routes[target]
+        source_before = source_route[source_start - 1] if source_start > 0 else self.starts[source]
+        target_before = target_route[target_start - 1] if target_start > 0 else self.starts[target]
+        for source_length in range(1, min(MAX_OR_OPT_SEGMENT, len(source_route) - source_start) + 1):
+            source_segment = source_route[source_start : source_start + source_length]
+            source_end = source_start + source_length
+            source_after = source_route[source_end] if source_end < len(source_route) else self.ends[source]
+            source_demand = sum(self.demands[node] for node in source_segment)
+            for target_length in range(1, min(MAX_OR_OPT_SEGMENT, len(target_route) - target_start) + 1):
+                if source_length == target_length == 1:
+                    continue
+                target_segment = target_route[target_start : target_start + target_length]
+                target_end = target_start + target_length
+                target_after = target_route[target_end] if target_end < len(target_route) else self.ends[target]
+                demand_shift = sum(self.demands[node] for node in target_segment) - source_demand
+                if (
+                    self.loads[source] + demand_shift > self.capacities[source]
+                    or self.loads[target] - demand_shift > self.capacities[target]
+                ):
+                    continue
+                delta = (
+                    matrix[source_before][target_segment[0]]
+                    + matrix[target_segment[-1]][source_after]
+                    + matrix[target_before][source_segment[0]]
+                    + matrix[source_segment[-1]][target_after]
+                    - matrix[source_before][source_segment[0]]
+                    - matrix[source_segment[-1]][source_after]
+                    - matrix[target_before][target_segment[0]]
+                    - matrix[target_segment[-1]][target_after]
+                )
+                if delta >= 0:
+                    continue
+                self._accept(delta)
+                self.routes[source] = source_route[:source_start] + target_segment + source_route[source_end:]
+                self.routes[target] = target_route[:target_start] + source_segment + target_route[target_end:]
+                self.loads[source] += demand_shift
+                self.loads[target] -= demand_shift
+                self._reindex(source)
+                self._reindex(target)
+                return True
+        return False
+
+
+def route_cost(distance_matrix: list[list[int]], route: list[int], start: int = 0, end: int = 0) -> int:
+    path = [start, *route, end]
+    return sum(distance_matrix[origin][destination] for origin, destination in zip(path, path[1:]))
+
+
+def _is_complete_assignment(
+    routes: list[list[int]], demands: list[int], vehicle_capacities: list[int], customers: list[int]
+) -> bool:
+    visited = sorted(node for route in routes for node in route)
+    return (
+        len(routes) == len(vehicle_capacities)
+        and visited == customers
+        and all(sum(demands[node] for node in route) <= capacity for route, capacity in zip(routes, vehicle_capacities))
+    )
+
+
+def _servable_customers(
+    demands: list[int], vehicle_capacities: list[int], customers: list[int], penalties: list[int]
+) -> list[int]:
+    # When the fleet cannot carry everything, keep the stops that are most expensive to drop.
+    spare = sum(vehicle_capacities)
+    if sum(demands[node] for node in customers) <= spare:
+        return customers
+    largest = max(vehicle_capacities, default=0)
+    served: list[int] = []
+    for node in sorted(customers, key=lambda node: (-penalties[node], demands[node])):
+        if demands[node] <= min(spare, largest):
+            served.append(node)
+            spare -= demands[node]
+    return sorted(served)
+
+
+def solve_with_heuristic(
+    distance_matrix: list[list[int]],
+    demands: list[int],
+    vehicle_capacities: list[int],
+    locations: list[Location] | None = None,
+    time_budget_s: float = 0.5,
+    neighbour_count: int = DEFAULT_NEIGHBOUR_COUNT,
+    initial_routes: list[list[int]] | None = None,
+    on_solution: Callable[[int, list[list[int]]], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    starts: list[int] | None = None,
+    ends: list[int] | None = None,
+    penalties: list[int] | None = None,
+) -> list[list[int]] | None:
+    deadline = time.perf_counter() + time_budget_s
+    customers = customer_nodes(len(distance_matrix), [*(starts or ()), *(ends or ())])
+    neighbours = build_neighbour_lists(distance_matrix, locations, neighbour_count, customers)
+    if initial_routes is not None and _is_complete_assignment(initial_routes, demands, vehicle_capacities, customers):
+        routes = [list(route) for route in initial_routes]
+    else:
+        served = customers if penalties is None else _servable_customers(demands, vehicle_capacities, customers, penalties)
+        routes, remaining = construct_routes(distance_matrix, demands, vehicle_capacities, neighbours, locations, starts, served)
+        if remaining and penalties is None:
+            return None
+    search = LocalSearch(
+        distance_matrix, demands, vehicle_capacities, neighbours, routes, deadline, on_solution, should_stop, starts, ends
+    )
+    if on_solution is not None:
+        on_solution(search.objective, search.routes)
+    return search.run()
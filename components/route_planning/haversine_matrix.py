@@ -1,6 +1,16 @@
+import importlib.util
+from collections.abc import Sequence
 from math import asin, cos, radians, sin, sqrt
 
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+
 EARTH_RADIUS_M = 6371000
+MATRIX_BLOCK_ROWS = 256
+
+DistanceMatrix = list[list[int]]
+MatrixLike = Sequence[Sequence[int]]
 
 
 def haversine_distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> int:
@@ -17,17 +27,61 @@ def haversine_distance_m(lat1: float, lng1: float, lat2: float, lng2: float) ->
     return int(EARTH_RADIUS_M * c)
 
 
-def build_distance_matrix(locations: list[tuple[float, float]]) -> list[list[int]]:
+def _build_distance_matrix_python(locations: list[tuple[float, float]]) -> DistanceMatrix:
     size = len(locations)
-    matrix: list[list[int]] = []
+    matrix: DistanceMatrix = [[0] * size for _ in range(size)]
     for i in range(size):
         origin_lat, origin_lng = locations[i]
-        row: list[int] = []
-        for j in range(size):
-            if i == j:
-                row.append(0)
-                continue
+        row = matrix[i]
+        for j in range(i + 1, size):
             destination_lat, destination_lng = locations[j]
-            row.append(haversine_distance_m(origin_lat, origin_lng, destination_lat, destination_lng))
-        matrix.append(row)
+            distance_m = haversine_distance_m(origin_lat, origin_lng, destination_lat, destination_lng)
+            row[j] = distance_m
+            matrix[j][i] = distance_m
     return matrix
+
+
+def _build_distance_matrix_numpy(locations: list[tuple[float, float]]) -> "np.ndarray":
+    size = len(locations)
+    matrix = np.zeros((size, size), dtype=np.int32)
+    if size == 0:
+        return matrix
+
+    coordinates = np.radians(np.asarray(locations, dtype=np.float64).reshape(size, 2))
+    lat = coordinates[:, 0]
+    lng = coordinates[:, 1]
+    cos_lat = np.cos(lat)
+
+    # Only the upper triangle (row blocks against the columns at or after them) is evaluated,
+    # the lower triangle is mirrored from it.
+    for start in range(0, size, MATRIX_BLOCK_ROWS):
+        stop = min(start + MATRIX_BLOCK_ROWS, size)
+        d_lat = lat[None, start:] - lat[start:stop, None]
+        d_lng = lng[None, start:] - lng[start:stop, None]
+        a = np.sin(d_lat / 2) ** 2 + cos_lat[start:stop, None] * cos_lat[None, start:] * np.sin(d_lng / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(a))
+        block = (EARTH_RADIUS_M * c).astype(np.int32)
+        block[np.tril_indices(stop - start, k=0)] = 0
+        matrix[start:stop, start:] = block
+
+    return matrix + matrix.T
+
+
+def build_distance_matrix(locations: list[tuple[float, float]]) -> MatrixLike:
+    if HAS_NUMPY:
+        return _build_distance_matrix_numpy(locations)
+    return _build_distance_matrix_python(locations)
+
+
+def matrix_rows(matrix: MatrixLike) -> DistanceMatrix:
+    # Sparse matrices are already row-indexable and must not be expanded.
+    if isinstance(matrix, list) or not hasattr(matrix, "tolist"):
+        return matrix
+    return matrix.tolist()
+
+
+def build_duration_matrix(distance_matrix: MatrixLike, speed_kmh: float) -> MatrixLike:
+    seconds_per_meter = 3.6 / speed_kmh
+    if HAS_NUMPY and not isinstance(distance_matrix, list):
+        return np.rint(np.asarray(distance_matrix, dtype=np.float64) * seconds_per_meter).astype(np.int32)
+    return [[int(round(distance_m * seconds_per_meter)) for distance_m in row] for row in distance_matrix]
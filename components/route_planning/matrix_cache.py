@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+SQLITE_MAX_PARAMS = 500
+
+CachedLeg = tuple[int, int]
+
+
+@dataclass
+class MatrixCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class MatrixCacheStore:
+    def __init__(self, path: str, max_entries: int) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.stats = MatrixCacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS matrix_entries (
+                provider TEXT NOT NULL,
+                origin_key TEXT NOT NULL,
+                destination_key TEXT NOT NULL,
+                distance_m INTEGER NOT NULL,
+                duration_s INTEGER NOT NULL,
+                last_used_day INTEGER NOT NULL,
+                PRIMARY KEY (provider, origin_key, destination_key)
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_matrix_entries_last_used_day ON matrix_entries (last_used_day)")
+        # Lookups join against the wanted keys so only the requested pairs are read, never an origin's whole history.
+        self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS matrix_lookup_keys (key TEXT PRIMARY KEY)")
+        self._connection.commit()
+
+    def get_many(self, provider: str, keys: list[str]) -> dict[tuple[str, str], CachedLeg]:
+        today = date.today().toordinal()
+        with self._lock:
+            self._connection.execute("DELETE FROM matrix_lookup_keys")
+            self._connection.executemany("INSERT OR IGNORE INTO matrix_lookup_keys (key) VALUES (?)", [(key,) for key in keys])
+            found = {
+                (origin_key, destination_key): (distance_m, duration_s)
+                for origin_key, destination_key, distance_m, duration_s in self._connection.execute(
+                    "SELECT e.origin_key, e.destination_key, e.distance_m, e.duration_s FROM matrix_lookup_keys o "
+                    "JOIN matrix_lookup_keys d ON d.key != o.key "
+                    "JOIN matrix_entries e ON e.provider = ? AND e.origin_key = o.key AND e.destination_key = d.key",
+                    (provider,),
+                )
+            }
+            self._connection.execute(
+                "UPDATE matrix_entries SET last_used_day = ? "
+                "WHERE provider = ? AND last_used_day < ? "
+                "AND origin_key IN (SELECT key FROM matrix_lookup_keys) "
+                "AND destination_key IN (SELECT key FROM matrix_lookup_keys)",
+                (today, provider, today),
+            )
+            self._connection.execute("DELETE FROM matrix_lookup_keys")
+            self._connection.commit()
+        return found
+
+    def put_many(self, provider: str, entries: dict[tuple[str, str], CachedLeg]) -> None:
+        if not entries:
+            return
+        today = date.today().toordinal()
+        with self._lock:
+            # Upserting single legs keeps whatever other processes wrote for the same origin in the meantime.
+            self._connection.executemany(
+                "INSERT INTO matrix_entries "
+                "(provider, origin_key, destination_key, distance_m, duration_s, last_used_day) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (provider, origin_key, destination_key) DO UPDATE SET "
+                "distance_m = excluded.distance_m, duration_s = excluded.duration_s, last_used_day = excluded.last_used_day",
+                [
+                    (provider, origin_key, destination_key, distance_m, duration_s, today)
+                    for (origin_key, destination_key), (distance_m, duration_s) in entries.items()
+                ],
+            )
+            self.stats.writes += len(entries)
+            self._evict()
+            self._connection.commit()
+
+    def record_lookups(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.stats.hits += hits
+            self.stats.misses += misses
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM matrix_entries").fetchone()[0]
+
+    def _evict(self) -> None:
+        overflow = self._connection.execute("SELECT COUNT(*) FROM matrix_entries").fetchone()[0] - self.max_entries
+        if overflow <= 0:
+            return
+        # Trim a little below the limit so eviction does not run on every write.
+        overflow += self.max_entries // 10
+        cursor = self._connection.execute(
+            "DELETE FROM matrix_entries WHERE rowid IN "
+            "(SELECT rowid FROM matrix_entries ORDER BY last_used_day ASC, rowid ASC LIMIT ?)",
+            (overflow,),
+        )
+        self.stats.evictions += cursor.rowcount
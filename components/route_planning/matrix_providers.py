@@ -0,0 +1,300 @@
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+from urllib.parse import unquote
+
+import httpx
+
+from bases.platform.config import get_settings
+from components.route_planning.haversine_matrix import (
+    MatrixLike,
+    build_distance_matrix,
+    build_duration_matrix,
+    haversine_distance_m,
+)
+from components.route_planning.matrix_cache import CachedLeg, MatrixCacheStore
+from components.route_planning.sparse_matrix import SparseDistanceMatrix
+
+Location = tuple[float, float]
+MatrixBlock = tuple[list[list[int]], list[list[int]]]
+LOCATION_KEY_DECIMALS = 5
+OSRM_PROFILE = "driving"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TravelMatrix:
+    distances_m: MatrixLike
+    durations_s: MatrixLike
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+def location_key(location: Location, place_id: str | None = None) -> str:
+    if place_id:
+        return f"place:{place_id}"
+    return f"{location[0]:.{LOCATION_KEY_DECIMALS}f},{location[1]:.{LOCATION_KEY_DECIMALS}f}"
+
+
+class TravelMatrixProvider(ABC):
+    name: str
+    # Cached legs are keyed by this, so it includes every setting that changes the legs.
+    cache_namespace: str
+    # Only providers that pay a network round trip per block are worth putting behind the matrix cache.
+    cacheable = False
+
+    @abstractmethod
+    def build_block(self, locations: list[Location], sources: list[int], destinations: list[int]) -> MatrixBlock:
+        raise NotImplementedError
+
+    def build(self, locations: list[Location], location_keys: list[str] | None = None) -> TravelMatrix:
+        indices = list(range(len(locations)))
+        distances_m, durations_s = self.build_block(locations, indices, indices)
+        return TravelMatrix(distances_m=distances_m, durations_s=durations_s)
+
+    def build_sparse(self, locations: list[Location], neighbour_count: int) -> TravelMatrix | None:
+        return None
+
+
+class HaversineMatrixProvider(TravelMatrixProvider):
+    name = "haversine"
+
+    def __init__(self, speed_kmh: float) -> None:
+        self.speed_kmh = speed_kmh
+        self.cache_namespace = f"{self.name}:{speed_kmh:g}kmh"
+
+    def build_block(self, locations: list[Location], sources: list[int], destinations: list[int]) -> MatrixBlock:
+        seconds_per_meter = 3.6 / self.speed_kmh
+        distances_m = [
+            [0 if origin == destination else haversine_distance_m(*locations[origin], *locations[destination]) for destination in destinations]
+            for origin in sources
+        ]
+        durations_s = [[int(round(distance_m * seconds_per_meter)) for distance_m in row] for row in distances_m]
+        return distances_m, durations_s
+
+    def build(self, locations: list[Location], location_keys: list[str] | None = None) -> TravelMatrix:
+        distances_m = build_distance_matrix(locations)
+        return TravelMatrix(distances_m=distances_m, durations_s=build_duration_matrix(distances_m, self.speed_kmh))
+
+    def build_sparse(self, locations: list[Location], neighbour_count: int) -> TravelMatrix | None:
+        distances_m = SparseDistanceMatrix(locations, neighbour_count)
+        return TravelMatrix(distances_m=distances_m, durations_s=distances_m.scaled(3.6 / self.speed_kmh))
+
+
+class OsrmTableMatrixProvider(TravelMatrixProvider):
+    cacheable = True
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        name: str = "osrm",
+        max_table_size: int = 100,
+        max_concurrency: int = 4,
+        timeout_s: float = 10.0,
+        fallback_speed_kmh: float = 40.0,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.tile_size = max(1, max_table_size // 2)
+        self.max_concurrency = max(1, max_concurrency)
+        self.fallback_speed_kmh = fallback_speed_kmh
+        self.cache_namespace = f"{name}:{self.base_url}/{OSRM_PROFILE}:{fallback_speed_kmh:g}kmh"
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout_s,
+            transport=transport,
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+        )
+
+    def build_block(self, locations: list[Location], sources: list[int], destinations: list[int]) -> MatrixBlock:
+        distances_m = [[0] * len(destinations) for _ in sources]
+        durations_s = [[0] * len(destinations) for _ in sources]
+        if not sources or not destinations:
+            return distances_m, durations_s
+
+        source_tiles = [list(range(start, min(start + self.tile_size, len(sources)))) for start in range(0, len(sources), self.tile_size)]
+        destination_tiles = [
+            list(range(start, min(start + self.tile_size, len(destinations)))) for start in range(0, len(destinations), self.tile_size)
+        ]
+        tile_pairs = list(product(source_tiles, destination_tiles))
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(tile_pairs))) as executor:
+            responses = executor.map(
+                lambda pair: self._fetch_tile(
+                    locations,
+                    [sources[position] for position in pair[0]],
+                    [destinations[position] for position in pair[1]],
+                ),
+                tile_pairs,
+            )
+            for (source_positions, destination_positions), (tile_distances, tile_durations) in zip(tile_pairs, responses, strict=True):
+                for row, source_position in enumerate(source_positions):
+                    for column, destination_position in enumerate(destination_positions):
+                        if sources[source_position] == destinations[destination_position]:
+                            continue
+                        distances_m[source_position][destination_position] = tile_distances[row][column]
+                        durations_s[source_position][destination_position] = tile_durations[row][column]
+
+        return distances_m, durations_s
+
+    def _fetch_tile(self, locations: list[Location], sources: list[int], destinations: list[int]) -> MatrixBlock:
+        indices = sources if sources == destinations else sources + destinations
+        coordinates = ";".join(f"{locations[index][1]},{locations[index][0]}" for index in indices)
+        source_positions = range(len(sources))
+        destination_positions = source_positions if sources == destinations else range(len(sources), len(indices))
+
+        response = self.client.get(
+            f"/table/v1/{OSRM_PROFILE}/{coordinates}",
+            params={
+                "sources": ";".join(str(position) for position in source_positions),
+                "destinations": ";".join(str(position) for position in destination_positions),
+                "annotations": "distance,duration",
+            },
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("code") != "Ok":
+            raise RuntimeError(f"OSRM table request failed: {payload.get('code')}")
+
+        tile_distances: list[list[int]] = []
+        tile_durations: list[list[int]] = []
+        for row, origin in enumerate(sources):
+            distance_row: list[int] = []
+            duration_row: list[int] = []
+            for column, destination in enumerate(destinations):
+                distance = payload["distances"][row][column]
+                duration = payload["durations"][row][column]
+                if distance is None or duration is None:
+                    distance = haversine_distance_m(*locations[origin], *locations[destination])
+                    duration = distance * 3.6 / self.fallback_speed_kmh
+                distance_row.append(int(round(distance)))
+                duration_row.append(int(round(duration)))
+            tile_distances.append(distance_row)
+            tile_durations.append(duration_row)
+        return tile_distances, tile_durations
+
+
+class CachedTravelMatrixProvider(TravelMatrixProvider):
+    def __init__(self, inner: TravelMatrixProvider, store: MatrixCacheStore) -> None:
+        self.inner = inner
+        self.store = store
+        self.name = inner.name
+        self.cache_namespace = inner.cache_namespace
+
+    def build_block(self, locations: list[Location], sources: list[int], destinations: list[int]) -> MatrixBlock:
+        return self.inner.build_block(locations, sources, destinations)
+
+    def build_sparse(self, locations: list[Location], neighbour_count: int) -> TravelMatrix | None:
+        return self.inner.build_sparse(locations, neighbour_count)
+
+    def build(self, locations: list[Location], location_keys: list[str] | None = None) -> TravelMatrix:
+        keys = location_keys or [location_key(location) for location in locations]
+        size = len(locations)
+        cached = self.store.get_many(self.cache_namespace, keys)
+        distances_m = [[0] * size for _ in range(size)]
+        durations_s = [[0] * size for _ in range(size)]
+        missing: dict[int, set[int]] = {}
+        hits = 0
+        for i, origin in enumerate(keys):
+            for j, destination in enumerate(keys):
+                if destination == origin:
+                    continue
+                leg = cached.get((origin, destination))
+                if leg is None:
+                    missing.setdefault(i, set()).add(j)
+                    continue
+                distances_m[i][j], durations_s[i][j] = leg
+                hits += 1
+        misses = sum(len(columns) for columns in missing.values())
+
+        # Origins missing the same columns share one block. An origin missing its whole row also asks for its
+        # own diagonal, so all new stops land in one new-rows block next to one new-columns block.
+        groups: dict[frozenset[int], list[int]] = {}
+        for i, columns in missing.items():
+            groups.setdefault(frozenset(columns | {i} if len(columns) == size - 1 else columns), []).append(i)
+
+        fresh: dict[tuple[str, str], CachedLeg] = {}
+        for columns_set, sources in groups.items():
+            columns = sorted(columns_set)
+            block_distances, block_durations = self.inner.build_block(locations, sources, columns)
+            for row_index, i in enumerate(sources):
+                for column_index, j in enumerate(columns):
+                    if keys[j] == keys[i]:
+                        continue
+                    leg = (block_distances[row_index][column_index], block_durations[row_index][column_index])
+                    distances_m[i][j], durations_s[i][j] = leg
+                    fresh[(keys[i], keys[j])] = leg
+        self.store.put_many(self.cache_namespace, fresh)
+
+        self.store.record_lookups(hits, misses)
+        logger.info("Matrix cache %s: %d hits, %d misses", self.name, hits, misses)
+        return TravelMatrix(distances_m=distances_m, durations_s=durations_s, cache_hits=hits, cache_misses=misses)
+
+
+class LocalRoadSpeedModel:
+    def __init__(self, detour_factor: float = 1.3) -> None:
+        self.detour_factor = detour_factor
+
+    def speed_kmh(self, distance_m: float) -> float:
+        if distance_m < 2000:
+            return 25.0
+        if distance_m < 10000:
+            return 40.0
+        return 70.0
+
+    def leg(self, origin: Location, destination: Location) -> tuple[float, float]:
+        distance_m = haversine_distance_m(*origin, *destination) * self.detour_factor
+        return distance_m, distance_m * 3.6 / self.speed_kmh(distance_m)
+
+
+def local_osrm_transport(speed_model: LocalRoadSpeedModel | None = None) -> httpx.MockTransport:
+    model = speed_model or LocalRoadSpeedModel()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raw_coordinates = unquote(request.url.path).rsplit("/", 1)[-1]
+        locations = [(float(lat), float(lng)) for lng, lat in (pair.split(",") for pair in raw_coordinates.split(";"))]
+        sources = [int(value) for value in request.url.params["sources"].split(";")]
+        destinations = [int(value) for value in request.url.params["destinations"].split(";")]
+        legs = [[model.leg(locations[source], locations[destination]) for destination in destinations] for source in sources]
+        return httpx.Response(
+            200,
+            json={
+                "code": "Ok",
+                "distances": [[distance for distance, _ in row] for row in legs],
+                "durations": [[duration for _, duration in row] for row in legs],
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@lru_cache
+def get_matrix_provider() -> TravelMatrixProvider:
+    settings = get_settings()
+    provider = _configured_matrix_provider()
+    if settings.planning_matrix_cache_path and provider.cacheable:
+        return CachedTravelMatrixProvider(
+            provider,
+            MatrixCacheStore(settings.planning_matrix_cache_path, max_entries=settings.planning_matrix_cache_max_entries),
+        )
+    return provider
+
+
+def _configured_matrix_provider() -> TravelMatrixProvider:
+    settings = get_settings()
+    if settings.planning_matrix_provider in {"osrm", "local"}:
+        return OsrmTableMatrixProvider(
+            settings.osrm_base_url,
+            max_table_size=settings.osrm_max_table_size,
+            max_concurrency=settings.osrm_max_concurrency,
+            timeout_s=settings.osrm_timeout_s,
+            fallback_speed_kmh=settings.planning_average_speed_kmh,
+            name="osrm" if settings.planning_matrix_provider == "osrm" else "osrm-local",
+            transport=local_osrm_transport() if settings.planning_matrix_provider == "local" else None,
+        )
+    return HaversineMatrixProvider(speed_kmh=settings.planning_average_speed_kmh)
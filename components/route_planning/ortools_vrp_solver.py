@@ -1,10 +1,64 @@
 import importlib.util
-from dataclasses import dataclass
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from components.route_planning.fallback_heuristic import (
+    Location,
+    build_neighbour_lists,
+    construct_routes,
+    customer_nodes,
+    solve_with_heuristic,
+)
+from components.route_planning.haversine_matrix import MatrixLike, matrix_rows
+from components.route_planning.sparse_matrix import SparseDistanceMatrix
 
 HAS_ORTOOLS = importlib.util.find_spec("ortools") is not None
 if HAS_ORTOOLS:
     from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 
+TransitMode = Literal["callback", "native"]
+DEFAULT_TRANSIT_MODE: TransitMode = "native"
+SolverEngine = Literal["auto", "ortools", "heuristic"]
+DEFAULT_HEURISTIC_TIME_BUDGET_S = 0.5
+DEFAULT_PROGRESS_INTERVAL_S = 0.5
+TIME_HORIZON_S = 48 * 3600
+
+TimeWindow = tuple[int, int]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SolverBudget:
+    base_s: float = 1.0
+    per_stop_s: float = 0.01
+    max_s: float = 30.0
+    stall_window_s: float | None = 2.0
+    ceiling_s: float | None = None
+
+    def time_limit_s(self, stop_count: int) -> float:
+        limit = min(self.max_s, self.base_s + self.per_stop_s * stop_count)
+        return min(limit, self.ceiling_s) if self.ceiling_s is not None else limit
+
+
+@dataclass
+class SolverStats:
+    engine: str
+    time_limit_ms: int
+    wall_ms: int = 0
+    improving_solutions: int = 0
+    first_objective: int | None = None
+    final_objective: int | None = None
+    first_solution_status: str = "not_found"
+    final_status: str = "no_solution"
+    stop_reason: str = "completed"
+    cached: bool = False
+    matrix_cache_hits: int = 0
+    matrix_cache_misses: int = 0
+
 
 @dataclass
 class VehicleRoutePlan:
@@ -12,94 +66,504 @@ class VehicleRoutePlan:
     task_indices: list[int]
     distance_m: int
     total_load: int
+    arrivals_s: list[int] = field(default_factory=list)
+    departures_s: list[int] = field(default_factory=list)
+    duration_s: int | None = None
+
+
+@dataclass
+class SolverProgress:
+    event: str
+    objective: int
+    elapsed_ms: int
+    improving_solutions: int
+    routes: list[list[int]]
+
+
+ProgressListener = Callable[[SolverProgress], None]
 
 
 @dataclass
 class VrpSolution:
     routes: list[VehicleRoutePlan]
+    stats: SolverStats | None = None
+    dropped_task_indices: list[int] = field(default_factory=list)
 
 
-def _solve_fallback(distance_matrix: list[list[int]], demands: list[int], vehicle_capacities: list[int]) -> VrpSolution:
-    remaining = set(range(1, len(demands)))
-    plans: list[VehicleRoutePlan] = []
+class SearchTracker:
+    def __init__(
+        self,
+        stall_window_s: float | None = None,
+        on_progress: ProgressListener | None = None,
+        stop_requested: Callable[[], bool] | None = None,
+        progress_interval_s: float = DEFAULT_PROGRESS_INTERVAL_S,
+    ) -> None:
+        self.stall_window_s = stall_window_s
+        self.on_progress = on_progress
+        self.stop_requested = stop_requested
+        self.progress_interval_s = progress_interval_s
+        self.started_at = time.perf_counter()
+        self.last_improvement_at = self.started_at
+        self.last_progress_at = self.started_at
+        self.first_objective: int | None = None
+        self.best_objective: int | None = None
+        self.improving_solutions = 0
+        self.stalled = False
+        self.stopped = False
 
-    for vehicle_index, capacity in enumerate(vehicle_capacities):
-        load = 0
-        current_node = 0
-        distance_m = 0
-        route_task_nodes: list[int] = []
-
-        while remaining:
-            candidates = [node for node in remaining if load + demands[node] <= capacity]
-            if not candidates:
-                break
-            next_node = min(candidates, key=lambda node: distance_matrix[current_node][node])
-            distance_m += distance_matrix[current_node][next_node]
-            route_task_nodes.append(next_node - 1)
-            load += demands[next_node]
-            current_node = next_node
-            remaining.remove(next_node)
-
-        if route_task_nodes:
-            distance_m += distance_matrix[current_node][0]
-            plans.append(
-                VehicleRoutePlan(
-                    vehicle_index=vehicle_index,
-                    task_indices=route_task_nodes,
-                    distance_m=distance_m,
-                    total_load=load,
-                )
+    def record(self, objective: int, routes: Callable[[], list[list[int]]] | None = None) -> None:
+        first = self.first_objective is None
+        if first:
+            self.first_objective = objective
+        if self.best_objective is None or objective < self.best_objective:
+            if self.best_objective is not None:
+                self.improving_solutions += 1
+            self.best_objective = objective
+            self.last_improvement_at = time.perf_counter()
+            if self.on_progress is not None and routes is not None:
+                self._report(objective, routes, first)
+
+    def _report(self, objective: int, routes: Callable[[], list[list[int]]], first: bool) -> None:
+        # Listeners usually serialize the routes, so improvements are sampled rather than all forwarded.
+        now = time.perf_counter()
+        if not first and now - self.last_progress_at < self.progress_interval_s:
+            return
+        self.last_progress_at = now
+        self.on_progress(
+            SolverProgress(
+                event="first_solution" if first else "improved",
+                objective=objective,
+                elapsed_ms=int((now - self.started_at) * 1000),
+                improving_solutions=self.improving_solutions,
+                routes=routes(),
             )
+        )
 
-    if remaining:
+    def should_stop(self) -> bool:
+        if self.stall_window_s is not None and self.best_objective is not None:
+            self.stalled = time.perf_counter() - self.last_improvement_at > self.stall_window_s
+        # An external stop only takes effect once there is a solution to return.
+        if self.stop_requested is not None and self.best_objective is not None and not self.stopped:
+            self.stopped = self.stop_requested()
+        return self.stalled or self.stopped
+
+    def stats(self, engine: str, time_limit_s: float, final_objective: int | None) -> SolverStats:
+        wall_ms = int((time.perf_counter() - self.started_at) * 1000)
+        time_limit_ms = int(time_limit_s * 1000)
+        if self.stopped:
+            stop_reason = "stopped"
+        elif self.stalled:
+            stop_reason = "stalled"
+        elif wall_ms >= time_limit_ms:
+            stop_reason = "time_limit"
+        else:
+            stop_reason = "completed"
+
+        if final_objective is None:
+            final_status = "no_solution"
+        elif self.first_objective is not None and final_objective < self.first_objective:
+            final_status = "improved"
+        else:
+            final_status = "first_solution"
+        return SolverStats(
+            engine=engine,
+            time_limit_ms=time_limit_ms,
+            wall_ms=wall_ms,
+            improving_solutions=self.improving_solutions,
+            first_objective=self.first_objective,
+            final_objective=final_objective,
+            first_solution_status="found" if self.first_objective is not None else "not_found",
+            final_status=final_status,
+            stop_reason=stop_reason,
+        )
+
+
+def combine_solver_stats(stats: list[SolverStats | None], wall_ms: int) -> SolverStats | None:
+    parts = [part for part in stats if part is not None]
+    if not parts:
+        return None
+    objectives = [part.final_objective for part in parts]
+    first_objectives = [part.first_objective for part in parts]
+    return SolverStats(
+        engine=parts[0].engine,
+        time_limit_ms=max(part.time_limit_ms for part in parts),
+        wall_ms=wall_ms,
+        improving_solutions=sum(part.improving_solutions for part in parts),
+        first_objective=sum(first_objectives) if None not in first_objectives else None,
+        final_objective=sum(objectives) if None not in objectives else None,
+        first_solution_status="found" if all(part.first_solution_status == "found" for part in parts) else "not_found",
+        final_status="improved" if any(part.final_status == "improved" for part in parts) else parts[0].final_status,
+        stop_reason=",".join(sorted({part.stop_reason for part in parts})),
+        matrix_cache_hits=sum(part.matrix_cache_hits for part in parts),
+        matrix_cache_misses=sum(part.matrix_cache_misses for part in parts),
+    )
+
+
+def _log_solver_stats(stop_count: int, vehicle_count: int, stats: SolverStats) -> None:
+    logger.info(
+        "VRP solve engine=%s stops=%d vehicles=%d wall_ms=%d limit_ms=%d improvements=%d first=%s final=%s status=%s stop=%s",
+        stats.engine,
+        stop_count,
+        vehicle_count,
+        stats.wall_ms,
+        stats.time_limit_ms,
+        stats.improving_solutions,
+        stats.first_objective,
+        stats.final_objective,
+        stats.final_status,
+        stats.stop_reason,
+    )
+
+
+def has_time_windows(time_windows: list[TimeWindow | None] | None) -> bool:
+    return time_windows is not None and any(window is not None for window in time_windows[1:])
+
+
+def schedule_route(
+    task_nodes: list[int],
+    time_matrix: list[list[int]],
+    service_times: list[int] | None,
+    time_windows: list[TimeWindow | None] | None = None,
+    route_start_s: int = 0,
+    start_node: int = 0,
+    end_node: int = 0,
+) -> tuple[list[int], list[int], int]:
+    arrivals: list[int] = []
+    departures: list[int] = []
+    clock = route_start_s
+    current_node = start_node
+    for node in task_nodes:
+        clock += time_matrix[current_node][node]
+        window = time_windows[node] if time_windows is not None else None
+        if window is not None:
+            clock = max(clock, window[0])
+        arrivals.append(clock)
+        clock += service_times[node] if service_times is not None else 0
+        departures.append(clock)
+        current_node = node
+    clock += time_matrix[current_node][end_node]
+    return arrivals, departures, clock - route_start_s
+
+
+def _attach_schedule(
+    plan: VehicleRoutePlan,
+    time_matrix: list[list[int]],
+    service_times: list[int] | None,
+    time_windows: list[TimeWindow | None] | None,
+    route_start_s: int,
+    vehicle_starts: list[int] | None = None,
+    vehicle_ends: list[int] | None = None,
+) -> None:
+    task_nodes = [task_index + 1 for task_index in plan.task_indices]
+    plan.arrivals_s, plan.departures_s, plan.duration_s = schedule_route(
+        task_nodes,
+        time_matrix,
+        service_times,
+        time_windows,
+        route_start_s,
+        vehicle_starts[plan.vehicle_index] if vehicle_starts is not None else 0,
+        vehicle_ends[plan.vehicle_index] if vehicle_ends is not None else 0,
+    )
+
+
+def _solve_fallback(
+    distance_matrix: list[list[int]],
+    demands: list[int],
+    vehicle_capacities: list[int],
+    locations: list[Location] | None = None,
+    time_budget_s: float = DEFAULT_HEURISTIC_TIME_BUDGET_S,
+    initial_routes: list[list[int]] | None = None,
+    tracker: SearchTracker | None = None,
+    vehicle_starts: list[int] | None = None,
+    vehicle_ends: list[int] | None = None,
+    drop_penalties: list[int] | None = None,
+) -> VrpSolution:
+    seed_routes = None
+    if initial_routes is not None:
+        seed_routes = [[task_index + 1 for task_index in route] for route in initial_routes]
+        seed_routes += [[] for _ in range(len(vehicle_capacities) - len(seed_routes))]
+    routes = solve_with_heuristic(
+        distance_matrix,
+        demands,
+        vehicle_capacities,
+        locations,
+        time_budget_s,
+        initial_routes=seed_routes,
+        on_solution=(
+            (lambda objective, routes: tracker.record(objective, lambda: [[node - 1 for node in route] for route in routes]))
+            if tracker is not None
+            else None
+        ),
+        should_stop=tracker.should_stop if tracker is not None else None,
+        starts=vehicle_starts,
+        ends=vehicle_ends,
+        penalties=drop_penalties,
+    )
+    if routes is None:
         return VrpSolution(routes=[])
 
-    return VrpSolution(routes=plans)
+    plans: list[VehicleRoutePlan] = []
+    for vehicle_index, route_nodes in enumerate(routes):
+        if not route_nodes:
+            continue
+        start_node = vehicle_starts[vehicle_index] if vehicle_starts is not None else 0
+        end_node = vehicle_ends[vehicle_index] if vehicle_ends is not None else 0
+        path = [start_node, *route_nodes, end_node]
+        plans.append(
+            VehicleRoutePlan(
+                vehicle_index=vehicle_index,
+                task_indices=[node - 1 for node in route_nodes],
+                distance_m=sum(distance_matrix[origin][destination] for origin, destination in zip(path, path[1:])),
+                total_load=sum(demands[node] for node in route_nodes),
+            )
+        )
+    dropped_task_indices = _dropped_task_indices(plans, len(distance_matrix), vehicle_starts, vehicle_ends)
+    return VrpSolution(routes=plans, dropped_task_indices=dropped_task_indices)
+
+
+def _dropped_task_indices(
+    plans: list[VehicleRoutePlan], size: int, vehicle_starts: list[int] | None, vehicle_ends: list[int] | None
+) -> list[int]:
+    routed = {task_index for plan in plans for task_index in plan.task_indices}
+    customers = customer_nodes(size, [*(vehicle_starts or ()), *(vehicle_ends or ())])
+    return [node - 1 for node in customers if node - 1 not in routed]
+
+
+def _add_time_dimension(
+    routing,
+    manager,
+    time_matrix: list[list[int]],
+    service_times: list[int],
+    time_windows: list[TimeWindow | None],
+    route_start_s: int,
+    vehicle_count: int,
+    transit_mode: TransitMode,
+    depot_nodes: set[int],
+):
+    if transit_mode == "native" and hasattr(routing, "RegisterTransitMatrix"):
+        transit_times = [[travel_s + service_times[i] for travel_s in row] for i, row in enumerate(time_matrix)]
+        time_callback_index = routing.RegisterTransitMatrix(transit_times)
+    else:
+
+        def time_callback(from_index: int, to_index: int) -> int:
+            from_node = manager.IndexToNode(from_index)
+            to_node = manager.IndexToNode(to_index)
+            return time_matrix[from_node][to_node] + service_times[from_node]
+
+        time_callback_index = routing.RegisterTransitCallback(time_callback)
+
+    routing.AddDimension(time_callback_index, TIME_HORIZON_S, TIME_HORIZON_S, False, "Time")
+    time_dimension = routing.GetDimensionOrDie("Time")
+
+    for node in range(1, len(time_matrix)):
+        if node in depot_nodes:
+            continue
+        window_start, window_end = time_windows[node] or (route_start_s, TIME_HORIZON_S)
+        time_dimension.CumulVar(manager.NodeToIndex(node)).SetRange(window_start, window_end)
+
+    depot_start, depot_end = time_windows[0] or (0, TIME_HORIZON_S)
+    # No vehicle leaves before the working day starts, even when an early window would allow it.
+    start_earliest = max(depot_start, route_start_s)
+    for vehicle_index in range(vehicle_count):
+        time_dimension.CumulVar(routing.Start(vehicle_index)).SetRange(start_earliest, depot_end)
+        time_dimension.CumulVar(routing.End(vehicle_index)).SetRange(depot_start, depot_end)
+        routing.AddVariableMaximizedByFinalizer(time_dimension.CumulVar(routing.Start(vehicle_index)))
+        routing.AddVariableMinimizedByFinalizer(time_dimension.CumulVar(routing.End(vehicle_index)))
+
+    return time_dimension
+
+
+def _sparse_initial_routes(
+    distance_matrix: SparseDistanceMatrix,
+    demands: list[int],
+    vehicle_capacities: list[int],
+    locations: list[Location] | None,
+    vehicle_starts: list[int] | None,
+    vehicle_ends: list[int] | None,
+) -> list[list[int]] | None:
+    # Cheapest-arc first solutions scan every pair; seeding from the neighbour lists keeps the
+    # first solution linear in the neighbourhood size.
+    customers = customer_nodes(len(distance_matrix), [*(vehicle_starts or ()), *(vehicle_ends or ())])
+    neighbours = build_neighbour_lists(distance_matrix, locations, customers=customers)
+    routes, remaining = construct_routes(distance_matrix, demands, vehicle_capacities, neighbours, locations, vehicle_starts, customers)
+    if remaining:
+        return None
+    return [[node - 1 for node in route] for route in routes]
 
 
 def solve_capacitated_vrp(
-    distance_matrix: list[list[int]],
+    distance_matrix: MatrixLike,
     demands: list[int],
     vehicle_capacities: list[int],
-    time_limit_seconds: int = 5,
+    time_limit_seconds: float | None = None,
+    transit_mode: TransitMode = DEFAULT_TRANSIT_MODE,
+    time_matrix: MatrixLike | None = None,
+    service_times: list[int] | None = None,
+    time_windows: list[TimeWindow | None] | None = None,
+    route_start_s: int = 0,
+    locations: list[Location] | None = None,
+    engine: SolverEngine = "auto",
+    heuristic_time_budget_s: float = DEFAULT_HEURISTIC_TIME_BUDGET_S,
+    initial_routes: list[list[int]] | None = None,
+    budget: SolverBudget | None = None,
+    vehicle_starts: list[int] | None = None,
+    vehicle_ends: list[int] | None = None,
+    on_progress: ProgressListener | None = None,
+    stop_requested: Callable[[], bool] | None = None,
+    drop_penalties: list[int] | None = None,
 ) -> VrpSolution:
-    if not distance_matrix or not vehicle_capacities:
+    if len(distance_matrix) == 0 or not vehicle_capacities:
         return VrpSolution(routes=[])
 
-    if not HAS_ORTOOLS:
-        return _solve_fallback(distance_matrix=distance_matrix, demands=demands, vehicle_capacities=vehicle_capacities)
+    budget = budget or SolverBudget()
+    depot_nodes = {0, *(vehicle_starts or ()), *(vehicle_ends or ())}
+    stop_count = len(distance_matrix) - len(depot_nodes)
+    if time_limit_seconds is None:
+        time_limit_seconds = budget.time_limit_s(stop_count)
+    elif budget.ceiling_s is not None:
+        time_limit_seconds = min(time_limit_seconds, budget.ceiling_s)
+    tracker = SearchTracker(budget.stall_window_s, on_progress, stop_requested)
+
+    distance_matrix = matrix_rows(distance_matrix)
+    time_matrix = matrix_rows(time_matrix) if time_matrix is not None else None
+    windowed = time_matrix is not None and has_time_windows(time_windows)
+    if windowed and (engine == "heuristic" or not HAS_ORTOOLS):
+        raise ValueError("The heuristic engine does not enforce time windows; use the OR-Tools engine")
+    sparse = isinstance(distance_matrix, SparseDistanceMatrix)
+    if sparse:
+        # There is no dense matrix to hand over, so every arc goes through the lazy callback.
+        transit_mode = "callback"
 
-    manager = pywrapcp.RoutingIndexManager(len(distance_matrix), len(vehicle_capacities), 0)
+    # Sparse matrices can only reach OR-Tools through Python callbacks, which the native-speed local
+    # search outpaces by a wide margin, so "auto" keeps them on the heuristic unless windows need enforcing.
+    if engine == "heuristic" or not HAS_ORTOOLS or (engine == "auto" and sparse and not windowed):
+        if budget.ceiling_s is not None:
+            heuristic_time_budget_s = min(heuristic_time_budget_s, budget.ceiling_s)
+        solution = _solve_fallback(
+            distance_matrix,
+            demands,
+            vehicle_capacities,
+            locations=locations,
+            time_budget_s=heuristic_time_budget_s,
+            initial_routes=initial_routes,
+            tracker=tracker,
+            vehicle_starts=vehicle_starts,
+            vehicle_ends=vehicle_ends,
+            drop_penalties=drop_penalties,
+        )
+        if time_matrix is not None:
+            for plan in solution.routes:
+                _attach_schedule(plan, time_matrix, service_times, time_windows, route_start_s, vehicle_starts, vehicle_ends)
+        final_objective = sum(plan.distance_m for plan in solution.routes) if solution.routes else None
+        solution.stats = tracker.stats("heuristic", heuristic_time_budget_s, final_objective)
+        _log_solver_stats(stop_count, len(vehicle_capacities), solution.stats)
+        return solution
+
+    if vehicle_starts is not None or vehicle_ends is not None:
+        manager = pywrapcp.RoutingIndexManager(
+            len(distance_matrix),
+            len(vehicle_capacities),
+            vehicle_starts or [0] * len(vehicle_capacities),
+            vehicle_ends or [0] * len(vehicle_capacities),
+        )
+    else:
+        manager = pywrapcp.RoutingIndexManager(len(distance_matrix), len(vehicle_capacities), 0)
     routing = pywrapcp.RoutingModel(manager)
+    if vehicle_starts is not None or vehicle_ends is not None:
+        # The office row stays in the matrix even when no vehicle starts there; never require a visit to it.
+        for node in depot_nodes - {*(vehicle_starts or [0]), *(vehicle_ends or [0])}:
+            routing.AddDisjunction([manager.NodeToIndex(node)], 0)
+    if drop_penalties is not None:
+        # Stops become optional at their penalty, so an over-subscribed fleet returns a partial plan.
+        for node in range(len(distance_matrix)):
+            if node not in depot_nodes:
+                routing.AddDisjunction([manager.NodeToIndex(node)], drop_penalties[node])
 
-    def distance_callback(from_index: int, to_index: int) -> int:
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        return distance_matrix[from_node][to_node]
+    if transit_mode == "native" and hasattr(routing, "RegisterTransitMatrix"):
+        transit_callback_index = routing.RegisterTransitMatrix(distance_matrix)
+        demand_callback_index = routing.RegisterUnaryTransitVector(list(demands))
+    else:
 
-    transit_callback_index = routing.RegisterTransitCallback(distance_callback)
-    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+        def distance_callback(from_index: int, to_index: int) -> int:
+            from_node = manager.IndexToNode(from_index)
+            to_node = manager.IndexToNode(to_index)
+            return distance_matrix[from_node][to_node]
 
-    def demand_callback(from_index: int) -> int:
-        from_node = manager.IndexToNode(from_index)
-        return demands[from_node]
+        def demand_callback(from_index: int) -> int:
+            from_node = manager.IndexToNode(from_index)
+            return demands[from_node]
 
-    demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+
+    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
     routing.AddDimensionWithVehicleCapacity(demand_callback_index, 0, vehicle_capacities, True, "Capacity")
 
+    time_dimension = None
+    if windowed:
+        time_dimension = _add_time_dimension(
+            routing,
+            manager,
+            time_matrix,
+            service_times or [0] * len(time_matrix),
+            time_windows,
+            route_start_s,
+            len(vehicle_capacities),
+            transit_mode,
+            depot_nodes,
+        )
+
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
     search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
     search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-    search_parameters.time_limit.seconds = time_limit_seconds
+    search_parameters.time_limit.FromMilliseconds(int(time_limit_seconds * 1000))
+    if sparse and hasattr(search_parameters, "ls_operator_neighbors_ratio"):
+        neighbour_count = max((len(row) for row in distance_matrix.neighbours), default=1)
+        search_parameters.ls_operator_neighbors_ratio = min(1.0, neighbour_count / len(distance_matrix))
+        search_parameters.ls_operator_min_neighbors = neighbour_count
+        if initial_routes is None:
+            initial_routes = _sparse_initial_routes(
+                distance_matrix, demands, vehicle_capacities, locations, vehicle_starts, vehicle_ends
+            )
+
+    initial_assignment = None
+    if initial_routes is not None:
+        # Starting from a known feasible order skips the first-solution phase entirely.
+        routing.CloseModelWithParameters(search_parameters)
+        initial_assignment = routing.ReadAssignmentFromRoutes(
+            [[task_index + 1 for task_index in route] for route in initial_routes], True
+        )
+
+    def current_routes() -> list[list[int]]:
+        routes = []
+        for vehicle_index in range(len(vehicle_capacities)):
+            route: list[int] = []
+            index = routing.NextVar(routing.Start(vehicle_index)).Value()
+            while not routing.IsEnd(index):
+                node = manager.IndexToNode(index)
+                if node not in depot_nodes:
+                    route.append(node - 1)
+                index = routing.NextVar(index).Value()
+            routes.append(route)
+        return routes
 
-    solution = routing.SolveWithParameters(search_parameters)
+    routing.AddAtSolutionCallback(lambda: tracker.record(routing.CostVar().Value(), current_routes))
+    routing.AddSearchMonitor(routing.solver().CustomLimit(tracker.should_stop))
+
+    if initial_assignment is not None:
+        solution = routing.SolveFromAssignmentWithParameters(initial_assignment, search_parameters)
+    else:
+        solution = routing.SolveWithParameters(search_parameters)
     if solution is None:
-        return VrpSolution(routes=[])
+        stats = tracker.stats("ortools", time_limit_seconds, None)
+        _log_solver_stats(stop_count, len(vehicle_capacities), stats)
+        return VrpSolution(routes=[], stats=stats)
 
     plans: list[VehicleRoutePlan] = []
     for vehicle_index in range(len(vehicle_capacities)):
         index = routing.Start(vehicle_index)
         task_indices: list[int] = []
+        arrivals_s: list[int] = []
         distance_m = 0
         total_load = 0
 
@@ -109,25 +573,75 @@ def solve_capacitated_vrp(
             to_node = manager.IndexToNode(next_index)
             distance_m += distance_matrix[from_node][to_node]
 
-            if to_node != 0:
+            if not routing.IsEnd(next_index) and to_node not in depot_nodes:
                 task_indices.append(to_node - 1)
                 total_load += demands[to_node]
+                if time_dimension is not None:
+                    arrivals_s.append(solution.Min(time_dimension.CumulVar(next_index)))
 
             index = next_index
 
-        if task_indices:
-            plans.append(VehicleRoutePlan(vehicle_index, task_indices, distance_m, total_load))
+        if not task_indices:
+            continue
 
-    return VrpSolution(routes=plans)
+        plan = VehicleRoutePlan(vehicle_index, task_indices, distance_m, total_load)
+        if time_dimension is not None:
+            plan.arrivals_s = arrivals_s
+            plan.departures_s = [
+                arrival_s + (service_times[task_index + 1] if service_times is not None else 0)
+                for arrival_s, task_index in zip(arrivals_s, task_indices, strict=True)
+            ]
+            route_start = solution.Min(time_dimension.CumulVar(routing.Start(vehicle_index)))
+            plan.duration_s = solution.Min(time_dimension.CumulVar(index)) - route_start
+        elif time_matrix is not None:
+            _attach_schedule(plan, time_matrix, service_times, None, route_start_s, vehicle_starts, vehicle_ends)
+        plans.append(plan)
+
+    stats = tracker.stats("ortools", time_limit_seconds, solution.ObjectiveValue())
+    _log_solver_stats(stop_count, len(vehicle_capacities), stats)
+    return VrpSolution(
+        routes=plans,
+        stats=stats,
+        dropped_task_indices=_dropped_task_indices(plans, len(distance_matrix), vehicle_starts, vehicle_ends),
+    )
 
 
 def solve_single_vehicle_route(
-    distance_matrix: list[list[int]],
+    distance_matrix: MatrixLike,
     demands: list[int],
     vehicle_capacity: int,
-    time_limit_seconds: int = 5,
+    time_limit_seconds: float | None = None,
+    transit_mode: TransitMode = DEFAULT_TRANSIT_MODE,
+    time_matrix: MatrixLike | None = None,
+    service_times: list[int] | None = None,
+    time_windows: list[TimeWindow | None] | None = None,
+    route_start_s: int = 0,
+    locations: list[Location] | None = None,
+    engine: SolverEngine = "auto",
+    heuristic_time_budget_s: float = DEFAULT_HEURISTIC_TIME_BUDGET_S,
+    initial_order: list[int] | None = None,
+    budget: SolverBudget | None = None,
+    start_node: int = 0,
+    end_node: int = 0,
 ) -> VehicleRoutePlan | None:
-    solution = solve_capacitated_vrp(distance_matrix, demands, [vehicle_capacity], time_limit_seconds)
+    solution = solve_capacitated_vrp(
+        distance_matrix,
+        demands,
+        [vehicle_capacity],
+        time_limit_seconds,
+        transit_mode,
+        time_matrix=time_matrix,
+        service_times=service_times,
+        time_windows=time_windows,
+        route_start_s=route_start_s,
+        locations=locations,
+        engine=engine,
+        heuristic_time_budget_s=heuristic_time_budget_s,
+        initial_routes=[initial_order] if initial_order is not None else None,
+        budget=budget,
+        vehicle_starts=[start_node] if start_node else None,
+        vehicle_ends=[end_node] if end_node else None,
+    )
     if not solution.routes:
         return None
     return solution.routes[0]
@@ -0,0 +1,402 @@
+import argparse
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+
+from bases.platform.config import get_settings
+from bases.platform.time import utc_now
+from components.persistence__sqlmodel.models.office import OfficeModel
+from components.persistence__sqlmodel.models.planning_job import PlanningJobModel
+from components.route_planning.ortools_vrp_solver import SolverProgress
+from components.route_planning.route_planner_service import (
+    OfficePlanningInstance,
+    dropped_task_uuids,
+    load_planning_instance,
+    persist_planned_routes,
+    solve_planning_instance,
+    solver_stats_payload,
+)
+
+JOB_TERMINAL_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+# A running job whose heartbeat is this many intervals old has lost the process that claimed it.
+ORPHANED_AFTER_HEARTBEATS = 6
+ORPHANED_JOB_ERROR = {
+    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+    "detail": "Planning job was interrupted before it finished",
+}
+
+logger = logging.getLogger(__name__)
+
+
+class PlanningJobBackend(ABC):
+    @abstractmethod
+    def submit(self, engine: Engine, job_uuid: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def cancel(self, job_uuid: str) -> bool:
+        raise NotImplementedError
+
+
+class LocalPlanningJobBackend(PlanningJobBackend):
+    def __init__(self, max_workers: int) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planning-job")
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, engine: Engine, job_uuid: str) -> None:
+        future = self._executor.submit(run_planning_job, engine, job_uuid)
+        with self._lock:
+            self._futures[job_uuid] = future
+        future.add_done_callback(lambda _: self._forget(job_uuid))
+
+    def cancel(self, job_uuid: str) -> bool:
+        with self._lock:
+            future = self._futures.get(job_uuid)
+        return future.cancel() if future is not None else False
+
+    def wait(self, job_uuid: str, timeout: float | None = None) -> None:
+        with self._lock:
+            future = self._futures.get(job_uuid)
+        if future is not None:
+            future.exception(timeout=timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _forget(self, job_uuid: str) -> None:
+        with self._lock:
+            self._futures.pop(job_uuid, None)
+
+
+class QueuedPlanningJobBackend(PlanningJobBackend):
+    """Leaves submitted jobs queued in the database for ``python -m components.route_planning.planning_jobs`` workers."""
+
+    def submit(self, engine: Engine, job_uuid: str) -> None:
+        return None
+
+    def cancel(self, job_uuid: str) -> bool:
+        return False
+
+
+@lru_cache
+def get_planning_job_backend() -> PlanningJobBackend:
+    settings = get_settings()
+    if settings.planning_job_backend == "worker":
+        return QueuedPlanningJobBackend()
+    return LocalPlanningJobBackend(max_workers=settings.planning_job_concurrency)
+
+
+def serialize_planning_job(job: PlanningJobModel) -> dict:
+    return {
+        "uuid": job.uuid,
+        "kind": job.kind,
+        "office_uuid": job.office_uuid,
+        "service_date": job.service_date,
+        "status": job.status,
+        "cancel_requested": job.cancel_requested,
+        "stop_requested": job.stop_requested,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def create_planning_job(session: Session, service_date: date, office_uuid: str) -> PlanningJobModel:
+    office = session.exec(select(OfficeModel).where(OfficeModel.uuid == office_uuid, OfficeModel.deleted_at.is_(None))).first()
+    if office is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Office not found")
+
+    job = PlanningJobModel(tenant_id=office.tenant_id, office_uuid=office_uuid, service_date=service_date)
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def get_planning_job(session: Session, job_uuid: str) -> PlanningJobModel:
+    job = session.exec(select(PlanningJobModel).where(PlanningJobModel.uuid == job_uuid)).first()
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Planning job not found")
+    return job
+
+
+def request_planning_job_cancellation(session: Session, job_uuid: str) -> PlanningJobModel:
+    job = get_planning_job(session, job_uuid)
+    if job.status in JOB_TERMINAL_STATUSES:
+        return job
+
+    now = utc_now()
+    if job.status == "queued":
+        job.status = "cancelled"
+        job.finished_at = now
+    job.cancel_requested = True
+    job.updated_at = now
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def request_planning_job_stop(session: Session, job_uuid: str) -> PlanningJobModel:
+    job = get_planning_job(session, job_uuid)
+    if job.status in JOB_TERMINAL_STATUSES:
+        return job
+
+    job.stop_requested = True
+    job.updated_at = utc_now()
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+class PlanningJobProgress:
+    """Publishes solver progress onto the job row and polls it for stop and cancel requests.
+
+    Both run on the solver's thread with their own short sessions, so the job's main session keeps
+    its loaded instance untouched while the search is running.
+    """
+
+    def __init__(self, engine: Engine, job_uuid: str, instance: OfficePlanningInstance, poll_interval_s: float) -> None:
+        self.engine = engine
+        self.job_uuid = job_uuid
+        self.poll_interval_s = poll_interval_s
+        self.tasks = [(task.uuid, task.load_units) for task in instance.tasks]
+        self.vehicles = [(vehicle.uuid, vehicle.name) for vehicle in instance.vehicles]
+        self.polled_at = time.perf_counter()
+        self.stop = False
+
+    def publish(self, progress: SolverProgress) -> None:
+        routes = []
+        for vehicle_index, task_indices in enumerate(progress.routes):
+            if not task_indices:
+                continue
+            vehicle_uuid, vehicle_name = self.vehicles[vehicle_index]
+            routes.append(
+                {
+                    "vehicle_uuid": vehicle_uuid,
+                    "vehicle_name": vehicle_name,
+                    "task_uuids": [self.tasks[task_index][0] for task_index in task_indices],
+                    "total_tasks": len(task_indices),
+                    "total_load": sum(self.tasks[task_index][1] for task_index in task_indices),
+                }
+            )
+
+        with Session(self.engine) as session:
+            job = get_planning_job(session, self.job_uuid)
+            job.progress = {
+                "event": progress.event,
+                "objective": progress.objective,
+                "elapsed_ms": progress.elapsed_ms,
+                "improving_solutions": progress.improving_solutions,
+                "routes": routes,
+            }
+            job.updated_at = utc_now()
+            self.stop = job.stop_requested or job.cancel_requested
+            self.polled_at = time.perf_counter()
+            session.add(job)
+            session.commit()
+
+    def stop_requested(self) -> bool:
+        if self.stop or time.perf_counter() - self.polled_at < self.poll_interval_s:
+            return self.stop
+        with Session(self.engine) as session:
+            job = get_planning_job(session, self.job_uuid)
+            self.stop = job.stop_requested or job.cancel_requested
+        self.polled_at = time.perf_counter()
+        return self.stop
+
+
+def _finish_job(session: Session, job: PlanningJobModel, job_status: str, *, result: dict | None = None, error: dict | None = None) -> None:
+    now = utc_now()
+    job.status = job_status
+    job.result = result
+    job.error = error
+    job.finished_at = now
+    job.updated_at = now
+    session.add(job)
+    session.commit()
+
+
+def _claim_planning_job(engine: Engine, job_uuid: str) -> bool:
+    now = utc_now()
+    with Session(engine) as session:
+        claimed = session.execute(
+            update(PlanningJobModel)
+            .where(PlanningJobModel.uuid == job_uuid, PlanningJobModel.status == "queued")
+            .values(status="running", started_at=now, updated_at=now)
+        ).rowcount
+        session.commit()
+    return claimed == 1
+
+
+def claim_next_planning_job(engine: Engine) -> str | None:
+    """Moves the oldest queued job to ``running`` and returns its uuid; concurrent workers never share a job."""
+    with Session(engine) as session:
+        candidates = session.exec(
+            select(PlanningJobModel.uuid)
+            .where(PlanningJobModel.status == "queued")
+            .order_by(PlanningJobModel.created_at.asc(), PlanningJobModel.id.asc())
+            .limit(10)
+        ).all()
+    for job_uuid in candidates:
+        if _claim_planning_job(engine, job_uuid):
+            return job_uuid
+    return None
+
+
+def recover_orphaned_planning_jobs(engine: Engine, stale_after_s: float | None = None) -> int:
+    """Fails running jobs left behind by a process that stopped; with no ``stale_after_s`` every running job counts."""
+    now = utc_now()
+    statement = update(PlanningJobModel).where(PlanningJobModel.status == "running")
+    if stale_after_s is not None:
+        statement = statement.where(PlanningJobModel.updated_at < now - timedelta(seconds=stale_after_s))
+    with Session(engine) as session:
+        recovered = session.execute(
+            statement.values(status="failed", error=ORPHANED_JOB_ERROR, finished_at=now, updated_at=now)
+        ).rowcount
+        session.commit()
+    if recovered:
+        logger.warning("Marked %d orphaned planning jobs as failed", recovered)
+    return recovered
+
+
+class _JobHeartbeat:
+    def __init__(self, engine: Engine, job_uuid: str, interval_s: float) -> None:
+        self.engine = engine
+        self.job_uuid = job_uuid
+        self.interval_s = interval_s
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"planning-job-heartbeat-{job_uuid}", daemon=True)
+
+    def __enter__(self) -> "_JobHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_s):
+            try:
+                with Session(self.engine) as session:
+                    session.execute(
+                        update(PlanningJobModel)
+                        .where(PlanningJobModel.uuid == self.job_uuid, PlanningJobModel.status == "running")
+                        .values(updated_at=utc_now())
+                    )
+                    session.commit()
+            except SQLAlchemyError:
+                logger.warning("Planning job %s heartbeat failed", self.job_uuid, exc_info=True)
+
+
+def run_planning_job(engine: Engine, job_uuid: str) -> None:
+    if _claim_planning_job(engine, job_uuid):
+        _execute_planning_job(engine, job_uuid)
+
+
+def run_next_planning_job(engine: Engine) -> str | None:
+    job_uuid = claim_next_planning_job(engine)
+    if job_uuid is not None:
+        _execute_planning_job(engine, job_uuid)
+    return job_uuid
+
+
+def _execute_planning_job(engine: Engine, job_uuid: str) -> None:
+    settings = get_settings()
+    with Session(engine) as session, _JobHeartbeat(engine, job_uuid, settings.planning_job_heartbeat_interval_s):
+        job = get_planning_job(session, job_uuid)
+        try:
+            instance = load_planning_instance(session, job.service_date, job.office_uuid)
+            solution = None
+            if instance is not None:
+                progress = PlanningJobProgress(engine, job_uuid, instance, settings.planning_job_poll_interval_s)
+                solution = solve_planning_instance(instance.problem, progress.publish, progress.stop_requested)
+
+            session.refresh(job)
+            if job.cancel_requested:
+                _finish_job(session, job, "cancelled")
+                return
+
+            route_uuids = persist_planned_routes(session, instance, solution) if instance else []
+            _finish_job(
+                session,
+                job,
+                "succeeded",
+                result={
+                    "route_uuids": route_uuids,
+                    "dropped_task_uuids": dropped_task_uuids(instance, solution) if instance else [],
+                    "solver": solver_stats_payload(solution.stats) if solution else None,
+                },
+            )
+        except HTTPException as exc:
+            session.rollback()
+            _finish_job(session, job, "failed", error={"status_code": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            logger.exception("Planning job %s failed", job_uuid)
+            session.rollback()
+            _finish_job(
+                session,
+                job,
+                "failed",
+                error={"status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "type": type(exc).__name__, "detail": str(exc)},
+            )
+
+
+def _work(engine: Engine, stopping: threading.Event, poll_interval_s: float) -> None:
+    while not stopping.is_set():
+        if run_next_planning_job(engine) is None:
+            stopping.wait(poll_interval_s)
+
+
+def main(argv: list[str] | None = None) -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run queued planning jobs outside the API process.")
+    parser.add_argument("--concurrency", type=int, default=settings.planning_job_concurrency)
+    parser.add_argument("--poll-interval", type=float, default=settings.planning_job_queue_poll_interval_s)
+    parser.add_argument("--once", action="store_true", help="run the queued jobs, then exit")
+    args = parser.parse_args(argv)
+
+    from bases.platform.db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    stale_after_s = settings.planning_job_heartbeat_interval_s * ORPHANED_AFTER_HEARTBEATS
+    recover_orphaned_planning_jobs(engine, stale_after_s)
+    if args.once:
+        while run_next_planning_job(engine) is not None:
+            pass
+        return
+
+    stopping = threading.Event()
+    workers = [
+        threading.Thread(target=_work, args=(engine, stopping, args.poll_interval), name=f"planning-worker-{index}")
+        for index in range(max(1, args.concurrency))
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        while not stopping.wait(stale_after_s):
+            recover_orphaned_planning_jobs(engine, stale_after_s)
+    except KeyboardInterrupt:
+        stopping.set()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,41 @@
-from dataclasses import dataclass
-from datetime import date
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date, datetime, time, timedelta, timezone
+from time import perf_counter
 
 from fastapi import HTTPException, status
 from sqlmodel import Session, col, select
 
+from bases.platform.config import get_settings
 from bases.platform.time import utc_now
 from components.persistence__sqlmodel.models.office import OfficeModel
 from components.persistence__sqlmodel.models.route import RouteModel
 from components.persistence__sqlmodel.models.route_task import RouteTaskModel
 from components.persistence__sqlmodel.models.task import TaskModel
 from components.persistence__sqlmodel.models.vehicle import VehicleModel
-from components.route_planning.haversine_matrix import build_distance_matrix
-from components.route_planning.ortools_vrp_solver import solve_capacitated_vrp, solve_single_vehicle_route
+from components.route_planning.decomposition import solve_decomposed
+from components.route_planning.fallback_heuristic import LocalSearch, build_neighbour_lists, customer_nodes
+from components.route_planning.haversine_matrix import matrix_rows
+from components.route_planning.matrix_providers import TravelMatrix, get_matrix_provider, location_key
+from components.route_planning.solution_cache import get_solution_cache, solution_key
+from components.route_planning.ortools_vrp_solver import (
+    TIME_HORIZON_S,
+    TimeWindow,
+    ProgressListener,
+    SolverBudget,
+    SolverStats,
+    VehicleRoutePlan,
+    VrpSolution,
+    has_time_windows,
+    schedule_route,
+    solve_capacitated_vrp,
+)
+
+INSERTION_REPAIR_TIME_BUDGET_S = 0.2
+# Dropping a stop must always cost more than any detour to serve it, and each priority level
+# outweighs many stops of the level below, so low-priority tasks are the first to be left out.
+DROP_PENALTY_BY_PRIORITY = {"low": 10_000_000, "normal": 100_000_000, "high": 1_000_000_000}
 
 
 @dataclass
@@ -27,11 +51,42 @@ class RouteTaskPayload:
     load_units: int
 
 
+@dataclass
+class TaskInsertionPayload:
+    task_uuid: str
+    route_uuid: str
+    sequence_order: int
+    added_distance_m: int
+
+
 @dataclass
 class RouteDetailPayload:
     route: dict
     office: dict
     tasks: list[RouteTaskPayload]
+    solver_stats: dict | None = None
+
+
+@dataclass
+class GeneratedRoutes:
+    route_uuids: list[str]
+    solver_stats: dict | None = None
+    dropped_task_uuids: list[str] = field(default_factory=list)
+
+
+def solver_stats_payload(stats: SolverStats | None) -> dict | None:
+    return asdict(stats) if stats is not None else None
+
+
+def planning_route_summary(route: RouteModel, vehicle: VehicleModel) -> dict:
+    return {
+        "uuid": route.uuid,
+        "vehicle_name": vehicle.name,
+        "status": route.status,
+        "total_tasks": route.total_tasks,
+        "total_load": route.total_load,
+        "total_distance_m": route.total_distance_m,
+    }
 
 
 def _office_query(office_uuid: str):
@@ -52,10 +107,16 @@ def _fetch_vehicles_for_office(session: Session, office: OfficeModel) -> list[Ve
 
 
 def _build_unassigned_task_query(session: Session, office: OfficeModel, service_date: date):
-    assigned_active_subquery = (
-        select(RouteTaskModel.task_uuid)
+    # Correlated so each candidate task probes ix_route_tasks_task_uuid instead of listing every assignment.
+    assigned_active = (
+        select(RouteTaskModel.id)
         .join(RouteModel, RouteTaskModel.route_uuid == RouteModel.uuid)
-        .where(RouteTaskModel.deleted_at.is_(None), RouteModel.deleted_at.is_(None))
+        .where(
+            RouteTaskModel.task_uuid == TaskModel.uuid,
+            RouteTaskModel.deleted_at.is_(None),
+            RouteModel.deleted_at.is_(None),
+        )
+        .exists()
     )
 
     query = (
@@ -64,7 +125,7 @@ def _build_unassigned_task_query(session: Session, office: OfficeModel, service_
             TaskModel.deleted_at.is_(None),
             TaskModel.office_id == office.id,
             col(TaskModel.status).in_(["pending", "scheduled"]),
-            col(TaskModel.uuid).not_in(assigned_active_subquery),
+            ~assigned_active,
         )
         .order_by(TaskModel.created_at.asc())
     )
@@ -82,6 +143,85 @@ def _validate_tasks_for_planning(tasks: list[TaskModel]) -> None:
         )
 
 
+def _service_day_origin(service_date: date) -> datetime:
+    return datetime.combine(service_date, time.min, tzinfo=timezone.utc)
+
+
+def _seconds_since(origin: datetime, value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int((value - origin).total_seconds())
+
+
+def _day_start_s() -> int:
+    hours, minutes = get_settings().planning_day_start.split(":")
+    return int(hours) * 3600 + int(minutes) * 60
+
+
+def _task_time_window(task: TaskModel, origin: datetime) -> TimeWindow | None:
+    if task.time_window_start is None and task.time_window_end is None:
+        return None
+    window_start = _seconds_since(origin, task.time_window_start) if task.time_window_start is not None else 0
+    window_end = _seconds_since(origin, task.time_window_end) if task.time_window_end is not None else TIME_HORIZON_S
+    return max(0, window_start), min(TIME_HORIZON_S, window_end)
+
+
+def _task_time_inputs(tasks: list[TaskModel], service_date: date) -> tuple[list[int], list[TimeWindow | None]]:
+    origin = _service_day_origin(service_date)
+    windows = [_task_time_window(task, origin) for task in tasks]
+    invalid_tasks = [task.uuid for task, window in zip(tasks, windows, strict=True) if window is not None and window[0] > window[1]]
+    if invalid_tasks:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Task time windows must overlap the service date", "invalid_task_uuids": invalid_tasks},
+        )
+    service_times = [0] + [task.service_duration_minutes * 60 for task in tasks]
+    return service_times, [None] + windows
+
+
+def _apply_route_schedule(
+    route: RouteModel,
+    route_task_models: list[RouteTaskModel],
+    plan: VehicleRoutePlan,
+    now: datetime,
+) -> None:
+    origin = _service_day_origin(route.service_date)
+    for idx, model in enumerate(route_task_models):
+        if plan.arrivals_s:
+            if (
+                model.planned_arrival_at is not None
+                and model.planned_departure_at is not None
+                and _seconds_since(origin, model.planned_arrival_at) == plan.arrivals_s[idx]
+                and _seconds_since(origin, model.planned_departure_at) == plan.departures_s[idx]
+            ):
+                continue
+            model.planned_arrival_at = origin + timedelta(seconds=plan.arrivals_s[idx])
+            model.planned_departure_at = origin + timedelta(seconds=plan.departures_s[idx])
+        elif model.planned_arrival_at is None and model.planned_departure_at is None:
+            continue
+        else:
+            model.planned_arrival_at = None
+            model.planned_departure_at = None
+        model.updated_at = now
+    route.total_duration_s = plan.duration_s
+
+
+def _drop_penalty(task: TaskModel) -> int:
+    return DROP_PENALTY_BY_PRIORITY.get(task.priority, DROP_PENALTY_BY_PRIORITY["normal"])
+
+
+def _location_keys(office: OfficeModel, tasks: list[TaskModel]) -> list[str]:
+    return [location_key((office.lat, office.lng), office.place_id)] + [
+        location_key((task.lat, task.lng), task.place_id) for task in tasks
+    ]
+
+
+def _vehicle_location(vehicle: VehicleModel) -> tuple[float, float] | None:
+    if vehicle.lat is None or vehicle.lng is None:
+        return None
+    return vehicle.lat, vehicle.lng
+
+
 def _route_detail(session: Session, route_uuid: str) -> RouteDetailPayload:
     row = session.exec(
         select(RouteModel, OfficeModel, VehicleModel)
@@ -138,7 +278,30 @@ def _route_detail(session: Session, route_uuid: str) -> RouteDetailPayload:
     )
 
 
-def generate_routes(session: Session, service_date: date, office_uuid: str) -> list[str]:
+@dataclass
+class PlanningProblem:
+    locations: list[tuple[float, float]]
+    demands: list[int]
+    capacities: list[int]
+    service_times: list[int] = field(default_factory=list)
+    time_windows: list[TimeWindow | None] = field(default_factory=list)
+    route_start_s: int = 0
+    location_keys: list[str] | None = None
+    time_ceiling_s: float | None = None
+    vehicle_locations: list[tuple[float, float] | None] | None = None
+    drop_penalties: list[int] | None = None
+
+
+@dataclass
+class OfficePlanningInstance:
+    office: OfficeModel
+    service_date: date
+    vehicles: list[VehicleModel]
+    tasks: list[TaskModel]
+    problem: PlanningProblem
+
+
+def load_planning_instance(session: Session, service_date: date, office_uuid: str) -> OfficePlanningInstance | None:
     office = session.exec(_office_query(office_uuid)).first()
     if office is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Office not found")
@@ -150,29 +313,202 @@ def generate_routes(session: Session, service_date: date, office_uuid: str) -> l
 
     tasks = list(session.exec(_build_unassigned_task_query(session, office, service_date)).all())
     if not tasks:
-        return []
+        return None
     _validate_tasks_for_planning(tasks)
+    service_times, time_windows = _task_time_inputs(tasks, service_date)
+
+    return OfficePlanningInstance(
+        office=office,
+        service_date=service_date,
+        vehicles=vehicles,
+        tasks=tasks,
+        problem=PlanningProblem(
+            locations=[(office.lat, office.lng)] + [(task.lat, task.lng) for task in tasks],
+            demands=[0] + [task.load_units for task in tasks],
+            capacities=[vehicle.max_capacity for vehicle in vehicles],
+            service_times=service_times,
+            time_windows=time_windows,
+            route_start_s=_day_start_s(),
+            location_keys=_location_keys(office, tasks),
+            vehicle_locations=[_vehicle_location(vehicle) for vehicle in vehicles],
+            drop_penalties=[0] + [_drop_penalty(task) for task in tasks],
+        ),
+    )
+
+
+def dropped_task_uuids(instance: OfficePlanningInstance, solution: VrpSolution | None) -> list[str]:
+    if solution is None:
+        return []
+    return [instance.tasks[task_index].uuid for task_index in solution.dropped_task_indices]
+
+
+def _with_vehicle_depots(problem: PlanningProblem) -> tuple[PlanningProblem, list[int] | None]:
+    # Vehicles sharing a start location share one extra matrix row; vehicles at the office keep node 0.
+    node_by_key = {location_key(problem.locations[0]): 0}
+    extra_locations: list[tuple[float, float]] = []
+    depot_nodes: list[int] = []
+    for location in problem.vehicle_locations or [None] * len(problem.capacities):
+        if location is None:
+            depot_nodes.append(0)
+            continue
+        key = location_key(location)
+        if key not in node_by_key:
+            node_by_key[key] = len(problem.locations) + len(extra_locations)
+            extra_locations.append(location)
+        depot_nodes.append(node_by_key[key])
+    if not any(depot_nodes):
+        return problem, None
+
+    padding = [0] * len(extra_locations)
+    return (
+        replace(
+            problem,
+            locations=problem.locations + extra_locations,
+            demands=problem.demands + padding,
+            service_times=problem.service_times + padding if problem.service_times else problem.service_times,
+            time_windows=problem.time_windows + [None] * len(extra_locations) if problem.time_windows else problem.time_windows,
+            location_keys=(
+                problem.location_keys + [location_key(location) for location in extra_locations] if problem.location_keys else None
+            ),
+            drop_penalties=problem.drop_penalties + padding if problem.drop_penalties else problem.drop_penalties,
+        ),
+        depot_nodes,
+    )
+
+
+def _solver_options(locations: list[tuple[float, float]], time_ceiling_s: float | None = None) -> dict:
+    settings = get_settings()
+    return {
+        "locations": locations,
+        "engine": settings.planning_solver_engine,
+        "heuristic_time_budget_s": settings.planning_heuristic_time_budget_s,
+        "budget": SolverBudget(
+            base_s=settings.planning_time_limit_base_s,
+            per_stop_s=settings.planning_time_limit_per_stop_s,
+            max_s=settings.planning_time_limit_max_s,
+            stall_window_s=settings.planning_stall_window_s,
+            ceiling_s=time_ceiling_s,
+        ),
+    }
+
+
+def _require_window_aware_engine(time_windows: list[TimeWindow | None]) -> None:
+    if has_time_windows(time_windows) and get_settings().planning_solver_engine == "heuristic":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tasks with time windows cannot be planned with the heuristic solver engine",
+        )
+
+
+def solve_planning_instance(
+    problem: PlanningProblem,
+    on_progress: ProgressListener | None = None,
+    stop_requested: Callable[[], bool] | None = None,
+) -> VrpSolution:
+    settings = get_settings()
+    _require_window_aware_engine(problem.time_windows)
+    if len(problem.demands) - 1 > settings.planning_decomposition_threshold:
+        return solve_decomposed(
+            problem,
+            solve_single_cluster,
+            get_matrix_provider(),
+            cluster_size=min(settings.planning_decomposition_cluster_size, settings.planning_decomposition_threshold),
+            max_workers=settings.planning_batch_workers,
+            repair=settings.planning_decomposition_repair,
+        )
+    return solve_single_cluster(problem, on_progress, stop_requested)
+
 
-    locations = [(office.lat, office.lng)] + [(task.lat, task.lng) for task in tasks]
-    distance_matrix = build_distance_matrix(locations)
-    demands = [0] + [task.load_units for task in tasks]
-    capacities = [vehicle.max_capacity for vehicle in vehicles]
+def _cached_solve(
+    instance: dict, solver_options: dict, location_count: int, solve: Callable[[], VrpSolution]
+) -> VrpSolution:
+    cache = get_solution_cache()
+    if cache is None:
+        return solve()
 
-    solution = solve_capacitated_vrp(distance_matrix=distance_matrix, demands=demands, vehicle_capacities=capacities)
+    key = solution_key(
+        matrix=_matrix_settings(location_count),
+        solver={**solver_options, "budget": asdict(solver_options["budget"])},
+        **instance,
+    )
+    solution = cache.get(key)
+    if solution is None:
+        solution = solve()
+        # A search the user cut short is not the answer the same inputs would normally get.
+        if solution.stats is None or solution.stats.stop_reason != "stopped":
+            cache.put(key, solution)
+    return solution
+
+
+def _matrix_settings(location_count: int) -> dict:
+    # Everything that decides the legs _build_travel_matrix returns, so cached solutions follow setting changes.
+    settings = get_settings()
+    sparse = location_count > settings.planning_sparse_matrix_threshold
+    return {
+        "provider": get_matrix_provider().cache_namespace,
+        "sparse_neighbours": settings.planning_sparse_neighbours if sparse else None,
+    }
+
+
+def _build_travel_matrix(locations: list[tuple[float, float]], location_keys: list[str] | None) -> TravelMatrix:
+    settings = get_settings()
+    provider = get_matrix_provider()
+    if len(locations) > settings.planning_sparse_matrix_threshold:
+        travel_matrix = provider.build_sparse(locations, settings.planning_sparse_neighbours)
+        if travel_matrix is not None:
+            return travel_matrix
+    return provider.build(locations, location_keys)
+
+
+def solve_single_cluster(
+    problem: PlanningProblem,
+    on_progress: ProgressListener | None = None,
+    stop_requested: Callable[[], bool] | None = None,
+) -> VrpSolution:
+    expanded, depot_nodes = _with_vehicle_depots(problem)
+    solver_options = _solver_options(expanded.locations, problem.time_ceiling_s)
+
+    def solve() -> VrpSolution:
+        travel_matrix = _build_travel_matrix(expanded.locations, expanded.location_keys)
+        solution = solve_capacitated_vrp(
+            distance_matrix=travel_matrix.distances_m,
+            demands=expanded.demands,
+            vehicle_capacities=expanded.capacities,
+            time_matrix=travel_matrix.durations_s,
+            service_times=expanded.service_times,
+            time_windows=expanded.time_windows,
+            route_start_s=expanded.route_start_s,
+            vehicle_starts=depot_nodes,
+            vehicle_ends=depot_nodes,
+            on_progress=on_progress,
+            stop_requested=stop_requested,
+            drop_penalties=expanded.drop_penalties,
+            **solver_options,
+        )
+        if solution.stats is not None:
+            solution.stats.matrix_cache_hits = travel_matrix.cache_hits
+            solution.stats.matrix_cache_misses = travel_matrix.cache_misses
+        return solution
+
+    return _cached_solve(asdict(problem), solver_options, len(expanded.locations), solve)
+
+
+def persist_planned_routes(session: Session, instance: OfficePlanningInstance, solution: VrpSolution) -> list[str]:
     if not solution.routes:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to generate feasible routes")
 
+    office = instance.office
     created_route_uuids: list[str] = []
     now = utc_now()
     try:
         for planned_route in solution.routes:
-            vehicle = vehicles[planned_route.vehicle_index]
-            route_tasks = [tasks[task_index] for task_index in planned_route.task_indices]
+            vehicle = instance.vehicles[planned_route.vehicle_index]
+            route_tasks = [instance.tasks[task_index] for task_index in planned_route.task_indices]
             route = RouteModel(
                 tenant_id=office.tenant_id,
                 office_id=office.id,
                 vehicle_id=vehicle.id,
-                service_date=service_date,
+                service_date=instance.service_date,
                 status="planned",
                 total_tasks=len(route_tasks),
                 total_load=sum(task.load_units for task in route_tasks),
@@ -183,18 +519,20 @@ def generate_routes(session: Session, service_date: date, office_uuid: str) -> l
             session.add(route)
             session.flush()
 
-            for sequence_order, task in enumerate(route_tasks, start=1):
-                session.add(
-                    RouteTaskModel(
-                        tenant_id=office.tenant_id,
-                        route_uuid=route.uuid,
-                        task_uuid=task.uuid,
-                        sequence_order=sequence_order,
-                        status="pending",
-                        created_at=now,
-                        updated_at=now,
-                    )
+            route_task_models = [
+                RouteTaskModel(
+                    tenant_id=office.tenant_id,
+                    route_uuid=route.uuid,
+                    task_uuid=task.uuid,
+                    sequence_order=sequence_order,
+                    status="pending",
+                    created_at=now,
+                    updated_at=now,
                 )
+                for sequence_order, task in enumerate(route_tasks, start=1)
+            ]
+            _apply_route_schedule(route, route_task_models, planned_route, now)
+            session.add_all(route_task_models)
 
             created_route_uuids.append(route.uuid)
         session.commit()
@@ -205,69 +543,664 @@ def generate_routes(session: Session, service_date: date, office_uuid: str) -> l
     return created_route_uuids
 
 
-def recalculate_route(session: Session, route_uuid: str) -> RouteDetailPayload:
-    route = session.exec(select(RouteModel).where(RouteModel.uuid == route_uuid, RouteModel.deleted_at.is_(None))).first()
-    if route is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route not found")
+def generate_routes(
+    session: Session,
+    service_date: date,
+    office_uuid: str,
+    time_ceiling_s: float | None = None,
+) -> GeneratedRoutes:
+    instance = load_planning_instance(session, service_date, office_uuid)
+    if instance is None:
+        return GeneratedRoutes(route_uuids=[])
+
+    instance.problem.time_ceiling_s = time_ceiling_s
+    solution = solve_planning_instance(instance.problem)
+    return GeneratedRoutes(
+        route_uuids=persist_planned_routes(session, instance, solution),
+        solver_stats=solver_stats_payload(solution.stats),
+        dropped_task_uuids=dropped_task_uuids(instance, solution),
+    )
+
+
+@dataclass
+class RouteRecalculation:
+    route: RouteModel
+    route_task_models: list[RouteTaskModel]
+    tasks: list[TaskModel]
+    problem: PlanningProblem
+    depot_nodes: list[int] | None
+
+
+@dataclass
+class RouteSequenceOutcome:
+    solution: VrpSolution
+    current_distance_m: int
+    changed: bool
 
-    office = session.exec(select(OfficeModel).where(OfficeModel.id == route.office_id, OfficeModel.deleted_at.is_(None))).first()
-    vehicle = session.exec(select(VehicleModel).where(VehicleModel.id == route.vehicle_id, VehicleModel.deleted_at.is_(None))).first()
-    if office is None or vehicle is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Route office or vehicle unavailable")
-    _validate_office_coordinates(office)
 
+@dataclass
+class RouteRecalculationSummary:
+    route_uuid: str
+    before_distance_m: int
+    after_distance_m: int
+    changed: bool
+    solver_stats: dict | None = None
+
+
+def _load_route_recalculation(
+    session: Session,
+    route: RouteModel,
+    office: OfficeModel,
+    vehicle: VehicleModel,
+    time_ceiling_s: float | None = None,
+) -> RouteRecalculation | None:
     rows = session.exec(
         select(RouteTaskModel, TaskModel)
         .join(TaskModel, RouteTaskModel.task_uuid == TaskModel.uuid)
-        .where(RouteTaskModel.route_uuid == route_uuid, RouteTaskModel.deleted_at.is_(None), TaskModel.deleted_at.is_(None))
+        .where(RouteTaskModel.route_uuid == route.uuid, RouteTaskModel.deleted_at.is_(None), TaskModel.deleted_at.is_(None))
         .order_by(RouteTaskModel.sequence_order.asc())
     ).all()
     if not rows:
-        return _route_detail(session, route_uuid)
+        return None
 
     route_task_models = [row[0] for row in rows]
     tasks = [row[1] for row in rows]
     _validate_tasks_for_planning(tasks)
 
-    locations = [(office.lat, office.lng)] + [(task.lat, task.lng) for task in tasks]
-    distance_matrix = build_distance_matrix(locations)
-    demands = [0] + [task.load_units for task in tasks]
+    service_times, time_windows = _task_time_inputs(tasks, route.service_date)
+    problem, depot_nodes = _with_vehicle_depots(
+        PlanningProblem(
+            locations=[(office.lat, office.lng)] + [(task.lat, task.lng) for task in tasks],
+            demands=[0] + [task.load_units for task in tasks],
+            capacities=[vehicle.max_capacity],
+            service_times=service_times,
+            time_windows=time_windows,
+            route_start_s=_day_start_s(),
+            location_keys=_location_keys(office, tasks),
+            time_ceiling_s=time_ceiling_s,
+            vehicle_locations=[_vehicle_location(vehicle)],
+        )
+    )
+    return RouteRecalculation(route, route_task_models, tasks, problem, depot_nodes)
 
-    plan = solve_single_vehicle_route(distance_matrix=distance_matrix, demands=demands, vehicle_capacity=vehicle.max_capacity)
-    if plan is None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to recalculate route")
 
-    by_task_uuid = {task.uuid: route_task for route_task, task in zip(route_task_models, tasks, strict=False)}
+def solve_route_sequence(problem: PlanningProblem, depot_nodes: list[int] | None) -> RouteSequenceOutcome:
+    travel_matrix = _build_travel_matrix(problem.locations, problem.location_keys)
+    distance_matrix = matrix_rows(travel_matrix.distances_m)
+    time_matrix = matrix_rows(travel_matrix.durations_s)
+    demands, service_times, time_windows = problem.demands, problem.service_times, problem.time_windows
+    route_start_s = problem.route_start_s
+    depot_node = depot_nodes[0] if depot_nodes else 0
+    current_order = [node - 1 for node in customer_nodes(len(problem.locations), depot_nodes or ())]
+
+    _require_window_aware_engine(time_windows)
+    time_limit_s = get_settings().planning_recalculate_time_limit_s
+    solver_options = _solver_options(problem.locations, problem.time_ceiling_s)
+    solution = _cached_solve(
+        {
+            "location_keys": problem.location_keys,
+            "demands": demands,
+            "capacities": problem.capacities,
+            "service_times": service_times,
+            "time_windows": time_windows,
+            "route_start_s": route_start_s,
+            "time_limit_s": time_limit_s,
+            "vehicle_locations": problem.vehicle_locations,
+        },
+        solver_options,
+        len(problem.locations),
+        lambda: solve_capacitated_vrp(
+            distance_matrix=distance_matrix,
+            demands=demands,
+            vehicle_capacities=problem.capacities,
+            time_limit_seconds=time_limit_s,
+            time_matrix=time_matrix,
+            service_times=service_times,
+            time_windows=time_windows,
+            route_start_s=route_start_s,
+            initial_routes=[current_order],
+            vehicle_starts=depot_nodes,
+            vehicle_ends=depot_nodes,
+            **solver_options,
+        ),
+    )
+
+    current_nodes = [task_index + 1 for task_index in current_order]
+    current_path = [depot_node, *current_nodes, depot_node]
+    current_distance_m = sum(distance_matrix[origin][destination] for origin, destination in zip(current_path, current_path[1:]))
+    current_feasible = sum(demands) <= problem.capacities[0] and (
+        not has_time_windows(time_windows)
+        or _respects_time_windows(current_nodes, time_matrix, service_times, time_windows, route_start_s, depot_node)
+    )
+    changed = bool(solution.routes) and (not current_feasible or solution.routes[0].distance_m < current_distance_m)
+    return RouteSequenceOutcome(solution=solution, current_distance_m=current_distance_m, changed=changed)
+
+
+def _apply_route_sequence(session: Session, recalculation: RouteRecalculation, plan: VehicleRoutePlan, now: datetime) -> None:
+    route, tasks = recalculation.route, recalculation.tasks
+    by_task_uuid = {task.uuid: route_task for route_task, task in zip(recalculation.route_task_models, tasks, strict=False)}
     ordered_task_uuids = [tasks[task_index].uuid for task_index in plan.task_indices]
 
+    offset = len(recalculation.route_task_models) + 10
+    for idx, task_uuid in enumerate(ordered_task_uuids, start=1):
+        model = by_task_uuid[task_uuid]
+        model.sequence_order = idx + offset
+        model.updated_at = now
+        session.add(model)
+
+    session.flush()
+
+    for idx, task_uuid in enumerate(ordered_task_uuids, start=1):
+        model = by_task_uuid[task_uuid]
+        model.sequence_order = idx
+        model.updated_at = now
+        session.add(model)
+
+    _apply_route_schedule(route, [by_task_uuid[task_uuid] for task_uuid in ordered_task_uuids], plan, now)
+    route.total_tasks = len(ordered_task_uuids)
+    route.total_load = sum(task.load_units for task in tasks)
+    route.total_distance_m = plan.distance_m
+    route.updated_at = now
+    session.add(route)
+
+
+def recalculate_route(session: Session, route_uuid: str, time_ceiling_s: float | None = None) -> RouteDetailPayload:
+    route = session.exec(select(RouteModel).where(RouteModel.uuid == route_uuid, RouteModel.deleted_at.is_(None))).first()
+    if route is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route not found")
+
+    office = session.exec(select(OfficeModel).where(OfficeModel.id == route.office_id, OfficeModel.deleted_at.is_(None))).first()
+    vehicle = session.exec(select(VehicleModel).where(VehicleModel.id == route.vehicle_id, VehicleModel.deleted_at.is_(None))).first()
+    if office is None or vehicle is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Route office or vehicle unavailable")
+    _validate_office_coordinates(office)
+
+    recalculation = _load_route_recalculation(session, route, office, vehicle, time_ceiling_s)
+    if recalculation is None:
+        return _route_detail(session, route_uuid)
+
+    outcome = solve_route_sequence(recalculation.problem, recalculation.depot_nodes)
+    if not outcome.solution.routes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unable to recalculate route")
+
+    if outcome.changed:
+        try:
+            _apply_route_sequence(session, recalculation, outcome.solution.routes[0], utc_now())
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    detail = _route_detail(session, route_uuid)
+    detail.solver_stats = solver_stats_payload(outcome.solution.stats)
+    return detail
+
+
+def _planned_routes(session: Session, office: OfficeModel, service_date: date) -> list[tuple[RouteModel, VehicleModel]]:
+    return list(
+        session.exec(
+            select(RouteModel, VehicleModel)
+            .join(VehicleModel, RouteModel.vehicle_id == VehicleModel.id)
+            .where(
+                RouteModel.office_id == office.id,
+                RouteModel.service_date == service_date,
+                RouteModel.status == "planned",
+                RouteModel.deleted_at.is_(None),
+                VehicleModel.deleted_at.is_(None),
+            )
+            .order_by(RouteModel.id.asc())
+        ).all()
+    )
+
+
+def _route_stops(session: Session, route_uuids: list[str]) -> list[tuple[RouteTaskModel, TaskModel]]:
+    return list(
+        session.exec(
+            select(RouteTaskModel, TaskModel)
+            .join(TaskModel, RouteTaskModel.task_uuid == TaskModel.uuid)
+            .where(
+                col(RouteTaskModel.route_uuid).in_(route_uuids),
+                RouteTaskModel.deleted_at.is_(None),
+                TaskModel.deleted_at.is_(None),
+            )
+            .order_by(RouteTaskModel.route_uuid.asc(), RouteTaskModel.sequence_order.asc())
+        ).all()
+    )
+
+
+def _day_problem(
+    office: OfficeModel,
+    tasks: list[TaskModel],
+    planned_routes: list[tuple[RouteModel, VehicleModel]],
+    service_date: date,
+) -> tuple[PlanningProblem, list[int]]:
+    service_times, time_windows = _task_time_inputs(tasks, service_date)
+    problem, depot_nodes = _with_vehicle_depots(
+        PlanningProblem(
+            locations=[(office.lat, office.lng)] + [(task.lat, task.lng) for task in tasks],
+            demands=[0] + [task.load_units for task in tasks],
+            capacities=[vehicle.max_capacity for _, vehicle in planned_routes],
+            service_times=service_times,
+            time_windows=time_windows,
+            route_start_s=_day_start_s(),
+            location_keys=_location_keys(office, tasks),
+            vehicle_locations=[_vehicle_location(vehicle) for _, vehicle in planned_routes],
+        )
+    )
+    return problem, depot_nodes or [0] * len(planned_routes)
+
+
+def recalculate_office_routes(
+    session: Session,
+    service_date: date,
+    office_uuid: str,
+    time_ceiling_s: float | None = None,
+    max_workers: int | None = None,
+) -> list[RouteRecalculationSummary]:
+    office = session.exec(_office_query(office_uuid)).first()
+    if office is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Office not found")
+    _validate_office_coordinates(office)
+
+    planned_routes = _planned_routes(session, office, service_date)
+
+    summaries: list[RouteRecalculationSummary] = []
+    recalculations: list[RouteRecalculation] = []
+    for route, vehicle in planned_routes:
+        recalculation = _load_route_recalculation(session, route, office, vehicle, time_ceiling_s)
+        if recalculation is None:
+            distance_m = route.total_distance_m or 0
+            summaries.append(RouteRecalculationSummary(route.uuid, distance_m, distance_m, False))
+        else:
+            recalculations.append(recalculation)
+    if not recalculations:
+        return summaries
+
+    problems = [recalculation.problem for recalculation in recalculations]
+    depot_nodes = [recalculation.depot_nodes for recalculation in recalculations]
+    workers = min(max_workers or get_settings().planning_batch_workers, len(recalculations))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(solve_route_sequence, problems, depot_nodes))
+    else:
+        outcomes = [solve_route_sequence(problem, nodes) for problem, nodes in zip(problems, depot_nodes, strict=True)]
+
+    failed_route_uuids = [
+        recalculation.route.uuid for recalculation, outcome in zip(recalculations, outcomes, strict=True) if not outcome.solution.routes
+    ]
+    if failed_route_uuids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Unable to recalculate routes", "route_uuids": failed_route_uuids},
+        )
+
     now = utc_now()
     try:
-        offset = len(route_task_models) + 10
-        for idx, task_uuid in enumerate(ordered_task_uuids, start=1):
-            model = by_task_uuid[task_uuid]
-            model.sequence_order = idx + offset
-            model.updated_at = now
-            session.add(model)
+        for recalculation, outcome in zip(recalculations, outcomes, strict=True):
+            if outcome.changed:
+                _apply_route_sequence(session, recalculation, outcome.solution.routes[0], now)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    for recalculation, outcome in zip(recalculations, outcomes, strict=True):
+        summaries.append(
+            RouteRecalculationSummary(
+                route_uuid=recalculation.route.uuid,
+                before_distance_m=outcome.current_distance_m,
+                after_distance_m=outcome.solution.routes[0].distance_m if outcome.changed else outcome.current_distance_m,
+                changed=outcome.changed,
+                solver_stats=solver_stats_payload(outcome.solution.stats),
+            )
+        )
+    order = {route.uuid: position for position, (route, _) in enumerate(planned_routes)}
+    return sorted(summaries, key=lambda summary: order[summary.route_uuid])
+
+
+def _respects_time_windows(
+    task_nodes: list[int],
+    time_matrix: list[list[int]],
+    service_times: list[int],
+    time_windows: list[TimeWindow | None],
+    route_start_s: int,
+    depot_node: int = 0,
+) -> bool:
+    arrivals, _, _ = schedule_route(task_nodes, time_matrix, service_times, time_windows, route_start_s, depot_node, depot_node)
+    return all(time_windows[node] is None or arrival <= time_windows[node][1] for node, arrival in zip(task_nodes, arrivals, strict=True))
+
+
+def _cheapest_insertion(
+    node: int,
+    routes: list[list[int]],
+    loads: list[int],
+    capacities: list[int],
+    demands: list[int],
+    distance_matrix: list[list[int]],
+    time_matrix: list[list[int]],
+    service_times: list[int],
+    time_windows: list[TimeWindow | None],
+    route_start_s: int,
+    depot_nodes: list[int],
+) -> tuple[int, int, int] | None:
+    candidates: list[tuple[int, int, int]] = []
+    for route_index, route_nodes in enumerate(routes):
+        if loads[route_index] + demands[node] > capacities[route_index]:
+            continue
+        path = [depot_nodes[route_index], *route_nodes, depot_nodes[route_index]]
+        for position in range(len(route_nodes) + 1):
+            previous_node, next_node = path[position], path[position + 1]
+            added_m = distance_matrix[previous_node][node] + distance_matrix[node][next_node] - distance_matrix[previous_node][next_node]
+            candidates.append((added_m, route_index, position))
+
+    windowed = has_time_windows(time_windows)
+    for added_m, route_index, position in sorted(candidates):
+        route_nodes = routes[route_index][:position] + [node] + routes[route_index][position:]
+        if not windowed or _respects_time_windows(
+            route_nodes, time_matrix, service_times, time_windows, route_start_s, depot_nodes[route_index]
+        ):
+            return added_m, route_index, position
+    return None
+
+
+def insert_tasks_into_routes(
+    session: Session,
+    service_date: date,
+    office_uuid: str,
+    task_uuids: list[str],
+    repair: bool = False,
+) -> list[TaskInsertionPayload]:
+    office = session.exec(_office_query(office_uuid)).first()
+    if office is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Office not found")
+    _validate_office_coordinates(office)
+
+    task_uuids = list(dict.fromkeys(task_uuids))
+    found_tasks = {
+        task.uuid: task
+        for task in session.exec(
+            select(TaskModel).where(col(TaskModel.uuid).in_(task_uuids), TaskModel.office_id == office.id, TaskModel.deleted_at.is_(None))
+        ).all()
+    }
+    missing_task_uuids = [task_uuid for task_uuid in task_uuids if task_uuid not in found_tasks]
+    if missing_task_uuids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"message": "Tasks not found for office", "missing_task_uuids": missing_task_uuids},
+        )
+    new_tasks = [found_tasks[task_uuid] for task_uuid in task_uuids]
+    unplannable_task_uuids = [task.uuid for task in new_tasks if task.status not in ("pending", "scheduled")]
+    if unplannable_task_uuids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Only pending or scheduled tasks can be inserted", "task_uuids": unplannable_task_uuids},
+        )
+    _validate_tasks_for_planning(new_tasks)
+
+    assigned_task_uuids = session.exec(
+        select(RouteTaskModel.task_uuid)
+        .join(RouteModel, RouteTaskModel.route_uuid == RouteModel.uuid)
+        .where(col(RouteTaskModel.task_uuid).in_(task_uuids), RouteTaskModel.deleted_at.is_(None), RouteModel.deleted_at.is_(None))
+    ).all()
+    if assigned_task_uuids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Tasks are already assigned to a route", "assigned_task_uuids": list(assigned_task_uuids)},
+        )
+
+    planned_routes = _planned_routes(session, office, service_date)
+    if not planned_routes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No planned routes available for insertion")
+
+    route_index_by_uuid = {route.uuid: route_index for route_index, (route, _) in enumerate(planned_routes)}
+    stops = _route_stops(session, list(route_index_by_uuid))
+
+    tasks = [task for _, task in stops] + new_tasks
+    route_task_by_node = {node: route_task for node, (route_task, _) in enumerate(stops, start=1)}
+    routes: list[list[int]] = [[] for _ in planned_routes]
+    for node, (route_task, _) in enumerate(stops, start=1):
+        routes[route_index_by_uuid[route_task.route_uuid]].append(node)
+
+    problem, depot_nodes = _day_problem(office, tasks, planned_routes, service_date)
+    locations = problem.locations
+    travel_matrix = _build_travel_matrix(locations, problem.location_keys)
+    distance_matrix = matrix_rows(travel_matrix.distances_m)
+    time_matrix = matrix_rows(travel_matrix.durations_s)
+    demands, service_times, time_windows = problem.demands, problem.service_times, problem.time_windows
+    capacities = problem.capacities
+    loads = [sum(demands[node] for node in route_nodes) for route_nodes in routes]
+    route_start_s = problem.route_start_s
+
+    added_distance_by_node: dict[int, int] = {}
+    touched_routes: set[int] = set()
+    for node in range(len(stops) + 1, len(tasks) + 1):
+        insertion = _cheapest_insertion(
+            node,
+            routes,
+            loads,
+            capacities,
+            demands,
+            distance_matrix,
+            time_matrix,
+            service_times,
+            time_windows,
+            route_start_s,
+            depot_nodes,
+        )
+        if insertion is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "No feasible insertion for task", "task_uuid": tasks[node - 1].uuid},
+            )
+        added_distance_by_node[node], route_index, position = insertion
+        routes[route_index].insert(position, node)
+        loads[route_index] += demands[node]
+        touched_routes.add(route_index)
+
+    if repair and not has_time_windows(time_windows):
+        search = LocalSearch(
+            distance_matrix,
+            demands,
+            capacities,
+            build_neighbour_lists(distance_matrix, locations, customers=customer_nodes(len(locations), depot_nodes)),
+            routes,
+            perf_counter() + INSERTION_REPAIR_TIME_BUDGET_S,
+            starts=depot_nodes,
+            ends=depot_nodes,
+        )
+        routes = search.improve_routes(sorted(touched_routes))
+
+    now = utc_now()
+    insertions: list[TaskInsertionPayload] = []
+    try:
+        for route_index in sorted(touched_routes):
+            route, _ = planned_routes[route_index]
+            route_nodes = routes[route_index]
+            offset = len(route_nodes) + 10
+            for idx, node in enumerate(route_nodes, start=1):
+                if node in route_task_by_node:
+                    route_task = route_task_by_node[node]
+                    route_task.sequence_order = idx + offset
+                    session.add(route_task)
+
+            session.flush()
+
+            route_task_models: list[RouteTaskModel] = []
+            for idx, node in enumerate(route_nodes, start=1):
+                route_task = route_task_by_node.get(node)
+                if route_task is None:
+                    route_task = RouteTaskModel(
+                        tenant_id=office.tenant_id,
+                        route_uuid=route.uuid,
+                        task_uuid=tasks[node - 1].uuid,
+                        sequence_order=idx,
+                        status="pending",
+                        created_at=now,
+                    )
+                    insertions.append(TaskInsertionPayload(tasks[node - 1].uuid, route.uuid, idx, added_distance_by_node[node]))
+                route_task.sequence_order = idx
+                route_task_models.append(route_task)
+                session.add(route_task)
+
+            path = [depot_nodes[route_index], *route_nodes, depot_nodes[route_index]]
+            plan = VehicleRoutePlan(
+                vehicle_index=route_index,
+                task_indices=[node - 1 for node in route_nodes],
+                distance_m=sum(distance_matrix[origin][destination] for origin, destination in zip(path, path[1:])),
+                total_load=loads[route_index],
+            )
+            plan.arrivals_s, plan.departures_s, plan.duration_s = schedule_route(
+                route_nodes, time_matrix, service_times, time_windows, route_start_s, path[0], path[-1]
+            )
+            _apply_route_schedule(route, route_task_models, plan, now)
+            route.total_tasks = len(route_nodes)
+            route.total_load = plan.total_load
+            route.total_distance_m = plan.distance_m
+            route.updated_at = now
+            session.add(route)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    order = {task_uuid: position for position, task_uuid in enumerate(task_uuids)}
+    return sorted(insertions, key=lambda insertion: order[insertion.task_uuid])
+
+
+@dataclass
+class TaskMovePayload:
+    task_uuid: str
+    from_route_uuid: str
+    to_route_uuid: str
+    sequence_order: int
+
+
+@dataclass
+class RebalanceResult:
+    moves: list[TaskMovePayload]
+    route_uuids: list[str]
+    before_distance_m: int
+    after_distance_m: int
+
+
+def rebalance_routes(
+    session: Session,
+    service_date: date,
+    office_uuid: str,
+    time_budget_s: float | None = None,
+) -> RebalanceResult:
+    office = session.exec(_office_query(office_uuid)).first()
+    if office is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Office not found")
+    _validate_office_coordinates(office)
+
+    planned_routes = _planned_routes(session, office, service_date)
+    if not planned_routes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No planned routes available for rebalancing")
+
+    route_index_by_uuid = {route.uuid: route_index for route_index, (route, _) in enumerate(planned_routes)}
+    stops = _route_stops(session, list(route_index_by_uuid))
+    tasks = [task for _, task in stops]
+    _validate_tasks_for_planning(tasks)
+    problem, depot_nodes = _day_problem(office, tasks, planned_routes, service_date)
+    # The inter-route moves only check capacity, so windowed days would need a scheduling-aware search.
+    if has_time_windows(problem.time_windows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rebalancing is not available for routes with task time windows",
+        )
+
+    routes: list[list[int]] = [[] for _ in planned_routes]
+    for node, (route_task, _) in enumerate(stops, start=1):
+        routes[route_index_by_uuid[route_task.route_uuid]].append(node)
+    previous_slot = {node: (route_index, idx) for route_index, route_nodes in enumerate(routes) for idx, node in enumerate(route_nodes, start=1)}
+
+    locations = problem.locations
+    travel_matrix = _build_travel_matrix(locations, problem.location_keys)
+    distance_matrix = matrix_rows(travel_matrix.distances_m)
+    search = LocalSearch(
+        distance_matrix,
+        problem.demands,
+        problem.capacities,
+        build_neighbour_lists(distance_matrix, locations, customers=customer_nodes(len(locations), depot_nodes)),
+        [list(route_nodes) for route_nodes in routes],
+        perf_counter() + (time_budget_s if time_budget_s is not None else get_settings().planning_rebalance_time_budget_s),
+        starts=depot_nodes,
+        ends=depot_nodes,
+    )
+    before_distance_m = search.objective
+    balanced = search.rebalance()
+
+    moved = [
+        (node, route_index, idx)
+        for route_index, route_nodes in enumerate(balanced)
+        for idx, node in enumerate(route_nodes, start=1)
+        if previous_slot[node] != (route_index, idx)
+    ]
+    touched_routes = sorted({route_index for _, route_index, _ in moved} | {previous_slot[node][0] for node, _, _ in moved})
+    result = RebalanceResult(
+        moves=[
+            TaskMovePayload(
+                task_uuid=tasks[node - 1].uuid,
+                from_route_uuid=planned_routes[previous_slot[node][0]][0].uuid,
+                to_route_uuid=planned_routes[route_index][0].uuid,
+                sequence_order=idx,
+            )
+            for node, route_index, idx in moved
+        ],
+        route_uuids=[planned_routes[route_index][0].uuid for route_index in touched_routes],
+        before_distance_m=before_distance_m,
+        after_distance_m=search.objective,
+    )
+    if not moved:
+        return result
+
+    time_matrix = matrix_rows(travel_matrix.durations_s)
+    now = utc_now()
+    try:
+        # Park moved rows above every live sequence number first so the unique (route, sequence) pair holds.
+        offset = len(stops) + 10
+        for idx, (node, route_index, _) in enumerate(moved, start=1):
+            route_task = stops[node - 1][0]
+            route_task.route_uuid = planned_routes[route_index][0].uuid
+            route_task.sequence_order = offset + idx
+            route_task.updated_at = now
+            session.add(route_task)
 
         session.flush()
 
-        for idx, task_uuid in enumerate(ordered_task_uuids, start=1):
-            model = by_task_uuid[task_uuid]
-            model.sequence_order = idx
-            model.updated_at = now
-            session.add(model)
-
-        route.total_tasks = len(ordered_task_uuids)
-        route.total_load = sum(task.load_units for task in tasks)
-        route.total_distance_m = plan.distance_m
-        route.updated_at = now
-        session.add(route)
+        for node, _, idx in moved:
+            route_task = stops[node - 1][0]
+            route_task.sequence_order = idx
+            session.add(route_task)
+
+        for route_index in touched_routes:
+            route, _ = planned_routes[route_index]
+            route_nodes = balanced[route_index]
+            path = [depot_nodes[route_index], *route_nodes, depot_nodes[route_index]]
+            plan = VehicleRoutePlan(
+                vehicle_index=route_index,
+                task_indices=[node - 1 for node in route_nodes],
+                distance_m=sum(distance_matrix[origin][destination] for origin, destination in zip(path, path[1:])),
+                total_load=sum(problem.demands[node] for node in route_nodes),
+            )
+            plan.arrivals_s, plan.departures_s, plan.duration_s = schedule_route(
+                route_nodes, time_matrix, problem.service_times, None, problem.route_start_s, path[0], path[-1]
+            )
+            route_task_models = [stops[node - 1][0] for node in route_nodes]
+            _apply_route_schedule(route, route_task_models, plan, now)
+            session.add_all(route_task_models)
+            route.total_tasks = len(route_nodes)
+            route.total_load = plan.total_load
+            route.total_distance_m = plan.distance_m
+            route.updated_at = now
+            session.add(route)
         session.commit()
     except Exception:
         session.rollback()
         raise
 
-    return _route_detail(session, route_uuid)
+    return result
 
 
 def reorder_route_tasks(session: Session, route_uuid: str, ordered_task_uuids: list[str]) -> RouteDetailPayload:
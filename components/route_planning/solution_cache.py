@@ -0,0 +1,174 @@
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from bases.platform.config import get_settings
+from components.route_planning.ortools_vrp_solver import SolverStats, VehicleRoutePlan, VrpSolution
+
+SOLUTION_KEY_VERSION = 1
+
+
+@dataclass
+class SolutionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+def solution_key(**instance) -> str:
+    payload = json.dumps({"version": SOLUTION_KEY_VERSION, **instance}, sort_keys=True, separators=(",", ":"), default=list)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _dump_solution(solution: VrpSolution) -> str:
+    return json.dumps(dataclasses.asdict(solution), separators=(",", ":"))
+
+
+def _load_solution(payload: str) -> VrpSolution:
+    data = json.loads(payload)
+    stats = SolverStats(**data["stats"]) if data.get("stats") else None
+    if stats is not None:
+        stats.cached = True
+    return VrpSolution(
+        routes=[VehicleRoutePlan(**route) for route in data["routes"]],
+        stats=stats,
+        dropped_task_indices=data.get("dropped_task_indices", []),
+    )
+
+
+class MemorySolutionStore:
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.stats = SolutionCacheStats()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_s:
+                if entry is not None:
+                    del self._entries[key]
+                    self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def put(self, key: str, payload: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), payload)
+            self._entries.move_to_end(key)
+            self.stats.writes += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+
+class DiskSolutionStore:
+    def __init__(self, path: str, max_entries: int, ttl_s: float) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.stats = SolutionCacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS solution_entries (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_solution_entries_last_used_at ON solution_entries (last_used_at)")
+        self._connection.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT payload, created_at FROM solution_entries WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_s:
+                if row is not None:
+                    self._connection.execute("DELETE FROM solution_entries WHERE key = ?", (key,))
+                    self._connection.commit()
+                    self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+            self._connection.execute("UPDATE solution_entries SET last_used_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.stats.hits += 1
+            return row[0]
+
+    def put(self, key: str, payload: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO solution_entries (key, payload, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self.stats.writes += 1
+            expired = self._connection.execute("DELETE FROM solution_entries WHERE created_at < ?", (now - self.ttl_s,)).rowcount
+            overflow = self._connection.execute(
+                "DELETE FROM solution_entries WHERE key IN "
+                "(SELECT key FROM solution_entries ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self.stats.evictions += expired + overflow
+            self._connection.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM solution_entries").fetchone()[0]
+
+
+class SolutionCache:
+    def __init__(self, local: MemorySolutionStore, shared: DiskSolutionStore | None = None) -> None:
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str) -> VrpSolution | None:
+        payload = self.local.get(key)
+        if payload is None and self.shared is not None:
+            payload = self.shared.get(key)
+            if payload is not None:
+                self.local.put(key, payload)
+        return _load_solution(payload) if payload is not None else None
+
+    def put(self, key: str, solution: VrpSolution) -> None:
+        if not solution.routes:
+            return
+        payload = _dump_solution(solution)
+        self.local.put(key, payload)
+        if self.shared is not None:
+            self.shared.put(key, payload)
+
+
+@lru_cache
+def get_solution_cache() -> SolutionCache | None:
+    settings = get_settings()
+    if not settings.planning_solution_cache_enabled:
+        return None
+    local = MemorySolutionStore(settings.planning_solution_cache_max_entries, settings.planning_solution_cache_ttl_s)
+    shared = None
+    if settings.planning_solution_cache_path:
+        shared = DiskSolutionStore(
+            settings.planning_solution_cache_path,
+            settings.planning_solution_cache_max_entries,
+            settings.planning_solution_cache_ttl_s,
+        )
+    return SolutionCache(local, shared)
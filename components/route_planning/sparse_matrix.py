@@ -0,0 +1,77 @@
+from collections.abc import Iterator
+
+from components.route_planning.fallback_heuristic import Location, SpatialGrid
+from components.route_planning.haversine_matrix import haversine_distance_m
+
+DEFAULT_SPARSE_NEIGHBOURS = 32
+
+
+class SparseRow:
+    __slots__ = ("matrix", "origin")
+
+    def __init__(self, matrix: "SparseDistanceMatrix", origin: int) -> None:
+        self.matrix = matrix
+        self.origin = origin
+
+    def __getitem__(self, destination: int) -> int:
+        return self.matrix.cost(self.origin, destination)
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+
+class SparseDistanceMatrix:
+    """Row-indexable stand-in for a dense matrix that stores only each node's nearest neighbours.
+
+    Pairs outside the neighbourhood are computed on demand and never stored, so memory grows with
+    ``len(locations) * neighbour_count`` instead of quadratically.
+    """
+
+    def __init__(
+        self,
+        locations: list[Location],
+        neighbour_count: int = DEFAULT_SPARSE_NEIGHBOURS,
+        scale: float = 1.0,
+        neighbours: list[list[int]] | None = None,
+        known: list[dict[int, int]] | None = None,
+    ) -> None:
+        self.locations = locations
+        self.scale = scale
+        if neighbours is None or known is None:
+            neighbours, known = _nearest_neighbours(locations, neighbour_count)
+        self.neighbours = neighbours
+        self._known = known
+
+    def cost(self, origin: int, destination: int) -> int:
+        if origin == destination:
+            return 0
+        distance_m = self._known[origin].get(destination)
+        if distance_m is None:
+            distance_m = haversine_distance_m(*self.locations[origin], *self.locations[destination])
+        return distance_m if self.scale == 1.0 else int(round(distance_m * self.scale))
+
+    def scaled(self, factor: float) -> "SparseDistanceMatrix":
+        return SparseDistanceMatrix(self.locations, scale=self.scale * factor, neighbours=self.neighbours, known=self._known)
+
+    def __getitem__(self, origin: int) -> SparseRow:
+        return SparseRow(self, origin)
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def __iter__(self) -> Iterator[SparseRow]:
+        return (SparseRow(self, origin) for origin in range(len(self.locations)))
+
+
+def _nearest_neighbours(locations: list[Location], neighbour_count: int) -> tuple[list[list[int]], list[dict[int, int]]]:
+    size = len(locations)
+    count = min(neighbour_count, max(size - 1, 0))
+    grid = SpatialGrid(locations, range(size))
+    neighbours: list[list[int]] = []
+    known: list[dict[int, int]] = []
+    for node, location in enumerate(locations):
+        candidates = grid.k_nearest(location, lambda candidate: candidate != node, limit=count) if count else []
+        distances = sorted((haversine_distance_m(*location, *locations[candidate]), candidate) for candidate in candidates)[:count]
+        neighbours.append([candidate for _, candidate in distances])
+        known.append({candidate: distance_m for distance_m, candidate in distances})
+    return neighbours, known
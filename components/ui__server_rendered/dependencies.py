@@ -4,6 +4,7 @@ from pathlib import Path
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
 
+from bases.platform.config import get_settings
 from components.ui__server_rendered.i18n import build_url, normalize_locale, translate
 
 
@@ -17,5 +18,5 @@ def get_templates() -> Jinja2Templates:
     templates.env.globals["t"] = translate
     templates.env.globals["url_with_lang"] = build_url
     templates.env.globals["nominatim_base_url"] = os.getenv("NOMINATIM_BASE_URL", "https://nominatim.ingeniouskey.com")
-    templates.env.globals["osrm_base_url"] = os.getenv("OSRM_BASE_URL", "https://osrm.ingeniouskey.com")
+    templates.env.globals["osrm_base_url"] = get_settings().osrm_base_url
     return templates
@@ -16,6 +16,7 @@ TRANSLATIONS = {
             "english": "English",
             "loading": "Loading...",
             "no_results": "No results",
+            "page": "Page {page}",
         },
         "menu": {
             "dashboard": "Dashboard",
@@ -145,6 +146,10 @@ TRANSLATIONS = {
             "select_office": "Select an office",
             "generate": "Generate Routes",
             "generated": "Routes generated successfully",
+            "stop_search": "Stop Search",
+            "best_distance_m": "Best distance so far (m)",
+            "elapsed_s": "Elapsed (s)",
+            "generation_cancelled": "Route generation was cancelled",
             "view_route": "View Route",
             "total_tasks": "Tasks",
             "total_load": "Load",
@@ -255,6 +260,7 @@ TRANSLATIONS = {
             "english": "Inglés",
             "loading": "Cargando...",
             "no_results": "Sin resultados",
+            "page": "Página {page}",
         },
         "menu": {
             "dashboard": "Panel",
@@ -384,6 +390,10 @@ TRANSLATIONS = {
             "select_office": "Selecciona una oficina",
             "generate": "Generar rutas",
             "generated": "Rutas generadas correctamente",
+            "stop_search": "Detener búsqueda",
+            "best_distance_m": "Mejor distancia hasta ahora (m)",
+            "elapsed_s": "Tiempo transcurrido (s)",
+            "generation_cancelled": "La generación de rutas fue cancelada",
             "view_route": "Ver ruta",
             "total_tasks": "Tareas",
             "total_load": "Carga",
@@ -3,20 +3,28 @@ from math import ceil
 
 from pydantic import ValidationError
 
+from bases.platform.pagination import ListCount
 from components.api__fastapi.schemas.offices.base import OfficeCreate, OfficeUpdate
 
 
-def build_pagination(page: int, page_size: int, total: int) -> dict[str, int]:
-    total_pages = max(1, ceil(total / page_size)) if page_size else 1
+def build_pagination(page: int, page_size: int, count: ListCount) -> dict[str, int | bool | None]:
+    total_pages = None
+    # An estimated total only feeds the "~N" label; pages stay open-ended like an uncounted list,
+    # unless everything fit on the first page.
+    if count.strategy == "exact" and count.total is not None:
+        total_pages = max(1, ceil(count.total / page_size), page + (1 if count.has_next else 0)) if page_size else 1
+    elif page == 1 and not count.has_next:
+        total_pages = 1
     return {
         "page": page,
         "page_size": page_size,
-        "total": total,
+        "total": count.total,
+        "estimated": count.strategy == "estimated",
         "total_pages": total_pages,
         "has_prev": page > 1,
-        "has_next": page < total_pages,
+        "has_next": count.has_next,
         "prev_page": max(1, page - 1),
-        "next_page": min(total_pages, page + 1),
+        "next_page": page + 1 if count.has_next else page,
     }
 
 
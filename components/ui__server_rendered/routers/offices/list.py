@@ -21,13 +21,14 @@ def list_offices_ui(
     lang: str = Depends(get_locale),
     templates: Jinja2Templates = Depends(get_templates),
 ):
-    items, total = list_offices(
+    items, list_count = list_offices(
         repository=repository,
         page=params.page,
         page_size=params.page_size,
         search=params.search,
         sort=params.sort,
         order=params.order,
+        count="estimated",
     )
     context = {
         "request": request,
@@ -36,7 +37,7 @@ def list_offices_ui(
         "search": params.search or "",
         "sort": params.sort,
         "order": params.order,
-        "pagination": build_pagination(page=params.page, page_size=params.page_size, total=total),
+        "pagination": build_pagination(page=params.page, page_size=params.page_size, count=list_count),
         "lang": lang,
     }
 
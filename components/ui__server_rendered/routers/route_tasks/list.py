@@ -24,8 +24,8 @@ def list_route_tasks_ui(
     sort = request.query_params.get("sort", "sequence_order")
     order = request.query_params.get("order", "asc")
 
-    items, total = list_route_tasks(repository=repository, page=page, page_size=page_size, search=search, sort=sort, order=order)
-    pagination = build_pagination(total=total, page=page, page_size=page_size)
+    items, list_count = list_route_tasks(repository=repository, page=page, page_size=page_size, search=search, sort=sort, order=order, count="estimated")
+    pagination = build_pagination(page=page, page_size=page_size, count=list_count)
     context = {
         "request": request,
         "title": translate(lang, "route_tasks.title"),
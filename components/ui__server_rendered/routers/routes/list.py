@@ -21,7 +21,7 @@ def list_routes_ui(
     lang: str = Depends(get_locale),
     templates: Jinja2Templates = Depends(get_templates),
 ):
-    items, total = list_routes(repository=repository, page=params.page, page_size=params.page_size, search=params.search, sort=params.sort, order=params.order)
+    items, list_count = list_routes(repository=repository, page=params.page, page_size=params.page_size, search=params.search, sort=params.sort, order=params.order, count="estimated")
     context = {
         "request": request,
         "title": translate(lang, "routes.title"),
@@ -29,7 +29,7 @@ def list_routes_ui(
         "search": params.search or "",
         "sort": params.sort,
         "order": params.order,
-        "pagination": build_pagination(page=params.page, page_size=params.page_size, total=total),
+        "pagination": build_pagination(page=params.page, page_size=params.page_size, count=list_count),
         "lang": lang,
     }
     if request.headers.get("HX-Request") == "true":
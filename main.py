@@ -1,17 +1,32 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from bases.platform.config import get_settings
+from bases.platform.db import engine
 from components.api__fastapi.routers.offices import router as offices_router
 from components.api__fastapi.routers.routes import router as routes_router
 from components.api__fastapi.routers.route_tasks import router as route_tasks_router
 from components.api__fastapi.routers.tasks import router as tasks_router
 from components.api__fastapi.routers.vehicles import router as vehicles_router
+from components.route_planning.planning_jobs import recover_orphaned_planning_jobs
 from components.ui__server_rendered.routers import router as ui_router
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # In-process jobs die with the previous API process, so any job still marked running is an orphan.
+    if settings.planning_job_backend == "local":
+        recover_orphaned_planning_jobs(engine)
+    yield
+
+
 app = FastAPI(
     title="Bokkapro Platform",
+    lifespan=lifespan,
     docs_url="/docs" if settings.swagger_ui_enabled else None,
     redoc_url="/redoc" if settings.swagger_ui_enabled else None,
     openapi_url="/openapi.json",
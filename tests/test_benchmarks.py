@@ -0,0 +1,75 @@
+import json
+import resource
+
+from components.route_planning.benchmarks import generate_instance, load_cvrplib_instance, main, run_instance
+
+TINY_CVRP = """NAME : tiny-n5-k2
+COMMENT : (toy instance, Optimal value: 40)
+TYPE : CVRP
+DIMENSION : 5
+EDGE_WEIGHT_TYPE : EUC_2D
+CAPACITY : 10
+NODE_COORD_SECTION
+1 0 0
+2 0 10
+3 0 -10
+4 10 0
+5 -10 0
+DEMAND_SECTION
+1 0
+2 5
+3 5
+4 5
+5 5
+DEPOT_SECTION
+1
+-1
+EOF
+"""
+
+
+def test_generated_instances_are_seeded_and_sized() -> None:
+    first = generate_instance("clustered", 120, 4, seed=1)
+
+    assert first == generate_instance("clustered", 120, 4, seed=1)
+    assert first != generate_instance("clustered", 120, 4, seed=2)
+    assert len(first.locations) == len(first.demands) == 121
+    assert len(first.vehicle_capacities) == 4
+    assert sum(first.vehicle_capacities) >= sum(first.demands)
+
+
+def test_cvrplib_loader_reports_gap_to_best_known(tmp_path) -> None:
+    path = tmp_path / "tiny-n5-k2.vrp"
+    path.write_text(TINY_CVRP)
+
+    instance = load_cvrplib_instance(path)
+    records = run_instance(instance, solvers=("fallback",), heuristic_time_budget_s=0.1)
+
+    assert instance.vehicle_capacities == [10, 10]
+    assert instance.distance_matrix[1][2] == 20
+    assert records[0]["best_known"] == 40
+    assert records[0]["feasible"] is True
+    assert records[0]["gap_pct"] == round((records[0]["objective"] - 40) * 100 / 40, 2)
+
+
+def test_cli_writes_machine_readable_report(tmp_path) -> None:
+    output = tmp_path / "bench.json"
+
+    main(["--sizes", "10", "--kinds", "uniform", "--stops-per-vehicle", "5", "--time-limit", "0.5", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    phases = {record["phase"] for record in report["results"]}
+    assert {"matrix", "fallback"} <= phases
+    assert all("wall_ms" in record and "peak_rss_mb" in record for record in report["results"])
+
+
+def test_peak_memory_is_measured_per_phase(tmp_path) -> None:
+    path = tmp_path / "tiny-n5-k2.vrp"
+    path.write_text(TINY_CVRP)
+    ballast = b"x" * (256 * 1024 * 1024)
+    parent_peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    [record] = run_instance(load_cvrplib_instance(path), solvers=("fallback",), heuristic_time_budget_s=0.1)
+    del ballast
+
+    assert record["peak_rss_mb"] < parent_peak_mb - 200
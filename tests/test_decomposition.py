@@ -0,0 +1,58 @@
+import random
+
+from components.route_planning.decomposition import solve_decomposed, sweep_clusters
+from components.route_planning.haversine_matrix import build_distance_matrix
+from components.route_planning.matrix_providers import HaversineMatrixProvider
+from components.route_planning.ortools_vrp_solver import solve_capacitated_vrp
+from components.route_planning.route_planner_service import PlanningProblem
+
+
+def _problem(task_count: int, vehicle_count: int, capacity: int) -> PlanningProblem:
+    rng = random.Random(5)
+    locations = [(19.4, -99.1)] + [(19.4 + rng.uniform(-0.3, 0.3), -99.1 + rng.uniform(-0.3, 0.3)) for _ in range(task_count)]
+    return PlanningProblem(
+        locations=locations,
+        demands=[0] + [rng.randint(1, 3) for _ in range(task_count)],
+        capacities=[capacity] * vehicle_count,
+        service_times=[0] + [300] * task_count,
+        time_windows=[None] * (task_count + 1),
+    )
+
+
+def _heuristic_solve(problem: PlanningProblem):
+    matrix = build_distance_matrix(problem.locations)
+    return solve_capacitated_vrp(
+        matrix,
+        problem.demands,
+        problem.capacities,
+        time_matrix=matrix,
+        service_times=problem.service_times,
+        locations=problem.locations,
+        engine="heuristic",
+        heuristic_time_budget_s=0.2,
+    )
+
+
+def test_sweep_clusters_partition_tasks_and_vehicles() -> None:
+    problem = _problem(600, 12, 120)
+
+    clusters = sweep_clusters(problem.locations, problem.demands, problem.capacities, cluster_size=150)
+
+    assert len(clusters) == 4
+    assert sorted(node for cluster in clusters for node in cluster.node_indices) == list(range(1, 601))
+    assert sorted(vehicle for cluster in clusters for vehicle in cluster.vehicle_indices) == list(range(12))
+    for cluster in clusters:
+        capacity = sum(problem.capacities[vehicle] for vehicle in cluster.vehicle_indices)
+        assert sum(problem.demands[node] for node in cluster.node_indices) <= capacity
+
+
+def test_decomposed_solve_covers_every_task_within_capacity() -> None:
+    problem = _problem(600, 12, 120)
+
+    solution = solve_decomposed(problem, _heuristic_solve, HaversineMatrixProvider(speed_kmh=40), cluster_size=150)
+
+    assert sorted(index for plan in solution.routes for index in plan.task_indices) == list(range(600))
+    assert len({plan.vehicle_index for plan in solution.routes}) == len(solution.routes)
+    for plan in solution.routes:
+        assert plan.total_load == sum(problem.demands[index + 1] for index in plan.task_indices) <= 120
+        assert len(plan.arrivals_s) == len(plan.task_indices)
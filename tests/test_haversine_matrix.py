@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from components.route_planning import haversine_matrix
+from components.route_planning.haversine_matrix import (
+    _build_distance_matrix_python,
+    build_distance_matrix,
+    haversine_distance_m,
+    matrix_rows,
+)
+from components.route_planning.sparse_matrix import SparseDistanceMatrix
+
+
+def _random_locations(count: int, seed: int = 7) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(rng.uniform(-60.0, 60.0), rng.uniform(-170.0, 170.0)) for _ in range(count)]
+
+
+def test_python_matrix_is_symmetric_and_matches_scalar_distance() -> None:
+    locations = _random_locations(12)
+    matrix = _build_distance_matrix_python(locations)
+
+    for i, (lat1, lng1) in enumerate(locations):
+        assert matrix[i][i] == 0
+        for j, (lat2, lng2) in enumerate(locations):
+            assert matrix[i][j] == matrix[j][i]
+            if i != j:
+                assert matrix[i][j] == haversine_distance_m(lat1, lng1, lat2, lng2)
+
+
+@pytest.mark.skipif(not haversine_matrix.HAS_NUMPY, reason="numpy not installed")
+def test_numpy_matrix_matches_python_fallback() -> None:
+    locations = _random_locations(600) + [(10.0, 20.0), (10.0, 20.0)]
+    matrix = build_distance_matrix(locations)
+
+    assert str(matrix.dtype) == "int32"
+    assert matrix.shape == (len(locations), len(locations))
+    assert matrix_rows(matrix) == _build_distance_matrix_python(locations)
+
+
+def test_build_distance_matrix_handles_empty_and_single_location() -> None:
+    assert matrix_rows(build_distance_matrix([])) == []
+    assert matrix_rows(build_distance_matrix([(10.0, 20.0)])) == [[0]]
+
+
+def test_sparse_matrix_keeps_nearest_neighbours_and_answers_every_pair() -> None:
+    rng = random.Random(11)
+    locations = [(rng.uniform(9.5, 10.5), rng.uniform(19.5, 20.5)) for _ in range(200)]
+    dense = _build_distance_matrix_python(locations)
+    sparse = SparseDistanceMatrix(locations, neighbour_count=8)
+
+    assert matrix_rows(sparse) is sparse
+    for node in range(len(locations)):
+        expected = sorted((distance_m, other) for other, distance_m in enumerate(dense[node]) if other != node)[:8]
+        assert [dense[node][other] for other in sparse.neighbours[node]] == [distance_m for distance_m, _ in expected]
+        assert [sparse[node][other] for other in range(len(locations))] == dense[node]
+
+    durations = sparse.scaled(0.09)
+    assert durations[3][150] == round(dense[3][150] * 0.09)
+    assert durations.neighbours is sparse.neighbours
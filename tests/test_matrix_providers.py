@@ -0,0 +1,136 @@
+import random
+
+import httpx
+
+from bases.platform.config import get_settings
+from components.route_planning.haversine_matrix import build_distance_matrix, matrix_rows
+from components.route_planning.matrix_cache import MatrixCacheStore
+from components.route_planning.matrix_providers import (
+    CachedTravelMatrixProvider,
+    HaversineMatrixProvider,
+    LocalRoadSpeedModel,
+    OsrmTableMatrixProvider,
+    get_matrix_provider,
+    local_osrm_transport,
+)
+
+
+def _locations(count: int) -> list[tuple[float, float]]:
+    rng = random.Random(3)
+    return [(19.4 + rng.uniform(-0.2, 0.2), -99.1 + rng.uniform(-0.2, 0.2)) for _ in range(count)]
+
+
+def test_haversine_provider_matches_distance_matrix() -> None:
+    locations = _locations(6)
+    matrix = HaversineMatrixProvider(speed_kmh=36).build(locations)
+
+    distances = matrix_rows(matrix.distances_m)
+    assert distances == matrix_rows(build_distance_matrix(locations))
+    assert matrix_rows(matrix.durations_s) == [[int(round(distance_m / 10)) for distance_m in row] for row in distances]
+
+
+def test_osrm_provider_stitches_tiles_within_table_size_limit() -> None:
+    locations = _locations(11)
+    speed_model = LocalRoadSpeedModel()
+    requests: list[httpx.Request] = []
+    local_transport = local_osrm_transport(speed_model)
+
+    def recording_handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return local_transport.handle_request(request)
+
+    provider = OsrmTableMatrixProvider(
+        "http://osrm.local",
+        max_table_size=6,
+        max_concurrency=3,
+        transport=httpx.MockTransport(recording_handler),
+    )
+    matrix = provider.build(locations)
+
+    assert len(requests) == 16
+    for request in requests:
+        coordinates = request.url.path.rsplit("/", 1)[-1].split(";")
+        assert len(coordinates) <= 6
+
+    for i, origin in enumerate(locations):
+        for j, destination in enumerate(locations):
+            if i == j:
+                assert matrix.distances_m[i][j] == 0
+                continue
+            distance_m, duration_s = speed_model.leg(origin, destination)
+            assert matrix.distances_m[i][j] == int(round(distance_m))
+            assert matrix.durations_s[i][j] == int(round(duration_s))
+
+
+def test_cached_provider_only_fetches_missing_pairs(tmp_path) -> None:
+    store = MatrixCacheStore(str(tmp_path / "matrix_cache.db"), max_entries=10000)
+    calls: list[tuple[list[int], list[int]]] = []
+
+    class _RecordingProvider(HaversineMatrixProvider):
+        def build_block(self, locations, sources, destinations):
+            calls.append((list(sources), list(destinations)))
+            return super().build_block(locations, sources, destinations)
+
+    provider = CachedTravelMatrixProvider(_RecordingProvider(speed_kmh=40), store)
+    locations = _locations(4)
+
+    first = provider.build(locations)
+    assert (first.cache_hits, first.cache_misses) == (0, 12)
+
+    second = provider.build(locations + [(19.5, -99.0)])
+    assert (second.cache_hits, second.cache_misses) == (12, 8)
+    assert sorted(calls[1:]) == [([0, 1, 2, 3], [4]), ([4], [0, 1, 2, 3, 4])]
+    assert matrix_rows(second.distances_m)[:4] == [row + [second.distances_m[i][4]] for i, row in enumerate(first.distances_m)]
+    assert (store.stats.hits, store.stats.misses) == (12, 20)
+    assert store.stats.writes == 20
+
+    many = _locations(50)
+    provider.build(many)
+    fetched_before = sum(len(sources) * len(destinations) for sources, destinations in calls)
+    grown = provider.build(many + [(19.6, -99.2)])
+    fetched = sum(len(sources) * len(destinations) for sources, destinations in calls) - fetched_before
+    assert grown.cache_misses == 100
+    assert fetched == 101
+
+    keyed = provider.build(locations[:2], location_keys=["place:a", "place:b"])
+    assert keyed.cache_misses == 2
+
+
+def test_cache_store_evicts_down_to_size_limit(tmp_path) -> None:
+    store = MatrixCacheStore(str(tmp_path / "matrix_cache.db"), max_entries=10)
+    for i in range(15):
+        store.put_many("osrm", {(f"o{i}", f"d{i}"): (i, i)})
+
+    assert store.size() <= 10
+    assert store.stats.evictions >= 5
+    assert store.get_many("osrm", ["o14", "d14"]) == {("o14", "d14"): (14, 14)}
+
+
+def test_cache_store_upserts_single_legs(tmp_path) -> None:
+    path = str(tmp_path / "matrix_cache.db")
+    first, second = MatrixCacheStore(path, max_entries=1000), MatrixCacheStore(path, max_entries=1000)
+    first.put_many("osrm", {("a", "b"): (1, 1)})
+    second.put_many("osrm", {("a", "c"): (2, 2)})
+    first.put_many("osrm", {("a", "b"): (3, 3)})
+
+    assert first.get_many("osrm", ["a", "b", "c"]) == {("a", "b"): (3, 3), ("a", "c"): (2, 2)}
+    assert first.get_many("osrm", ["a", "c"]) == {("a", "c"): (2, 2)}
+
+
+def test_matrix_cache_only_wraps_network_providers(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("PLANNING_MATRIX_CACHE_PATH", str(tmp_path / "matrix_cache.db"))
+    try:
+        for provider_name, expected in (("haversine", HaversineMatrixProvider), ("local", CachedTravelMatrixProvider)):
+            monkeypatch.setenv("PLANNING_MATRIX_PROVIDER", provider_name)
+            get_settings.cache_clear()
+            get_matrix_provider.cache_clear()
+            assert type(get_matrix_provider()) is expected
+        assert get_matrix_provider().name == "osrm-local"
+        assert get_matrix_provider().cache_namespace == "osrm-local:https://osrm.ingeniouskey.com/driving:40kmh"
+        monkeypatch.setenv("PLANNING_AVERAGE_SPEED_KMH", "30")
+        get_settings.cache_clear()
+        get_matrix_provider.cache_clear()
+        assert get_matrix_provider().cache_namespace == "osrm-local:https://osrm.ingeniouskey.com/driving:30kmh"
+    finally:
+        get_settings.cache_clear()
+        get_matrix_provider.cache_clear()
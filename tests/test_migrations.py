@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import subprocess
 import sys
 from pathlib import Path
@@ -20,3 +21,7 @@ def test_migration_upgrade_head(tmp_path: Path) -> None:
 
     assert result.returncode == 0, result.stderr
     assert db_path.exists()
+
+    with sqlite3.connect(db_path) as connection:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"offices_search", "vehicles_search", "tasks_search", "routes_search", "route_tasks_search"} <= tables
@@ -0,0 +1,307 @@
+import random
+
+import pytest
+
+from components.route_planning import ortools_vrp_solver
+from components.route_planning.fallback_heuristic import build_neighbour_lists, construct_routes, solve_with_heuristic
+from components.route_planning.haversine_matrix import build_distance_matrix, matrix_rows
+from components.route_planning.ortools_vrp_solver import SolverBudget, solve_capacitated_vrp
+from components.route_planning.sparse_matrix import SparseDistanceMatrix
+
+LOCATIONS = [(10.0, 20.0), (10.1, 20.1), (10.2, 19.9), (9.9, 20.2), (10.05, 19.8), (9.8, 19.95)]
+DEMANDS = [0, 3, 4, 2, 5, 1]
+
+
+@pytest.mark.skipif(not ortools_vrp_solver.HAS_ORTOOLS, reason="ortools not installed")
+def test_native_and_callback_transit_modes_agree() -> None:
+    matrix = build_distance_matrix(LOCATIONS)
+
+    native = solve_capacitated_vrp(matrix, DEMANDS, [8, 8], time_limit_seconds=1, transit_mode="native")
+    callback = solve_capacitated_vrp(matrix, DEMANDS, [8, 8], time_limit_seconds=1, transit_mode="callback")
+
+    for solution in (native, callback):
+        assert sorted(index for plan in solution.routes for index in plan.task_indices) == [0, 1, 2, 3, 4]
+        assert all(plan.total_load <= 8 for plan in solution.routes)
+    assert sum(plan.distance_m for plan in native.routes) == sum(plan.distance_m for plan in callback.routes)
+
+
+@pytest.mark.skipif(not ortools_vrp_solver.HAS_ORTOOLS, reason="ortools not installed")
+def test_time_windows_drive_stop_order_and_schedule() -> None:
+    locations = [(10.0, 20.0), (10.01, 20.0), (10.5, 20.0)]
+    matrix = build_distance_matrix(locations)
+    time_matrix = [[0, 60, 600], [60, 0, 540], [600, 540, 0]]
+    service_times = [0, 300, 300]
+    time_windows = [None, (36000, 37800), (28800, 30600)]
+
+    solution = solve_capacitated_vrp(
+        matrix,
+        [0, 1, 1],
+        [10],
+        time_limit_seconds=1,
+        time_matrix=time_matrix,
+        service_times=service_times,
+        time_windows=time_windows,
+    )
+
+    assert len(solution.routes) == 1
+    plan = solution.routes[0]
+    assert plan.task_indices == [1, 0]
+    assert 28800 <= plan.arrivals_s[0] <= 30600
+    assert 36000 <= plan.arrivals_s[1] <= 37800
+    assert plan.departures_s == [arrival + 300 for arrival in plan.arrivals_s]
+    assert plan.duration_s is not None and plan.duration_s >= plan.departures_s[-1] - plan.arrivals_s[0]
+
+
+@pytest.mark.skipif(not ortools_vrp_solver.HAS_ORTOOLS, reason="ortools not installed")
+def test_vehicles_never_leave_before_the_route_start() -> None:
+    # Stop 0 closes before the day starts, so it can only be dropped; stop 1 is served after the start.
+    locations = [(10.0, 20.0), (10.01, 20.0), (10.02, 20.0)]
+
+    solution = solve_capacitated_vrp(
+        build_distance_matrix(locations),
+        [0, 1, 1],
+        [10, 10],
+        time_limit_seconds=1,
+        time_matrix=[[0, 60, 120], [60, 0, 60], [120, 60, 0]],
+        service_times=[0, 300, 300],
+        time_windows=[None, (28800, 30000), (28800, 36000)],
+        route_start_s=32400,
+        drop_penalties=[0, 1_000_000, 1_000_000],
+    )
+
+    assert solution.dropped_task_indices == [0]
+    [arrival] = [arrival for plan in solution.routes for arrival in plan.arrivals_s]
+    assert arrival >= 32400 + 120
+
+
+def test_schedule_without_windows_accumulates_travel_and_service() -> None:
+    arrivals, departures, duration = ortools_vrp_solver.schedule_route(
+        [2, 1], [[0, 100, 200], [100, 0, 50], [200, 50, 0]], [0, 60, 30], route_start_s=1000
+    )
+
+    assert arrivals == [1200, 1280]
+    assert departures == [1230, 1340]
+    assert duration == 440
+
+
+def _path_cost(matrix, route) -> int:
+    path = [0, *route, 0]
+    return sum(matrix[origin][destination] for origin, destination in zip(path, path[1:]))
+
+
+def test_heuristic_engine_covers_all_stops_within_capacity() -> None:
+    rng = random.Random(7)
+    locations = [(19.4, -99.1)] + [(19.4 + rng.uniform(-0.3, 0.3), -99.1 + rng.uniform(-0.3, 0.3)) for _ in range(300)]
+    demands = [0] + [rng.randint(1, 4) for _ in range(300)]
+    matrix = build_distance_matrix(locations)
+
+    solution = solve_capacitated_vrp(
+        matrix, demands, [80] * 12, engine="heuristic", locations=locations, heuristic_time_budget_s=0.5
+    )
+
+    assert sorted(index for plan in solution.routes for index in plan.task_indices) == list(range(300))
+    assert all(plan.total_load <= 80 for plan in solution.routes)
+    rows = matrix_rows(matrix)
+    assert all(plan.distance_m == _path_cost(rows, [index + 1 for index in plan.task_indices]) for plan in solution.routes)
+
+
+def test_local_search_improves_construction() -> None:
+    rng = random.Random(11)
+    locations = [(0.0, 0.0)] + [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(120)]
+    matrix = matrix_rows(build_distance_matrix(locations))
+    demands = [0] + [1] * 120
+    neighbours = build_neighbour_lists(matrix, locations)
+
+    routes, remaining = construct_routes(matrix, demands, [40, 40, 40], neighbours, locations)
+    constructed = sum(_path_cost(matrix, route) for route in routes)
+    improved = solve_with_heuristic(matrix, demands, [40, 40, 40], locations, time_budget_s=1)
+
+    assert not remaining
+    assert sum(_path_cost(matrix, route) for route in improved) < constructed
+
+
+def test_heuristic_reports_infeasible_capacity() -> None:
+    matrix = build_distance_matrix(LOCATIONS)
+
+    assert solve_capacitated_vrp(matrix, DEMANDS, [4, 4], engine="heuristic").routes == []
+
+
+def test_heuristic_engine_rejects_time_windows() -> None:
+    matrix = build_distance_matrix(LOCATIONS)
+
+    with pytest.raises(ValueError, match="time windows"):
+        solve_capacitated_vrp(
+            matrix,
+            DEMANDS,
+            [20],
+            engine="heuristic",
+            time_matrix=matrix,
+            time_windows=[None, (0, 3600), None, None, None, None],
+        )
+
+
+
+@pytest.mark.parametrize("engine", ["auto", "heuristic"])
+def test_warm_start_never_returns_a_worse_route(engine) -> None:
+    matrix = build_distance_matrix(LOCATIONS)
+    rows = matrix_rows(matrix)
+    seed = [4, 0, 3, 1, 2]
+
+    plan = ortools_vrp_solver.solve_single_vehicle_route(
+        matrix, DEMANDS, 20, time_limit_seconds=0.2, locations=LOCATIONS, engine=engine, initial_order=seed
+    )
+
+    assert plan is not None
+    assert sorted(plan.task_indices) == [0, 1, 2, 3, 4]
+    assert plan.distance_m <= _path_cost(rows, [index + 1 for index in seed])
+
+
+def test_budget_scales_with_size_and_respects_ceiling() -> None:
+    budget = SolverBudget(base_s=1, per_stop_s=0.01, max_s=10)
+
+    assert budget.time_limit_s(3) == pytest.approx(1.03)
+    assert budget.time_limit_s(400) == pytest.approx(5)
+    assert budget.time_limit_s(5000) == 10
+    assert SolverBudget(ceiling_s=0.3).time_limit_s(400) == 0.3
+
+
+@pytest.mark.parametrize("engine", ["auto", "heuristic"])
+def test_solution_reports_search_statistics(engine) -> None:
+    rng = random.Random(3)
+    locations = [(0.0, 0.0)] + [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(40)]
+    matrix = build_distance_matrix(locations)
+
+    solution = solve_capacitated_vrp(
+        matrix,
+        [0] + [1] * 40,
+        [20, 20, 20],
+        locations=locations,
+        engine=engine,
+        budget=SolverBudget(stall_window_s=0.2, ceiling_s=2),
+    )
+
+    stats = solution.stats
+    assert stats is not None
+    assert stats.first_solution_status == "found"
+    assert stats.final_objective == sum(plan.distance_m for plan in solution.routes)
+    assert stats.final_objective <= stats.first_objective
+    assert stats.wall_ms <= 2500
+    if stats.improving_solutions:
+        assert stats.final_status == "improved"
+
+
+@pytest.mark.parametrize("engine", ["auto", "heuristic"])
+def test_vehicles_start_and_end_at_their_own_depots(engine) -> None:
+    # Office at node 0, two stops near each vehicle yard (nodes 5 and 6).
+    locations = [(0.0, 0.0), (1.0, 0.01), (1.0, 0.02), (-1.0, 0.01), (-1.0, 0.02), (1.0, 0.0), (-1.0, 0.0)]
+    matrix = build_distance_matrix(locations)
+
+    solution = solve_capacitated_vrp(
+        matrix,
+        [0, 1, 1, 1, 1, 0, 0],
+        [4, 4],
+        time_limit_seconds=1,
+        locations=locations,
+        engine=engine,
+        vehicle_starts=[5, 6],
+        vehicle_ends=[5, 6],
+    )
+
+    routes = {plan.vehicle_index: sorted(plan.task_indices) for plan in solution.routes}
+    assert routes == {0: [0, 1], 1: [2, 3]}
+    rows = matrix_rows(matrix)
+    assert all(plan.distance_m < rows[0][5] for plan in solution.routes)
+
+
+@pytest.mark.parametrize("engine", ["ortools", "heuristic"])
+def test_sparse_matrix_plans_every_stop(engine) -> None:
+    if engine == "ortools" and not ortools_vrp_solver.HAS_ORTOOLS:
+        pytest.skip("ortools not installed")
+    rng = random.Random(5)
+    locations = [(0.0, 0.0)] + [(rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3)) for _ in range(120)]
+    sparse = SparseDistanceMatrix(locations, neighbour_count=12)
+
+    solution = solve_capacitated_vrp(
+        sparse,
+        [0] + [1] * 120,
+        [30] * 5,
+        time_matrix=sparse.scaled(0.09),
+        service_times=[0] * 121,
+        locations=locations,
+        engine=engine,
+        budget=SolverBudget(stall_window_s=0.2, ceiling_s=1),
+    )
+
+    assert sorted(index for plan in solution.routes for index in plan.task_indices) == list(range(120))
+    assert all(plan.total_load <= 30 for plan in solution.routes)
+    assert all(plan.duration_s is not None for plan in solution.routes)
+
+
+@pytest.mark.skipif(not ortools_vrp_solver.HAS_ORTOOLS, reason="ortools not installed")
+def test_auto_engine_keeps_windowed_sparse_instances_on_ortools() -> None:
+    rng = random.Random(5)
+    locations = [(0.0, 0.0)] + [(rng.uniform(-0.05, 0.05), rng.uniform(-0.05, 0.05)) for _ in range(40)]
+    sparse = SparseDistanceMatrix(locations, neighbour_count=12)
+    time_windows = [None] + [(0, 3600) if index % 2 else (3600, 7200) for index in range(40)]
+
+    solution = solve_capacitated_vrp(
+        sparse,
+        [0] + [1] * 40,
+        [20] * 4,
+        time_matrix=sparse.scaled(0.09),
+        service_times=[0] + [60] * 40,
+        time_windows=time_windows,
+        locations=locations,
+        budget=SolverBudget(stall_window_s=0.2, ceiling_s=1),
+    )
+
+    assert solution.stats.engine == "ortools"
+    assert sorted(index for plan in solution.routes for index in plan.task_indices) == list(range(40))
+    for plan in solution.routes:
+        for task_index, arrival in zip(plan.task_indices, plan.arrivals_s, strict=True):
+            window_start, window_end = time_windows[task_index + 1]
+            assert window_start <= arrival <= window_end
+
+
+@pytest.mark.parametrize("engine", ["auto", "heuristic"])
+def test_progress_reports_first_solution_and_stop_request_ends_search(engine) -> None:
+    rng = random.Random(9)
+    locations = [(0.0, 0.0)] + [(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(60)]
+    events = []
+
+    solution = solve_capacitated_vrp(
+        build_distance_matrix(locations),
+        [0] + [1] * 60,
+        [20, 20, 20],
+        time_limit_seconds=10,
+        locations=locations,
+        engine=engine,
+        heuristic_time_budget_s=10,
+        budget=SolverBudget(stall_window_s=None),
+        on_progress=events.append,
+        stop_requested=lambda: bool(events),
+    )
+
+    assert events[0].event == "first_solution"
+    assert sorted(index for route in events[0].routes for index in route) == list(range(60))
+    assert solution.stats.stop_reason == "stopped"
+    assert solution.stats.wall_ms < 5000
+    assert sorted(index for plan in solution.routes for index in plan.task_indices) == list(range(60))
+
+
+@pytest.mark.parametrize("engine", ["auto", "heuristic"])
+def test_drop_penalties_return_a_partial_plan_without_the_cheapest_stops(engine) -> None:
+    locations = [(0.0, 0.0), (0.01, 0.0), (0.02, 0.0), (0.0, 0.01), (0.0, 0.02)]
+
+    solution = solve_capacitated_vrp(
+        build_distance_matrix(locations),
+        [0, 1, 1, 1, 1],
+        [3],
+        time_limit_seconds=1,
+        locations=locations,
+        engine=engine,
+        drop_penalties=[0, 10_000_000, 1_000_000_000, 100_000_000, 1_000_000_000],
+    )
+
+    assert solution.dropped_task_indices == [0]
+    assert sorted(index for plan in solution.routes for index in plan.task_indices) == [1, 2, 3]
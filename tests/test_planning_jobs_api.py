@@ -0,0 +1,210 @@
+from collections.abc import Generator
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from bases.platform.db import get_session
+from bases.platform.time import utc_now
+from components.persistence__sqlmodel.models.office import OfficeModel
+from components.persistence__sqlmodel.models.planning_job import PlanningJobModel
+from components.persistence__sqlmodel.models.route import RouteModel
+from components.persistence__sqlmodel.models.task import TaskModel
+from components.persistence__sqlmodel.models.vehicle import VehicleModel
+from components.route_planning.planning_jobs import (
+    LocalPlanningJobBackend,
+    PlanningJobBackend,
+    QueuedPlanningJobBackend,
+    get_planning_job_backend,
+    recover_orphaned_planning_jobs,
+    run_next_planning_job,
+    run_planning_job,
+)
+from main import app
+
+
+class _IdleBackend(PlanningJobBackend):
+    def __init__(self) -> None:
+        self.submitted: list[str] = []
+
+    def submit(self, engine: Engine, job_uuid: str) -> None:
+        self.submitted.append(job_uuid)
+
+    def cancel(self, job_uuid: str) -> bool:
+        return True
+
+
+def _build_client(backend: PlanningJobBackend) -> tuple[TestClient, Session, Engine]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    def _session_override() -> Generator[Session, None, None]:
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session_override
+    app.dependency_overrides[get_planning_job_backend] = lambda: backend
+    return TestClient(app), Session(engine), engine
+
+
+def _seed_office(session: Session) -> OfficeModel:
+    office = OfficeModel(name="Main Office", storage_capacity=100, lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    session.refresh(office)
+
+    session.add(VehicleModel(office_id=office.id, name="Truck 1", max_capacity=50))
+    session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=5, address="A", lat=10.1, lng=20.1))
+    session.add(TaskModel(office_id=office.id, type="pickup", status="pending", load_units=8, address="B", lat=11.0, lng=21.0))
+    session.commit()
+    return office
+
+
+def test_generate_job_runs_in_background_and_exposes_result() -> None:
+    backend = LocalPlanningJobBackend(max_workers=1)
+    client, session, _ = _build_client(backend)
+    office = _seed_office(session)
+
+    submit_res = client.post(f"/api/routes/jobs?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert submit_res.status_code == 202
+    job_uuid = submit_res.json()["data"]["uuid"]
+
+    backend.wait(job_uuid, timeout=30)
+
+    status_res = client.get(f"/api/routes/jobs/{job_uuid}")
+    assert status_res.status_code == 200
+    assert status_res.json()["data"]["status"] == "succeeded"
+
+    result_res = client.get(f"/api/routes/jobs/{job_uuid}/result")
+    assert result_res.status_code == 200
+    routes = result_res.json()["data"]
+    assert len(routes) == 1
+    assert routes[0]["total_tasks"] == 2
+
+    events_res = client.get(f"/api/routes/jobs/{job_uuid}/events")
+    assert events_res.status_code == 200
+    assert events_res.headers["content-type"].startswith("text/event-stream")
+    assert '"status": "succeeded"' in events_res.text
+
+    backend.shutdown()
+    app.dependency_overrides.clear()
+
+
+def test_cancelled_job_is_not_executed() -> None:
+    backend = _IdleBackend()
+    client, session, engine = _build_client(backend)
+    office = _seed_office(session)
+
+    job_uuid = client.post(f"/api/routes/jobs?service_date=2026-01-05&office_uuid={office.uuid}").json()["data"]["uuid"]
+    assert backend.submitted == [job_uuid]
+
+    pending_result = client.get(f"/api/routes/jobs/{job_uuid}/result")
+    assert pending_result.status_code == 409
+
+    cancel_res = client.post(f"/api/routes/jobs/{job_uuid}/cancel")
+    assert cancel_res.status_code == 200
+    assert cancel_res.json()["data"]["status"] == "cancelled"
+
+    run_planning_job(engine, job_uuid)
+
+    assert client.get(f"/api/routes/jobs/{job_uuid}").json()["data"]["status"] == "cancelled"
+    assert client.get(f"/api/routes/jobs/{job_uuid}/result").status_code == 409
+    assert session.exec(select(RouteModel)).all() == []
+
+    app.dependency_overrides.clear()
+
+
+def test_submit_job_for_unknown_office_returns_404() -> None:
+    client, _, _ = _build_client(_IdleBackend())
+
+    res = client.post("/api/routes/jobs?service_date=2026-01-05&office_uuid=missing")
+    assert res.status_code == 404
+
+    app.dependency_overrides.clear()
+
+
+def test_stopped_job_streams_progress_and_keeps_best_solution() -> None:
+    backend = _IdleBackend()
+    client, session, engine = _build_client(backend)
+    office = _seed_office(session)
+    for index in range(30):
+        session.add(
+            TaskModel(
+                office_id=office.id,
+                type="delivery",
+                status="pending",
+                load_units=1,
+                address=f"Stop {index}",
+                lat=10.0 + (index % 6) * 0.03,
+                lng=20.0 + (index // 6) * 0.03,
+            )
+        )
+    session.commit()
+
+    job_uuid = client.post(f"/api/routes/jobs?service_date=2026-01-06&office_uuid={office.uuid}").json()["data"]["uuid"]
+    stop_res = client.post(f"/api/routes/jobs/{job_uuid}/stop")
+    assert stop_res.status_code == 200
+    assert stop_res.json()["data"]["stop_requested"] is True
+
+    run_planning_job(engine, job_uuid)
+
+    job = client.get(f"/api/routes/jobs/{job_uuid}").json()["data"]
+    assert job["status"] == "succeeded"
+    assert job["result"]["solver"]["stop_reason"] == "stopped"
+    assert job["progress"]["event"] == "first_solution"
+    assert sum(route["total_tasks"] for route in job["progress"]["routes"]) == 32
+
+    routes = client.get(f"/api/routes/jobs/{job_uuid}/result").json()["data"]
+    assert sum(route["total_tasks"] for route in routes) == 32
+
+    events = client.get(f"/api/routes/jobs/{job_uuid}/events").text
+    assert "event: progress" in events
+    assert '"first_solution"' in events
+
+    app.dependency_overrides.clear()
+
+
+def test_worker_claims_queued_jobs_in_submission_order() -> None:
+    client, session, engine = _build_client(QueuedPlanningJobBackend())
+    office = _seed_office(session)
+
+    job_uuids = [
+        client.post(f"/api/routes/jobs?service_date=2026-01-0{day}&office_uuid={office.uuid}").json()["data"]["uuid"]
+        for day in (5, 6)
+    ]
+    assert [client.get(f"/api/routes/jobs/{job_uuid}").json()["data"]["status"] for job_uuid in job_uuids] == ["queued"] * 2
+
+    assert run_next_planning_job(engine) == job_uuids[0]
+    assert run_next_planning_job(engine) == job_uuids[1]
+    assert run_next_planning_job(engine) is None
+    assert [client.get(f"/api/routes/jobs/{job_uuid}").json()["data"]["status"] for job_uuid in job_uuids] == ["succeeded"] * 2
+
+    route_count = len(session.exec(select(RouteModel)).all())
+    run_planning_job(engine, job_uuids[0])
+    assert len(session.exec(select(RouteModel)).all()) == route_count
+
+    app.dependency_overrides.clear()
+
+
+def test_orphaned_running_jobs_are_marked_failed() -> None:
+    client, session, engine = _build_client(_IdleBackend())
+    office = _seed_office(session)
+    now = utc_now()
+    stale = PlanningJobModel(office_uuid=office.uuid, service_date=now.date(), status="running", updated_at=now - timedelta(minutes=5))
+    fresh = PlanningJobModel(office_uuid=office.uuid, service_date=now.date(), status="running", updated_at=now)
+    queued = PlanningJobModel(office_uuid=office.uuid, service_date=now.date())
+    session.add_all([stale, fresh, queued])
+    session.commit()
+
+    assert recover_orphaned_planning_jobs(engine, stale_after_s=60) == 1
+    assert client.get(f"/api/routes/jobs/{stale.uuid}").json()["data"]["status"] == "failed"
+    assert client.get(f"/api/routes/jobs/{fresh.uuid}").json()["data"]["status"] == "running"
+    assert client.get(f"/api/routes/jobs/{stale.uuid}/result").status_code == 500
+
+    assert recover_orphaned_planning_jobs(engine) == 1
+    assert client.get(f"/api/routes/jobs/{fresh.uuid}").json()["data"]["status"] == "failed"
+    assert client.get(f"/api/routes/jobs/{queued.uuid}").json()["data"]["status"] == "queued"
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,66 @@
+from collections.abc import Callable
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel, Session, create_engine
+
+from components.persistence__sqlmodel.models.office import OfficeModel
+from components.persistence__sqlmodel.models.route import RouteModel
+from components.persistence__sqlmodel.models.route_task import RouteTaskModel
+from components.persistence__sqlmodel.models.task import TaskModel
+from components.persistence__sqlmodel.models.vehicle import VehicleModel
+from components.route_planning.route_planner_service import _build_unassigned_task_query, _planned_routes, _route_stops
+
+SERVICE_DATE = date(2026, 3, 2)
+
+
+def _query_plans(engine: Engine, run: Callable[[], object]) -> list[str]:
+    statements: list[tuple[str, tuple]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    with engine.connect() as connection:
+        return [
+            " | ".join(row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            for statement, parameters in statements
+        ]
+
+
+def test_planning_hot_queries_use_live_row_indexes() -> None:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine, expire_on_commit=False)
+
+    office = OfficeModel(name="Main Office", lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    vehicle = VehicleModel(office_id=office.id, name="Truck 1", max_capacity=50)
+    session.add(vehicle)
+    session.commit()
+    route = RouteModel(office_id=office.id, vehicle_id=vehicle.id, service_date=SERVICE_DATE, status="planned")
+    tasks = [TaskModel(office_id=office.id, status="pending", load_units=1, lat=10.0, lng=20.0) for _ in range(3)]
+    session.add_all([route, *tasks])
+    session.commit()
+    session.add(RouteTaskModel(route_uuid=route.uuid, task_uuid=tasks[0].uuid, sequence_order=1))
+    session.commit()
+
+    [unassigned_plan] = _query_plans(
+        engine, lambda: session.exec(_build_unassigned_task_query(session, office, SERVICE_DATE)).all()
+    )
+    assert "tasks USING INDEX ix_tasks_office_status_live" in unassigned_plan
+    assert "route_tasks USING INDEX ix_route_tasks_task_uuid (task_uuid=?)" in unassigned_plan
+
+    [routes_plan] = _query_plans(engine, lambda: _planned_routes(session, office, SERVICE_DATE))
+    assert "routes USING INDEX ix_routes_office_date_live" in routes_plan
+
+    [stops_plan] = _query_plans(engine, lambda: _route_stops(session, [route.uuid]))
+    assert "route_tasks USING INDEX sqlite_autoindex_route_tasks" in stops_plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in stops_plan
@@ -1,5 +1,9 @@
 from collections.abc import Generator
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine, select
@@ -7,8 +11,10 @@ from sqlmodel import SQLModel, Session, create_engine, select
 from bases.platform.db import get_session
 from components.persistence__sqlmodel.models.office import OfficeModel
 from components.persistence__sqlmodel.models.route import RouteModel
+from components.persistence__sqlmodel.models.route_task import RouteTaskModel
 from components.persistence__sqlmodel.models.task import TaskModel
 from components.persistence__sqlmodel.models.vehicle import VehicleModel
+from components.route_planning import batch_planning
 from main import app
 
 
@@ -42,9 +48,11 @@ def test_generate_and_reorder_route_operations() -> None:
     session.add(task2)
     session.commit()
 
-    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}")
+    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}&time_limit_ms=500")
     assert res.status_code == 200
     assert len(res.json()["data"]) == 1
+    assert res.json()["meta"]["solver"]["time_limit_ms"] <= 500
+    assert res.json()["meta"]["solver"]["first_solution_status"] == "found"
 
     route_uuid = res.json()["data"][0]["uuid"]
 
@@ -65,11 +73,19 @@ def test_generate_and_reorder_route_operations() -> None:
 
     recalc_res = client.post(f"/api/routes/{route_uuid}/recalculate")
     assert recalc_res.status_code == 200
+    assert recalc_res.json()["meta"]["solver"]["final_objective"] is not None
+    repeat_res = client.post(f"/api/routes/{route_uuid}/recalculate")
+    assert repeat_res.json()["meta"]["solver"]["cached"] is True
     assert recalc_res.json()["route"]["total_load"] == 13
 
     route = session.exec(select(RouteModel).where(RouteModel.uuid == route_uuid)).first()
     assert route is not None
     assert route.total_load == 13
+    assert route.total_duration_s is not None
+
+    route_tasks = session.exec(select(RouteTaskModel).where(RouteTaskModel.route_uuid == route_uuid)).all()
+    assert all(route_task.planned_arrival_at is not None for route_task in route_tasks)
+    assert all(route_task.planned_departure_at >= route_task.planned_arrival_at for route_task in route_tasks)
 
     app.dependency_overrides.clear()
 
@@ -92,3 +108,302 @@ def test_generate_routes_requires_task_coordinates() -> None:
     assert body["detail"]["invalid_task_uuids"]
 
     app.dependency_overrides.clear()
+
+
+def test_generate_routes_drops_low_priority_tasks_when_fleet_is_full() -> None:
+    client, session = _build_client()
+
+    office = OfficeModel(name="Main Office", storage_capacity=100, lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    session.refresh(office)
+
+    session.add(VehicleModel(office_id=office.id, name="Truck 1", max_capacity=10))
+    low = TaskModel(office_id=office.id, type="delivery", status="pending", load_units=4, priority="low", address="A", lat=10.01, lng=20.0)
+    normal = TaskModel(office_id=office.id, type="delivery", status="pending", load_units=4, address="B", lat=10.02, lng=20.0)
+    high = TaskModel(office_id=office.id, type="delivery", status="pending", load_units=4, priority="high", address="C", lat=10.03, lng=20.0)
+    session.add_all([low, normal, high])
+    session.commit()
+
+    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert res.status_code == 200
+    assert res.json()["meta"]["dropped_task_uuids"] == [low.uuid]
+    assert res.json()["data"][0]["total_tasks"] == 2
+
+    app.dependency_overrides.clear()
+
+
+def test_generate_routes_batch_plans_each_office_independently() -> None:
+    client, session = _build_client()
+
+    planned_office = OfficeModel(name="North Office", storage_capacity=100, lat=10.0, lng=20.0)
+    empty_office = OfficeModel(name="South Office", storage_capacity=100, lat=12.0, lng=22.0)
+    fleetless_office = OfficeModel(name="East Office", storage_capacity=100, lat=14.0, lng=24.0)
+    session.add_all([planned_office, empty_office, fleetless_office])
+    session.commit()
+    for office in (planned_office, empty_office, fleetless_office):
+        session.refresh(office)
+
+    session.add(VehicleModel(office_id=planned_office.id, name="Truck 1", max_capacity=50))
+    session.add(VehicleModel(office_id=empty_office.id, name="Truck 2", max_capacity=50))
+    session.add(TaskModel(office_id=planned_office.id, type="delivery", status="pending", load_units=5, address="A", lat=10.1, lng=20.1))
+    session.add(TaskModel(office_id=fleetless_office.id, type="delivery", status="pending", load_units=5, address="B", lat=14.1, lng=24.1))
+    session.commit()
+
+    res = client.post("/api/routes/generate/batch?service_date=2026-01-05")
+    assert res.status_code == 200
+    outcomes = {item["office_uuid"]: item for item in res.json()["data"]}
+
+    assert outcomes[planned_office.uuid]["status"] == "succeeded"
+    assert len(outcomes[planned_office.uuid]["route_uuids"]) == 1
+    assert outcomes[empty_office.uuid]["status"] == "no_tasks"
+    assert outcomes[fleetless_office.uuid]["status"] == "failed"
+    assert outcomes[fleetless_office.uuid]["error"]["status_code"] == 400
+
+    routes = session.exec(select(RouteModel).where(RouteModel.office_id == planned_office.id)).all()
+    assert len(routes) == 1
+
+    app.dependency_overrides.clear()
+
+
+def test_generate_routes_batch_fails_once_when_the_worker_pool_breaks(monkeypatch) -> None:
+    _, session = _build_client()
+    for index in range(2):
+        office = OfficeModel(name=f"Office {index}", storage_capacity=100, lat=10.0 + index, lng=20.0)
+        session.add(office)
+        session.commit()
+        session.add(VehicleModel(office_id=office.id, name=f"Truck {index}", max_capacity=50))
+        session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=5, lat=10.1 + index, lng=20.1))
+    session.commit()
+
+    class _BrokenPool:
+        def __init__(self, max_workers: int) -> None:
+            pass
+
+        def __enter__(self) -> "_BrokenPool":
+            return self
+
+        def __exit__(self, *exc_info: object) -> None:
+            pass
+
+        def submit(self, fn, *args) -> Future:  # type: ignore[no-untyped-def]
+            future: Future = Future()
+            future.set_exception(BrokenProcessPool("A worker died"))
+            return future
+
+    monkeypatch.setattr(batch_planning, "ProcessPoolExecutor", _BrokenPool)
+    with pytest.raises(BrokenProcessPool):
+        batch_planning.generate_routes_batch(session, date(2026, 1, 5))
+
+    app.dependency_overrides.clear()
+
+
+def test_insert_tasks_into_planned_routes() -> None:
+    client, session = _build_client()
+
+    office = OfficeModel(name="Main Office", storage_capacity=100, lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    session.refresh(office)
+
+    session.add(VehicleModel(office_id=office.id, name="Truck 1", max_capacity=20))
+    session.add(VehicleModel(office_id=office.id, name="Truck 2", max_capacity=20))
+    session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=8, address="A", lat=10.1, lng=20.0))
+    session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=8, address="B", lat=10.2, lng=20.0))
+    session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=8, address="C", lat=9.9, lng=20.0))
+    session.commit()
+
+    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert res.status_code == 200
+
+    late_near = TaskModel(office_id=office.id, type="delivery", status="pending", load_units=4, address="D", lat=10.15, lng=20.0)
+    late_far = TaskModel(office_id=office.id, type="delivery", status="pending", load_units=10, address="E", lat=9.8, lng=20.0)
+    session.add(late_near)
+    session.add(late_far)
+    session.commit()
+
+    insert_res = client.post(
+        f"/api/routes/insert-tasks?service_date=2026-01-05&office_uuid={office.uuid}",
+        json={"taskUuids": [late_near.uuid, late_far.uuid], "repair": True},
+    )
+    assert insert_res.status_code == 200
+    insertions = {item["task_uuid"]: item for item in insert_res.json()["data"]}
+    assert set(insertions) == {late_near.uuid, late_far.uuid}
+
+    session.expire_all()
+    routes = session.exec(select(RouteModel)).all()
+    assert sum(route.total_tasks for route in routes) == 5
+    assert all(route.total_load <= 20 for route in routes)
+    for route in routes:
+        route_tasks = session.exec(
+            select(RouteTaskModel).where(RouteTaskModel.route_uuid == route.uuid).order_by(RouteTaskModel.sequence_order)
+        ).all()
+        assert [route_task.sequence_order for route_task in route_tasks] == list(range(1, route.total_tasks + 1))
+
+    near_route_task = session.exec(select(RouteTaskModel).where(RouteTaskModel.task_uuid == late_near.uuid)).one()
+    far_route_task = session.exec(select(RouteTaskModel).where(RouteTaskModel.task_uuid == late_far.uuid)).one()
+    assert near_route_task.route_uuid != far_route_task.route_uuid
+    assert near_route_task.route_uuid == insertions[late_near.uuid]["route_uuid"]
+
+    duplicate_res = client.post(
+        f"/api/routes/insert-tasks?service_date=2026-01-05&office_uuid={office.uuid}",
+        json={"taskUuids": [late_near.uuid]},
+    )
+    assert duplicate_res.status_code == 400
+
+    completed = TaskModel(office_id=office.id, type="delivery", status="completed", load_units=1, address="F", lat=10.05, lng=20.0)
+    session.add(completed)
+    session.commit()
+    completed_res = client.post(
+        f"/api/routes/insert-tasks?service_date=2026-01-05&office_uuid={office.uuid}",
+        json={"taskUuids": [completed.uuid]},
+    )
+    assert completed_res.status_code == 400
+    assert completed_res.json()["detail"]["task_uuids"] == [completed.uuid]
+    assert session.exec(select(RouteTaskModel).where(RouteTaskModel.task_uuid == completed.uuid)).first() is None
+
+    app.dependency_overrides.clear()
+
+
+def test_generate_routes_starts_vehicles_at_their_own_location() -> None:
+    client, session = _build_client()
+
+    office = OfficeModel(name="Main Office", storage_capacity=100, lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    session.refresh(office)
+
+    north = VehicleModel(office_id=office.id, name="North Truck", max_capacity=10, lat=11.0, lng=20.0)
+    south = VehicleModel(office_id=office.id, name="South Truck", max_capacity=10, lat=9.0, lng=20.0)
+    session.add_all([north, south])
+    for address, lat in (("N1", 11.01), ("N2", 11.02), ("S1", 8.99), ("S2", 8.98)):
+        session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=4, address=address, lat=lat, lng=20.0))
+    session.commit()
+
+    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert res.status_code == 200
+
+    session.expire_all()
+    for vehicle, prefix in ((north, "N"), (south, "S")):
+        route = session.exec(select(RouteModel).where(RouteModel.vehicle_id == vehicle.id)).one()
+        assert route.total_distance_m < 10_000
+        addresses = session.exec(
+            select(TaskModel.address)
+            .join(RouteTaskModel, RouteTaskModel.task_uuid == TaskModel.uuid)
+            .where(RouteTaskModel.route_uuid == route.uuid)
+        ).all()
+        assert sorted(addresses) == [f"{prefix}1", f"{prefix}2"]
+
+        recalc_res = client.post(f"/api/routes/{route.uuid}/recalculate")
+        assert recalc_res.status_code == 200
+        assert recalc_res.json()["route"]["total_distance_m"] < 10_000
+
+    app.dependency_overrides.clear()
+
+
+def test_recalculate_all_planned_routes_of_an_office() -> None:
+    client, session = _build_client()
+
+    office = OfficeModel(name="Main Office", storage_capacity=100, lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    session.refresh(office)
+
+    session.add(VehicleModel(office_id=office.id, name="Truck 1", max_capacity=20))
+    session.add(VehicleModel(office_id=office.id, name="Truck 2", max_capacity=20))
+    for address, lat in (("N1", 10.1), ("N2", 10.2), ("N3", 10.3), ("S1", 9.9), ("S2", 9.8), ("S3", 9.7)):
+        session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=5, address=address, lat=lat, lng=20.0))
+    session.commit()
+
+    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert res.status_code == 200
+    route_uuids = [route["uuid"] for route in res.json()["data"]]
+
+    # Scramble the first route so there is something to win back.
+    scrambled_uuid = route_uuids[0]
+    tasks = client.get(f"/api/routes/{scrambled_uuid}/detail").json()["tasks"]
+    assert len(tasks) >= 3
+    scrambled = [task["task_uuid"] for task in tasks[1:]] + [tasks[0]["task_uuid"]]
+    client.patch(f"/api/routes/{scrambled_uuid}/tasks/reorder", json={"orderedTaskUuids": scrambled})
+
+    recalc_res = client.post(f"/api/routes/recalculate?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert recalc_res.status_code == 200
+    summaries = {item["route_uuid"]: item for item in recalc_res.json()["data"]}
+    assert set(summaries) == set(route_uuids)
+    assert summaries[scrambled_uuid]["changed"] is True
+    assert summaries[scrambled_uuid]["after_distance_m"] < summaries[scrambled_uuid]["before_distance_m"]
+    assert all(item["after_distance_m"] <= item["before_distance_m"] for item in summaries.values())
+
+    session.expire_all()
+    route = session.exec(select(RouteModel).where(RouteModel.uuid == scrambled_uuid)).one()
+    assert route.total_distance_m == summaries[scrambled_uuid]["after_distance_m"]
+    route_tasks = session.exec(
+        select(RouteTaskModel).where(RouteTaskModel.route_uuid == scrambled_uuid).order_by(RouteTaskModel.sequence_order)
+    ).all()
+    assert [route_task.sequence_order for route_task in route_tasks] == list(range(1, len(tasks) + 1))
+
+    missing_res = client.post("/api/routes/recalculate?service_date=2026-01-05&office_uuid=missing")
+    assert missing_res.status_code == 404
+
+    app.dependency_overrides.clear()
+
+
+def test_rebalance_moves_stops_between_routes_and_saves_only_the_diff() -> None:
+    client, session = _build_client()
+
+    office = OfficeModel(name="Main Office", storage_capacity=100, lat=10.0, lng=20.0)
+    session.add(office)
+    session.commit()
+    session.refresh(office)
+
+    north_truck = VehicleModel(office_id=office.id, name="North Truck", max_capacity=20)
+    south_truck = VehicleModel(office_id=office.id, name="South Truck", max_capacity=20)
+    session.add_all([north_truck, south_truck])
+    session.commit()
+    for address, lat in (("N1", 10.1), ("N2", 10.2), ("N3", 10.3), ("S1", 9.9), ("S2", 9.8), ("S3", 9.7)):
+        session.add(TaskModel(office_id=office.id, type="delivery", status="pending", load_units=5, address=address, lat=lat, lng=20.0))
+    session.commit()
+
+    res = client.post(f"/api/routes/generate?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert res.status_code == 200
+
+    # Hand-swap one stop between the routes, the way a dispatcher edit would.
+    routes = session.exec(select(RouteModel).order_by(RouteModel.id)).all()
+    first_stop, second_stop = (
+        session.exec(
+            select(RouteTaskModel).where(RouteTaskModel.route_uuid == route.uuid).order_by(RouteTaskModel.sequence_order)
+        ).first()
+        for route in routes
+    )
+    first_stop.sequence_order, second_stop.sequence_order = 100, 101
+    session.add_all([first_stop, second_stop])
+    session.flush()
+    first_stop.route_uuid, second_stop.route_uuid = second_stop.route_uuid, first_stop.route_uuid
+    first_stop.sequence_order, second_stop.sequence_order = 1, 1
+    session.add_all([first_stop, second_stop])
+    session.commit()
+    untouched = {
+        route_task.uuid: route_task.updated_at
+        for route_task in session.exec(select(RouteTaskModel)).all()
+        if route_task.uuid not in {first_stop.uuid, second_stop.uuid}
+    }
+
+    rebalance_res = client.post(f"/api/routes/rebalance?service_date=2026-01-05&office_uuid={office.uuid}")
+    assert rebalance_res.status_code == 200
+    payload = rebalance_res.json()
+    assert payload["meta"]["after_distance_m"] < payload["meta"]["before_distance_m"]
+    assert {move["task_uuid"] for move in payload["data"]} == {first_stop.task_uuid, second_stop.task_uuid}
+
+    session.expire_all()
+    for route in session.exec(select(RouteModel)).all():
+        addresses = session.exec(
+            select(TaskModel.address)
+            .join(RouteTaskModel, RouteTaskModel.task_uuid == TaskModel.uuid)
+            .where(RouteTaskModel.route_uuid == route.uuid)
+        ).all()
+        assert len({address[0] for address in addresses}) == 1
+    for route_task in session.exec(select(RouteTaskModel)).all():
+        if route_task.uuid in untouched:
+            assert route_task.updated_at == untouched[route_task.uuid]
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,73 @@
+import time
+
+from bases.platform.config import get_settings
+from components.route_planning.matrix_providers import get_matrix_provider
+from components.route_planning.ortools_vrp_solver import SolverStats, VehicleRoutePlan, VrpSolution
+from components.route_planning.route_planner_service import _matrix_settings
+from components.route_planning.solution_cache import DiskSolutionStore, MemorySolutionStore, SolutionCache, solution_key
+
+
+def _solution() -> VrpSolution:
+    return VrpSolution(
+        routes=[VehicleRoutePlan(0, [1, 0], 1200, 5, arrivals_s=[100, 200], departures_s=[160, 260], duration_s=400)],
+        stats=SolverStats(engine="ortools", time_limit_ms=1000, wall_ms=900, first_objective=1300, final_objective=1200),
+    )
+
+
+def test_solution_key_is_stable_and_order_sensitive() -> None:
+    first = solution_key(locations=[(1.0, 2.0), (3.0, 4.0)], demands=[0, 1], solver={"engine": "auto"})
+
+    assert first == solution_key(solver={"engine": "auto"}, demands=[0, 1], locations=[(1.0, 2.0), (3.0, 4.0)])
+    assert first != solution_key(locations=[(3.0, 4.0), (1.0, 2.0)], demands=[0, 1], solver={"engine": "auto"})
+    assert first != solution_key(locations=[(1.0, 2.0), (3.0, 4.0)], demands=[0, 1], solver={"engine": "heuristic"})
+
+
+def test_memory_store_evicts_least_recently_used_and_expired_entries() -> None:
+    store = MemorySolutionStore(max_entries=2, ttl_s=60)
+    store.put("a", "A")
+    store.put("b", "B")
+    assert store.get("a") == "A"
+    store.put("c", "C")
+
+    assert store.get("b") is None
+    assert store.get("a") == "A"
+
+    short_lived = MemorySolutionStore(max_entries=2, ttl_s=0.01)
+    short_lived.put("a", "A")
+    time.sleep(0.02)
+    assert short_lived.get("a") is None
+
+
+def test_shared_disk_store_serves_other_workers(tmp_path) -> None:
+    path = str(tmp_path / "solutions.db")
+    writer = SolutionCache(MemorySolutionStore(8, 60), DiskSolutionStore(path, 8, 60))
+    reader = SolutionCache(MemorySolutionStore(8, 60), DiskSolutionStore(path, 8, 60))
+
+    writer.put("key", _solution())
+    cached = reader.get("key")
+
+    assert cached is not None
+    assert cached.routes == _solution().routes
+    assert cached.stats.cached and cached.stats.final_objective == 1200
+    assert reader.local.get("key") is not None
+    assert reader.get("missing") is None
+
+
+def test_solution_keys_follow_matrix_settings(monkeypatch) -> None:
+    def _settings(**env: str) -> dict:
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        get_settings.cache_clear()
+        get_matrix_provider.cache_clear()
+        return _matrix_settings(10)
+
+    monkeypatch.setenv("PLANNING_MATRIX_PROVIDER", "haversine")
+    try:
+        baseline = _settings(PLANNING_AVERAGE_SPEED_KMH="40")
+        assert baseline == {"provider": "haversine:40kmh", "sparse_neighbours": None}
+        assert _settings(PLANNING_AVERAGE_SPEED_KMH="30")["provider"] == "haversine:30kmh"
+        assert _settings(PLANNING_SPARSE_MATRIX_THRESHOLD="5", PLANNING_SPARSE_NEIGHBOURS="4")["sparse_neighbours"] == 4
+        assert "osrm.example" in _settings(PLANNING_MATRIX_PROVIDER="osrm", OSRM_BASE_URL="https://osrm.example")["provider"]
+    finally:
+        get_settings.cache_clear()
+        get_matrix_provider.cache_clear()
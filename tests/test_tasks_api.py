@@ -1,10 +1,17 @@
+import json
 from collections.abc import Generator
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session, create_engine
 
 from bases.platform.db import get_session
+from components.api__fastapi.schemas.tasks.base import validate_task_row
+from components.app__task.use_cases.import_tasks import import_tasks
+from components.persistence__sqlmodel.models.office import OfficeModel
+from components.persistence__sqlmodel.repositories.tasks_repo import TaskRepositorySqlModel
+from components.persistence__sqlmodel.search_index import rebuild_search_indexes
 from main import app
 
 
@@ -73,3 +80,164 @@ def test_task_crud_flow() -> None:
     assert get_deleted_res.status_code == 404
 
     app.dependency_overrides.clear()
+
+
+def test_task_search_index_follows_writes_and_rebuilds() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    def _session_override() -> Generator[Session, None, None]:
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session_override
+    client = TestClient(app)
+
+    office_res = client.post("/api/offices", json={"name": "North Depot", "address": "Main", "lat": 10.0, "lng": 10.0})
+    office_uuid = office_res.json()["uuid"]
+    office_id = client.get(f"/api/offices/{office_uuid}").json().get("id") or 1
+    task_uuids = []
+    for reference, address in (("REF-ALPHA-Z9", "Calle Uno"), ("REF-BETA", "Calle 100% Dos")):
+        res = client.post(
+            "/api/tasks",
+            json={"office_id": office_id, "type": "pickup", "lat": 10.1, "lng": 10.1, "reference": reference, "address": address},
+        )
+        assert res.status_code == 201, res.text
+        task_uuids.append(res.json()["uuid"])
+
+    def _found(term: str) -> list[str]:
+        return [item["uuid"] for item in client.get("/api/tasks", params={"search": term}).json()["data"]]
+
+    assert _found("alpha-z") == [task_uuids[0]]
+    assert _found("z9") == [task_uuids[0]]
+    assert _found("%") == [task_uuids[1]]
+    assert sorted(_found("north dep")) == sorted(task_uuids)
+
+    office_update = {"name": "South Hub", "address": "Main", "lat": 10.0, "lng": 10.0}
+    assert client.put(f"/api/offices/{office_uuid}", json=office_update).status_code == 200
+    assert _found("north dep") == []
+    assert sorted(_found("south hub")) == sorted(task_uuids)
+
+    assert client.delete(f"/api/tasks/{task_uuids[1]}").status_code == 204
+    with engine.begin() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM tasks_search").scalar_one() == 1
+        connection.exec_driver_sql("DELETE FROM tasks_search")
+        assert rebuild_search_indexes(connection, ["tasks"]) == {"tasks": 1}
+    assert _found("south hub") == [task_uuids[0]]
+
+    app.dependency_overrides.clear()
+
+
+def test_search_indexes_follow_the_created_tables(monkeypatch) -> None:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[OfficeModel.__table__])
+    with engine.connect() as connection:
+        names = {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "offices_search" in names
+    assert "tasks_search" not in names
+
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        office = OfficeModel(name="North Depot", lat=10.0, lng=10.0)
+        session.add(office)
+        session.commit()
+        repository = TaskRepositorySqlModel(session)
+        import_tasks(
+            repository,
+            [json.dumps({"office_id": office.id, "type": "pickup", "lat": 10.1, "lng": 10.1, "reference": "REF-ALPHA"})],
+            format="ndjson",
+            validate=validate_task_row,
+        )
+        indexed, _ = repository.list(page=1, page_size=10, search="alpha", sort="id", order="asc")
+
+        # Dialects without index tables search the base tables instead.
+        monkeypatch.setattr("components.persistence__sqlmodel.repositories.tasks_repo.uses_search_index", lambda session: False)
+        scanned, _ = repository.list(page=1, page_size=10, search="alpha", sort="id", order="asc")
+    assert [task.reference for task in scanned] == [task.reference for task in indexed] == ["REF-ALPHA"]
+
+
+def test_bulk_task_import_reports_row_errors_and_keeps_valid_rows() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+
+    def _session_override() -> Generator[Session, None, None]:
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session_override
+    client = TestClient(app)
+
+    office_res = client.post("/api/offices", json={"name": "North Depot", "address": "Main", "lat": 10.0, "lng": 10.0})
+    office_uuid = office_res.json()["uuid"]
+    office_id = client.get(f"/api/offices/{office_uuid}").json().get("id") or 1
+
+    manifest = "\n".join(
+        [
+            "office_id,office_uuid,type,lat,lng,load_units,reference,time_window_start",
+            f"{office_id},,delivery,10.1,10.1,2,CSV-1,2026-03-02T09:00:00+00:00",
+            f",{office_uuid},pickup,10.2,10.2,,CSV-2,",
+            "999,,delivery,10.3,10.3,1,CSV-3,",
+            f"{office_id},,teleport,10.4,10.4,1,CSV-4,",
+            f"{office_id},,delivery,10.5,10.5,1,CSV-5,2026-03-02T09:00:00",
+            f"{office_id},,delivery,10.6,10.6,1,CSV-6,,extra",
+        ]
+    )
+    res = client.post("/api/tasks/import", files={"file": ("manifest.csv", manifest, "text/csv")})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert (body["imported"], body["failed_rows"]) == (2, 4)
+    assert [(error["line"], error["field"]) for error in body["errors"]] == [
+        (4, "office_id"),
+        (5, "type"),
+        (6, "time_window_start"),
+        (7, None),
+    ]
+
+    ndjson = "\n".join(
+        [
+            json.dumps({"office_uuid": office_uuid, "type": "delivery", "reference": "NDJSON-1"}),
+            "{not json",
+            "",
+            json.dumps([1, 2]),
+            json.dumps({"office_id": office_id + 0.5, "type": "delivery", "reference": "NDJSON-5"}),
+            json.dumps({"office_id": float(office_id), "type": "delivery", "reference": "NDJSON-6"}),
+        ]
+    )
+    res = client.post("/api/v1/tasks/import?format=ndjson", files={"file": ("manifest.txt", ndjson)})
+    assert res.json()["imported"] == 1
+    assert [(error["line"], error["field"]) for error in res.json()["errors"]] == [
+        (2, None),
+        (4, None),
+        (5, "office_id"),
+        (6, "office_id"),
+    ]
+
+    assert client.post("/api/tasks/import", files={"file": ("manifest.txt", ndjson)}).status_code == 400
+
+    references = {item["reference"]: item for item in client.get("/api/tasks?page_size=100").json()["data"]}
+    assert set(references) == {"CSV-1", "CSV-2", "NDJSON-1"}
+    assert references["CSV-2"]["office_uuid"] == office_uuid
+    assert references["CSV-2"]["load_units"] == 0
+    assert [item["reference"] for item in client.get("/api/tasks?search=csv-2").json()["data"]] == ["CSV-2"]
+
+    app.dependency_overrides.clear()
+
+
+def test_bulk_task_import_batches_queries_per_chunk() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    statements: list[str] = []
+    with Session(engine) as session:
+        office = OfficeModel(name="North Depot", lat=10.0, lng=10.0)
+        session.add(office)
+        session.commit()
+        lines = [json.dumps({"office_id": office.id, "type": "delivery", "reference": f"R-{i}"}) for i in range(5)]
+
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        result = import_tasks(
+            TaskRepositorySqlModel(session), lines, format="ndjson", validate=validate_task_row, chunk_size=2
+        )
+
+    assert (result.imported, result.errors) == (5, [])
+    assert sum(statement.startswith("SELECT offices.id") for statement in statements) == 3
+    assert sum(statement.startswith("INSERT INTO tasks") for statement in statements) == 3
@@ -70,3 +70,76 @@ def test_vehicle_crud_flow() -> None:
     assert get_deleted_res.status_code == 404
 
     app.dependency_overrides.clear()
+
+
+def test_vehicle_list_cursor_pages_match_offset_order() -> None:
+    client = _build_client()
+
+    office_res = client.post(
+        "/api/offices",
+        json={"name": "HQ", "address": "Main", "lat": 10.0, "lng": 10.0, "storage_capacity": 10},
+    )
+    office_id = client.get(f"/api/offices/{office_res.json()['uuid']}").json().get("id") or 1
+    for index, plate in enumerate(["B-1", None, "A-1", "B-1", None, "C-1", "A-1"]):
+        payload = {"office_id": office_id, "name": f"Truck {index % 3}", "max_capacity": 10}
+        if plate is not None:
+            payload["plate"] = plate
+        assert client.post("/api/vehicles", json=payload).status_code == 201
+
+    for sort, order in (("plate", "asc"), ("plate", "desc"), ("name", "asc"), ("created_at", "desc")):
+        expected = [
+            item["uuid"] for item in client.get(f"/api/vehicles?page_size=100&sort={sort}&order={order}").json()["data"]
+        ]
+        first = client.get(f"/api/vehicles?page_size=2&sort={sort}&order={order}").json()
+        seen = [item["uuid"] for item in first["data"]]
+        cursor = first["meta"]["pagination"]["nextCursor"]
+        while cursor:
+            page = client.get(f"/api/vehicles?page_size=2&sort={sort}&order={order}&cursor={cursor}").json()
+            seen += [item["uuid"] for item in page["data"]]
+            cursor = page["meta"]["pagination"]["nextCursor"]
+            assert page["meta"]["pagination"]["hasNext"] is (cursor is not None)
+        assert seen == expected
+
+    assert client.get("/api/vehicles?cursor=not-a-cursor").status_code == 400
+    cursor = client.get("/api/vehicles?page_size=2&sort=plate&order=asc").json()["meta"]["pagination"]["nextCursor"]
+    assert client.get(f"/api/vehicles?page_size=2&sort=name&order=asc&cursor={cursor}").status_code == 400
+
+    app.dependency_overrides.clear()
+
+
+def test_vehicle_list_count_strategies() -> None:
+    client = _build_client()
+
+    office_res = client.post(
+        "/api/offices",
+        json={"name": "HQ", "address": "Main", "lat": 10.0, "lng": 10.0, "storage_capacity": 10},
+    )
+    office_id = client.get(f"/api/offices/{office_res.json()['uuid']}").json().get("id") or 1
+    for index in range(5):
+        payload = {"office_id": office_id, "name": f"Truck {index}", "max_capacity": 10}
+        assert client.post("/api/vehicles", json=payload).status_code == 201
+
+    exact = client.get("/api/vehicles?page_size=2").json()["meta"]["pagination"]
+    assert (exact["countStrategy"], exact["total"], exact["pages"], exact["hasNext"]) == ("exact", 5, 3, True)
+
+    skipped = client.get("/api/vehicles?page=3&page_size=2&count=none").json()["meta"]["pagination"]
+    assert (skipped["countStrategy"], skipped["total"], skipped["pages"]) == ("none", None, None)
+    assert skipped["hasNext"] is False
+    assert client.get("/api/vehicles?page=2&page_size=2&count=none").json()["meta"]["pagination"]["hasNext"] is True
+
+    estimated = client.get("/api/vehicles?page_size=2&count=estimated").json()["meta"]["pagination"]
+    assert estimated["countStrategy"] == "estimated"
+    assert estimated["total"] >= 5
+    assert estimated["pages"] is None
+
+    searched = client.get("/api/vehicles?page_size=2&count=estimated&search=Truck").json()["meta"]["pagination"]
+    assert (searched["countStrategy"], searched["total"], searched["hasNext"]) == ("none", None, True)
+
+    assert client.get("/api/vehicles?count=sometimes").status_code == 422
+
+    page = client.get("/vehicles?page_size=2")
+    assert page.status_code == 200
+    assert "~5" in page.text
+    assert "Page 1 /" not in page.text
+
+    app.dependency_overrides.clear()